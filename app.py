@@ -3,8 +3,13 @@ import os
 import uuid
 from services.resume_analyzer import ResumeAnalyzer
 from services.interview_coach import InterviewCoach
+from services.question_prefetcher import QuestionPrefetcher
+from services.question_bank import QuestionBank
+from services.batch_screening import BatchScreener, expand_uploads
+from services.ats_scorer import ATSScorer
 from utils.pdf_parser import PDFParser
-from database.service import db_service
+from utils.telemetry import start_metrics_export, tracer
+from database import db_service, get_db_service
 
 # Page configuration - must be first
 st.set_page_config(
@@ -194,28 +199,98 @@ st.markdown("""
 
 # Sidebar for navigation
 st.sidebar.title("Navigation")
-mode = st.sidebar.radio("Choose Mode:", ["Resume Analysis", "Interview Practice", "Dashboard"])
+mode = st.sidebar.radio("Choose Mode:", ["Resume Analysis", "Batch Screening", "Interview Practice", "Dashboard"])
 
-# Show session statistics in sidebar
+# Check the database once per run so a missing migration surfaces as one actionable message
 try:
-    stats = db_service.get_session_statistics(st.session_state.user_session_id)
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### Your Session Stats")
-    st.sidebar.metric("Resume Submissions", stats["resume_submissions"])
-    st.sidebar.metric("Interview Sessions", stats["interview_sessions"])
-    st.sidebar.metric("Total Questions", stats["total_questions"])
-    if stats["average_score"] > 0:
-        st.sidebar.metric("Average Score", f"{stats['average_score']}/10")
+    get_db_service()
+    database_error = None
 except Exception as e:
-    st.sidebar.warning("Could not load session statistics")
+    database_error = str(e)
+    st.error(f"Saving and the dashboard are unavailable: {database_error}")
+
+# Show session statistics in sidebar
+if database_error is None:
+    try:
+        stats = db_service.get_session_statistics(st.session_state.user_session_id)
+        st.sidebar.markdown("---")
+        st.sidebar.markdown("### Your Session Stats")
+        st.sidebar.metric("Resume Submissions", stats["resume_submissions"])
+        st.sidebar.metric("Interview Sessions", stats["interview_sessions"])
+        st.sidebar.metric("Total Questions", stats["total_questions"])
+        if stats["average_score"] > 0:
+            st.sidebar.metric("Average Score", f"{stats['average_score']}/10")
+    except Exception as e:
+        st.sidebar.warning("Could not load session statistics")
 
 # Initialize services
 @st.cache_resource
 def initialize_services():
-    return ResumeAnalyzer(), InterviewCoach(), PDFParser()
+    return ResumeAnalyzer(), InterviewCoach(question_bank=QuestionBank()), PDFParser()
 
 resume_analyzer, interview_coach, pdf_parser = initialize_services()
 
+@st.cache_resource
+def initialize_question_prefetcher():
+    return QuestionPrefetcher(interview_coach)
+
+question_prefetcher = initialize_question_prefetcher()
+
+@st.cache_resource
+def initialize_metrics_export():
+    # Serves /metrics and /traces when METRICS_PORT is set; dumps to METRICS_DUMP_PATH when that is set
+    return start_metrics_export()
+
+initialize_metrics_export()
+
+# Dashboard loaders: cached per user and keyed on the data version, which every save bumps
+DASHBOARD_PAGE_SIZE = 25
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_dashboard_overview(session_id, data_version):
+    return {
+        "interview_timeline": db_service.get_interview_score_timeline(session_id),
+        "resume_trend": db_service.get_resume_score_trend(session_id)
+    }
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_submission_page(session_id, cursor, data_version):
+    return db_service.list_resume_submissions(session_id, limit=DASHBOARD_PAGE_SIZE, cursor=cursor)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_interview_session_page(session_id, cursor, data_version):
+    return db_service.list_interview_sessions(session_id, limit=DASHBOARD_PAGE_SIZE, cursor=cursor)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_submission_detail(submission_id):
+    return db_service.get_resume_submission_detail(submission_id)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_interview_question_details(interview_session_id, data_version):
+    return db_service.get_interview_question_details(interview_session_id)
+
+def paginated(key, load_page):
+    """Render prev/next controls for a keyset-paginated listing and return the current page"""
+    cursors_key = f"{key}_cursors"
+    if cursors_key not in st.session_state:
+        st.session_state[cursors_key] = [None]
+    cursors = st.session_state[cursors_key]
+    
+    page = load_page(cursors[-1])
+    
+    prev_col, info_col, next_col = st.columns([1, 3, 1])
+    with prev_col:
+        if st.button("← Newer", key=f"{key}_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with info_col:
+        st.caption(f"Page {len(cursors)}")
+    with next_col:
+        if st.button("Older →", key=f"{key}_next", disabled=page.next_cursor is None):
+            cursors.append(page.next_cursor)
+            st.rerun()
+    return page
+
 if mode == "Resume Analysis":
     st.header("📄 Resume Analysis & Optimization")
     
@@ -237,31 +312,47 @@ if mode == "Resume Analysis":
     # Analysis button
     if st.button("🔍 Analyze Resume", type="primary"):
         if uploaded_file is not None and job_description.strip():
-            with st.spinner("Analyzing your resume..."):
+            with st.spinner("Analyzing your resume..."), tracer.start_span("ui.analyze_resume"):
                 try:
-                    # Extract text from PDF
-                    resume_text = pdf_parser.extract_text_from_pdf(uploaded_file)
+                    # Parse the PDF once; text, diagnostics and raw bytes all come from this result
+                    parsed_resume = pdf_parser.parse(uploaded_file)
+                    extraction = parsed_resume.extraction
+                    resume_text = parsed_resume.text
+                    
+                    problem_pages = [page for page in extraction["pages"] if page["status"] in ("error", "timeout")]
+                    for page in problem_pages:
+                        st.warning(f"Could not extract text from page {page['page']}: {page['error']}")
+                    if extraction["truncated"]:
+                        st.warning(f"Only the first {len(extraction['pages'])} of {extraction['page_count']} pages were analyzed")
                     
                     if resume_text.strip():
+                        # Local keyword match, shown while the full analysis runs
+                        prescore = ATSScorer(job_description).score(resume_text)
+                        with st.container(border=True):
+                            st.markdown("**⚡ Quick ATS Keyword Match**")
+                            st.metric("Keyword Match", f"{prescore['score']}/10")
+                            if prescore["missing_keywords"]:
+                                st.caption("Missing: " + ", ".join(prescore["missing_keywords"][:10]))
+                        
                         # Perform analysis
                         analysis_result = resume_analyzer.analyze_resume(resume_text, job_description)
                         
                         # Store submission in database
                         try:
-                            # Get PDF content as bytes
-                            uploaded_file.seek(0)  # Reset file pointer
-                            pdf_bytes = uploaded_file.read()
-                            
                             # Save to database
-                            submission_id = db_service.save_resume_submission(
+                            save_future = db_service.enqueue(
+                                "save_resume_submission",
                                 session_id=st.session_state.user_session_id,
                                 filename=uploaded_file.name,
-                                pdf_content=pdf_bytes,
+                                pdf_content=parsed_resume.pdf_bytes,
                                 extracted_text=resume_text,
                                 job_description=job_description,
                                 analysis_result=analysis_result
                             )
-                            st.info(f"Resume submission saved (ID: {submission_id})")
+                            if save_future.done():
+                                st.info(f"Resume submission saved (ID: {save_future.result()})")
+                            else:
+                                st.info("Resume submission queued for saving")
                         except Exception as db_error:
                             st.warning(f"Analysis completed but failed to save to database: {str(db_error)}")
                         
@@ -344,6 +435,104 @@ if mode == "Resume Analysis":
         else:
             st.warning("Please upload a resume PDF and provide a job description.")
 
+elif mode == "Batch Screening":
+    st.header("📚 Batch Resume Screening")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Upload Resumes")
+        uploaded_files = st.file_uploader(
+            "Choose PDF files or a zip archive",
+            type=["pdf", "zip"],
+            accept_multiple_files=True
+        )
+        concurrency = st.slider("Parallel analyses", min_value=1, max_value=16, value=4)
+        min_prescore = st.slider(
+            "Minimum keyword match for AI analysis",
+            min_value=0.0, max_value=10.0, value=0.0, step=0.5,
+            help="Resumes below this local keyword match score are not sent to the AI"
+        )
+        
+    with col2:
+        st.subheader("Job Description")
+        batch_job_description = st.text_area(
+            "Paste the job description here:",
+            height=200,
+            placeholder="Paste the job description to screen all resumes against...",
+            key="batch_job_description"
+        )
+    
+    if st.button("🔍 Screen Resumes", type="primary"):
+        if uploaded_files and batch_job_description.strip():
+            screener = BatchScreener(resume_analyzer, concurrency=concurrency, min_prescore=min_prescore)
+            try:
+                uploads = expand_uploads([(f.name, f.getvalue()) for f in uploaded_files])
+            except Exception as e:
+                st.error(f"Could not read the uploaded files: {str(e)}")
+                st.stop()
+            
+            progress = st.progress(0.0, text="Screening resumes...")
+            table_placeholder = st.empty()
+            results = []
+            
+            for result in screener.screen(uploads, batch_job_description):
+                results.append(result)
+                ranked = sorted(results, key=lambda r: (r["alignment_score"], r["prescore"]), reverse=True)
+                table_placeholder.dataframe(
+                    [
+                        {
+                            "Rank": rank,
+                            "Resume": r["filename"],
+                            "Score": r["alignment_score"],
+                            "Keyword Match": r["prescore"],
+                            "Missing Keywords": ", ".join(r["missing_keywords"][:5]),
+                            "Status": r["error"] or ("Below keyword threshold" if r["status"] == "filtered" else "OK")
+                        }
+                        for rank, r in enumerate(ranked, start=1)
+                    ],
+                    use_container_width=True,
+                    hide_index=True
+                )
+                progress.progress(min(1.0, len(results) / max(1, len(uploads))), text=f"Screened {len(results)} resumes")
+            
+            progress.progress(1.0, text=f"Screened {len(results)} resumes")
+            
+            # Store all successful analyses in one transaction
+            successful = [r for r in results if r["status"] == "ok"]
+            if successful:
+                try:
+                    save_future = db_service.enqueue(
+                        "save_resume_submissions",
+                        session_id=st.session_state.user_session_id,
+                        job_description=batch_job_description,
+                        submissions=[
+                            {
+                                "filename": r["filename"],
+                                "pdf_content": r["pdf_content"],
+                                "extracted_text": r["extracted_text"],
+                                "analysis_result": r["analysis"]
+                            }
+                            for r in successful
+                        ]
+                    )
+                    if save_future.done():
+                        st.info(f"Saved {len(save_future.result())} resume submissions")
+                    else:
+                        st.info(f"{len(successful)} resume submissions queued for saving")
+                except Exception as db_error:
+                    st.warning(f"Screening completed but failed to save to database: {str(db_error)}")
+            
+            filtered = len([r for r in results if r["status"] == "filtered"])
+            if filtered:
+                st.info(f"{filtered} resumes were below the keyword match threshold and skipped AI analysis")
+            failed = len([r for r in results if r["status"] == "error"])
+            if failed:
+                st.warning(f"{failed} resumes could not be analyzed")
+            st.success("Batch screening complete!")
+        else:
+            st.warning("Please upload at least one resume and provide a job description.")
+
 elif mode == "Interview Practice":
     st.header("🎤 Interactive Interview Practice")
     
@@ -385,6 +574,8 @@ elif mode == "Interview Practice":
                 except Exception as db_error:
                     st.warning(f"Failed to save interview session: {str(db_error)}")
                 
+                # Settings may have changed, so drop any question prefetched for the last interview
+                question_prefetcher.cancel(st.session_state.user_session_id)
                 st.session_state.interview_active = True
                 st.session_state.job_role = job_role
                 st.session_state.focus_areas = focus_areas
@@ -429,18 +620,27 @@ elif mode == "Interview Practice":
         
         # Generate new question if none exists
         if st.session_state.current_question is None:
-            with st.spinner("Generating interview question..."):
+            with st.spinner("Generating interview question..."), tracer.start_span("ui.generate_question"):
                 try:
-                    question = interview_coach.generate_question(
+                    interview_settings = (
+                        st.session_state.user_session_id,
                         st.session_state.job_role,
                         st.session_state.focus_areas,
                         st.session_state.interview_type
                     )
+                    # Use the question prefetched during the previous turn when available
+                    question = question_prefetcher.take(*interview_settings)
+                    if question is None:
+                        question = interview_coach.generate_question(
+                            *interview_settings[1:], session_id=st.session_state.user_session_id
+                        )
                     st.session_state.current_question = question
                     st.session_state.chat_history.append({
                         "role": "interviewer",
                         "content": question
                     })
+                    # Start generating the next question while the user answers this one
+                    question_prefetcher.prefetch(*interview_settings)
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error generating question: {str(e)}")
@@ -464,27 +664,50 @@ elif mode == "Interview Practice":
                         "content": answer
                     })
                     
-                    # Get feedback
-                    with st.spinner("Analyzing your answer..."):
+                    # Stream feedback into the chat as it arrives
+                    with chat_container:
+                        feedback_placeholder = st.empty()
+                    feedback_placeholder.info("Analyzing your answer...")
+                    with tracer.start_span("ui.submit_answer"):
                         try:
-                            feedback = interview_coach.evaluate_answer(
+                            feedback = None
+                            for update in interview_coach.evaluate_answer_stream(
                                 st.session_state.current_question,
                                 answer,
                                 st.session_state.job_role,
                                 st.session_state.focus_areas
-                            )
+                            ):
+                                if update["done"]:
+                                    feedback = update["feedback"]
+                                    break
                             
+                                partial = update["partial"]
+                                with feedback_placeholder.container():
+                                    if "score" in partial:
+                                        st.metric("Answer Score", f"{partial['score']}/10")
+                                    if partial.get("feedback"):
+                                        st.markdown(f"""
+                                        <div class="chat-message feedback-message">
+                                            <strong>📊 Feedback:</strong> {partial['feedback']}
+                                        </div>
+                                        """, unsafe_allow_html=True)
+                                    if partial.get("strengths"):
+                                        st.markdown("**Strengths:** " + "; ".join(partial["strengths"]))
+                                    if partial.get("areas_for_improvement"):
+                                        st.markdown("**Areas for Improvement:** " + "; ".join(partial["areas_for_improvement"]))
+                        
                             # Add feedback to chat history
                             st.session_state.chat_history.append({
                                 "role": "feedback",
                                 "content": feedback.get("feedback", "Feedback not available"),
                                 "score": feedback.get("score", 0)
                             })
-                            
+                        
                             # Store question and answer in database
                             try:
                                 st.session_state.question_count += 1
-                                question_id = db_service.save_interview_question(
+                                save_future = db_service.enqueue(
+                                    "save_interview_question",
                                     session_id=st.session_state.user_session_id,
                                     interview_session_id=st.session_state.interview_session_id,
                                     question_text=st.session_state.current_question,
@@ -493,13 +716,15 @@ elif mode == "Interview Practice":
                                     score=feedback.get("score", 0),
                                     question_order=st.session_state.question_count
                                 )
+                                if save_future.done():
+                                    save_future.result()
                             except Exception as db_error:
                                 st.warning(f"Failed to save question to database: {str(db_error)}")
-                            
+                        
                             # Reset for next question
                             st.session_state.current_question = None
                             st.rerun()
-                            
+                        
                         except Exception as e:
                             st.error(f"Error evaluating answer: {str(e)}")
                 else:
@@ -518,21 +743,146 @@ elif mode == "Interview Practice":
                     scores = [msg.get("score", 0) for msg in st.session_state.chat_history if msg.get("role") == "feedback" and msg.get("score")]
                     avg_score = sum(scores) / len(scores) if scores else 0
                     
-                    db_service.update_interview_session_completion(
-                        session_id=st.session_state.user_session_id,
-                        total_questions=st.session_state.question_count,
-                        average_score=avg_score
-                    )
+                    if st.session_state.interview_session_id is not None:
+                        # Queued behind this interview's answers, so it lands after them in write-behind mode
+                        completion_future = db_service.enqueue(
+                            "update_interview_session_completion",
+                            interview_session_id=st.session_state.interview_session_id,
+                            total_questions=st.session_state.question_count,
+                            average_score=avg_score
+                        )
+                        if completion_future.done():
+                            completion_future.result()
                     st.info(f"Interview completed! Questions: {st.session_state.question_count}, Average Score: {avg_score:.1f}/10")
                 except Exception as db_error:
                     st.warning(f"Failed to update interview completion: {str(db_error)}")
                 
+                question_prefetcher.cancel(st.session_state.user_session_id)
                 st.session_state.interview_active = False
                 st.session_state.current_question = None
                 st.session_state.interview_session_id = None
                 st.success("Interview session ended. You can start a new session anytime!")
                 st.rerun()
 
+elif mode == "Dashboard":
+    st.header("📊 Your Progress Dashboard")
+    
+    user_session_id = st.session_state.user_session_id
+    
+    if database_error:
+        st.info("The dashboard needs the database. Apply the pending migrations and reload the page.")
+        st.stop()
+    
+    try:
+        data_version = db_service.get_data_version(user_session_id)
+        overview = load_dashboard_overview(user_session_id, data_version)
+    except Exception as e:
+        st.error(f"Could not load dashboard: {str(e)}")
+        st.stop()
+    
+    tab1, tab2, tab3 = st.tabs(["Interview Scores", "Resume Submissions", "Interview Sessions"])
+    
+    with tab1:
+        timeline = overview["interview_timeline"]
+        if timeline:
+            chart_data = [
+                {"Interview": f"#{i} {t['job_role']}", "Average Score": t["average_score"], "Questions": t["questions"]}
+                for i, t in enumerate(timeline, start=1)
+            ]
+            st.subheader("Average Score per Interview")
+            st.line_chart(chart_data, x="Interview", y="Average Score")
+            st.subheader("Questions Answered per Interview")
+            st.bar_chart(chart_data, x="Interview", y="Questions")
+        else:
+            st.info("No interview answers yet. Try Interview Practice to start tracking your scores.")
+    
+    with tab2:
+        trend = overview["resume_trend"]
+        if trend:
+            st.subheader("Alignment Score by Day")
+            st.line_chart(trend, x="day", y=["average_score", "best_score"])
+        
+        page = paginated("dashboard_submissions", lambda cursor: load_submission_page(user_session_id, cursor, data_version))
+        if page.items:
+            st.dataframe(
+                [
+                    {
+                        "ID": item.id,
+                        "Resume": item.filename,
+                        "Score": item.alignment_score,
+                        "Size (KB)": round((item.pdf_size or 0) / 1024, 1),
+                        "Submitted": item.created_at.strftime("%Y-%m-%d %H:%M")
+                    }
+                    for item in page.items
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            selected = st.selectbox(
+                "View analysis for:",
+                page.items,
+                index=None,
+                format_func=lambda item: f"{item.filename} ({item.created_at:%Y-%m-%d %H:%M})"
+            )
+            if selected:
+                detail = load_submission_detail(selected.id)
+                if detail:
+                    result = detail.analysis_result or {}
+                    st.metric("Alignment Score", f"{detail.alignment_score}/10")
+                    if result.get("score_interpretation"):
+                        st.write(result["score_interpretation"])
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.markdown("**⚠️ Gaps**")
+                        for gap in result.get("gaps", []):
+                            st.markdown(f"• {gap}")
+                    with col2:
+                        st.markdown("**💡 Suggestions**")
+                        for suggestion in result.get("suggestions", []):
+                            st.markdown(f"• {suggestion}")
+                    with st.expander("Job Description"):
+                        st.write(detail.job_description)
+        else:
+            st.info("No resume submissions yet.")
+    
+    with tab3:
+        page = paginated("dashboard_interviews", lambda cursor: load_interview_session_page(user_session_id, cursor, data_version))
+        if page.items:
+            st.dataframe(
+                [
+                    {
+                        "ID": item.id,
+                        "Job Role": item.job_role,
+                        "Type": item.interview_type,
+                        "Focus Areas": ", ".join(item.focus_areas or []),
+                        "Questions": item.total_questions,
+                        "Average Score": item.average_score,
+                        "Started": item.created_at.strftime("%Y-%m-%d %H:%M"),
+                        "Completed": item.completed_at.strftime("%Y-%m-%d %H:%M") if item.completed_at else ""
+                    }
+                    for item in page.items
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            selected = st.selectbox(
+                "Review interview:",
+                page.items,
+                index=None,
+                format_func=lambda item: f"{item.job_role} ({item.created_at:%Y-%m-%d %H:%M})"
+            )
+            if selected:
+                for question in load_interview_question_details(selected.id, data_version):
+                    with st.expander(f"Q{question.question_order} · Score {question.score}/10"):
+                        st.markdown(f"**Question:** {question.question_text}")
+                        st.markdown(f"**Your answer:** {question.answer_text}")
+                        if question.feedback and question.feedback.get("feedback"):
+                            st.markdown(f"**Feedback:** {question.feedback['feedback']}")
+        else:
+            st.info("No interview sessions yet.")
+
 # Footer
 st.markdown("---")
 st.markdown("💡 **Tip:** Use this tool regularly to improve your job application success rate!")
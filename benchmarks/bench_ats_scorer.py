@@ -0,0 +1,93 @@
+"""
+Benchmark the local ATS pre-scorer over a synthetic resume corpus.
+
+Reports resumes scored per second one at a time (the Resume Analysis path)
+and as one batch (the Batch Screening path), plus the time to build the
+scorer from a job description.
+
+    python benchmarks/bench_ats_scorer.py [--resumes 5000] [--seed 7]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ats_scorer import ATSScorer
+
+SKILLS = [
+    "Python", "SQL", "AWS", "Kubernetes", "Docker", "Terraform", "REST APIs", "GraphQL", "React",
+    "TypeScript", "Java", "Go", "Kafka", "Spark", "Airflow", "PostgreSQL", "Redis", "CI/CD",
+    "Machine Learning", "Google Cloud", "Linux", "Node.js", "C++", "Snowflake", "dbt", "Tableau",
+]
+
+JOB_DESCRIPTION = """Senior Data Engineer
+We are looking for a Senior Data Engineer to build and scale our data platform.
+Responsibilities:
+- Design batch and streaming pipelines with Spark, Kafka and Airflow
+- Model data in PostgreSQL and Snowflake for analytics and Machine Learning teams
+- Operate services on AWS with Docker, Kubernetes and Terraform
+Requirements:
+- 5+ years of Python and SQL
+- Experience with CI/CD and Google Cloud is a plus
+We are an equal opportunity employer."""
+
+BULLETS = [
+    "Built {skill} services processing {n}M events per day",
+    "Led migration of reporting to {skill} and {skill2}, cutting costs by {n}%",
+    "Automated deployments with {skill}, reducing release time by {n}%",
+    "Mentored {n} engineers and reviewed designs for {skill} projects",
+    "Partnered with analysts to deliver dashboards in {skill}",
+]
+
+
+def make_resume(rng):
+    lines = [f"Candidate {rng.randint(1, 10**6)}", "SUMMARY", "Engineer with a focus on data platforms.", "EXPERIENCE"]
+    for _ in range(rng.randint(8, 30)):
+        lines.append("• " + rng.choice(BULLETS).format(
+            skill=rng.choice(SKILLS), skill2=rng.choice(SKILLS), n=rng.randint(2, 90)
+        ))
+    lines.append("SKILLS")
+    lines.append(", ".join(rng.sample(SKILLS, k=rng.randint(3, 12))))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    resumes = [make_resume(rng) for _ in range(args.resumes)]
+    average_chars = sum(len(resume) for resume in resumes) / len(resumes)
+    print(f"corpus: {len(resumes)} resumes, {average_chars:.0f} chars on average")
+
+    started = time.perf_counter()
+    for _ in range(100):
+        scorer = ATSScorer(JOB_DESCRIPTION)
+    build = (time.perf_counter() - started) / 100
+    print(f"scorer build: {build * 1e3:.2f} ms ({len(scorer.terms)} job description terms)")
+
+    started = time.perf_counter()
+    single = [scorer.score(resume) for resume in resumes]
+    one_at_a_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = scorer.score_many(resumes)
+    batched = time.perf_counter() - started
+
+    assert [r["score"] for r in single] == [r["score"] for r in batch]
+
+    print(f"\n{'mode':<16}{'resumes/s':>12}{'ms/resume':>12}")
+    print(f"{'one at a time':<16}{len(resumes) / one_at_a_time:12.0f}{one_at_a_time / len(resumes) * 1e3:12.3f}")
+    print(f"{'batch':<16}{len(resumes) / batched:12.0f}{batched / len(resumes) * 1e3:12.3f}")
+
+    scores = sorted(r["score"] for r in batch)
+    print(f"\nscore distribution: min {scores[0]}, median {scores[len(scores) // 2]}, max {scores[-1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark LLM response parsing: the old fence-stripping json.loads against the shared extractor.
+
+Builds a corpus of response variants (fences, surrounding prose, trailing
+commas, truncation) from the fake backend's canned payloads and reports the
+parse success rate and time per response, plus streaming cost per response.
+
+    python benchmarks/bench_json_extraction.py [--copies 200] [--seed 7]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.interview_coach import EVALUATION_SCHEMA, STAR_COACHING_SCHEMA
+from services.json_extractor import IncrementalJSONExtractor, extract_json
+from services.llm_backend import FakeBackend
+from services.resume_analyzer import ANALYSIS_SCHEMA, BUNDLE_SCHEMA, IMPROVEMENTS_SCHEMA, KEYWORDS_SCHEMA
+
+SCHEMAS = {
+    "resume_analysis": ANALYSIS_SCHEMA,
+    "keywords": KEYWORDS_SCHEMA,
+    "improvements": IMPROVEMENTS_SCHEMA,
+    "resume_bundle": BUNDLE_SCHEMA,
+    "evaluation": EVALUATION_SCHEMA,
+    "star_coaching": STAR_COACHING_SCHEMA,
+}
+
+PROSE_BEFORE = [
+    "Here is the analysis you asked for:\n",
+    "Sure! Below is the JSON {as requested}.\n\n",
+    "Of course.\n",
+]
+PROSE_AFTER = [
+    "\n\nLet me know if you would like more detail.",
+    "\nNote: scores use a {1-10} scale.",
+]
+
+
+def trailing_commas(body):
+    return body.replace("\n    ]", ",\n    ]").replace("\n}", ",\n}")
+
+
+def truncate(rng, body):
+    # Cut somewhere in the last third, as a max_output_tokens limit would
+    return body[:rng.randint(len(body) * 2 // 3, len(body) - 2)]
+
+
+VARIANTS = {
+    "clean": lambda rng, body: body,
+    "json fence": lambda rng, body: f"```json\n{body}\n```",
+    "bare fence": lambda rng, body: f"```\n{body}\n```",
+    "leading prose": lambda rng, body: rng.choice(PROSE_BEFORE) + body,
+    "trailing prose": lambda rng, body: f"```json\n{body}\n```" + rng.choice(PROSE_AFTER),
+    "trailing commas": lambda rng, body: trailing_commas(body),
+    "truncated": lambda rng, body: "```json\n" + truncate(rng, body),
+}
+
+
+def legacy_parse(text):
+    response_text = text.strip()
+    if response_text.startswith('```json'):
+        response_text = response_text[7:]
+    if response_text.endswith('```'):
+        response_text = response_text[:-3]
+    return json.loads(response_text.strip())
+
+
+def legacy_partial(text):
+    # The per-chunk parser used before the incremental extractor: re-parses the whole buffer every time
+    decoder = json.JSONDecoder()
+    start = text.find('{')
+    if start == -1:
+        return {}
+    fields = {}
+    pos = start + 1
+    while True:
+        while pos < len(text) and text[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(text) or text[pos] != '"':
+            return fields
+        try:
+            key, pos = decoder.raw_decode(text, pos)
+        except ValueError:
+            return fields
+        while pos < len(text) and text[pos] in ' \t\r\n:':
+            pos += 1
+        if pos >= len(text):
+            return fields
+        try:
+            value, pos = decoder.raw_decode(text, pos)
+        except ValueError:
+            return fields
+        if pos >= len(text) and not isinstance(value, (str, list, dict)):
+            return fields
+        fields[key] = value
+
+
+def build_corpus(rng, copies):
+    corpus = []
+    for _ in range(copies):
+        for call_type, schema in SCHEMAS.items():
+            body = json.dumps(FakeBackend.CANNED_RESPONSES[call_type], indent=4)
+            for variant, make in VARIANTS.items():
+                corpus.append((variant, call_type, make(rng, body)))
+    return corpus
+
+
+def run(name, parse, corpus):
+    ok = {variant: 0 for variant in VARIANTS}
+    total = {variant: 0 for variant in VARIANTS}
+    started = time.perf_counter()
+    for variant, call_type, text in corpus:
+        total[variant] += 1
+        try:
+            result = parse(text, call_type)
+        except ValueError:
+            continue
+        # Count a success only if the result satisfies the schema the service expects
+        try:
+            SCHEMAS[call_type].validate(result)
+        except ValueError:
+            continue
+        ok[variant] += 1
+    elapsed = time.perf_counter() - started
+    return ok, total, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = build_corpus(rng, args.copies)
+    print(f"corpus: {len(corpus)} responses")
+
+    results = {
+        "legacy": run("legacy", lambda text, call_type: legacy_parse(text), corpus),
+        "extractor": run("extractor", lambda text, call_type: extract_json(text, SCHEMAS[call_type]), corpus),
+    }
+
+    print(f"\n{'variant':<16}" + "".join(f"{name:>12}" for name in results))
+    for variant in VARIANTS:
+        row = "".join(f"{results[name][0][variant] / results[name][1][variant]:12.1%}" for name in results)
+        print(f"{variant:<16}{row}")
+    print(f"{'overall':<16}" + "".join(f"{sum(ok.values()) / sum(total.values()):12.1%}" for ok, total, _ in results.values()))
+    print(f"{'us/response':<16}" + "".join(f"{elapsed / len(corpus) * 1e6:12.1f}" for _, _, elapsed in results.values()))
+
+    # Streaming: feed each clean evaluation response in 24-character chunks
+    streams = [text for variant, call_type, text in corpus if variant == "json fence" and call_type == "resume_bundle"]
+    chunk = FakeBackend.STREAM_CHUNK_SIZE
+
+    started = time.perf_counter()
+    for text in streams:
+        buffer = ""
+        for i in range(0, len(text), chunk):
+            buffer += text[i:i + chunk]
+            legacy_partial(buffer)
+    legacy_stream = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for text in streams:
+        extractor = IncrementalJSONExtractor(BUNDLE_SCHEMA)
+        for i in range(0, len(text), chunk):
+            extractor.feed(text[i:i + chunk])
+        extractor.result()
+    incremental_stream = time.perf_counter() - started
+
+    print(f"\nstreaming {len(streams)} bundle responses ({len(streams[0])} chars, {chunk}-char chunks):")
+    print(f"  re-parse per chunk   {legacy_stream / len(streams) * 1e6:9.1f} us/response")
+    print(f"  incremental          {incremental_stream / len(streams) * 1e6:9.1f} us/response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Measure the import cost of the app's modules and which heavy dependencies they pull in.
+
+Each module is imported in a fresh interpreter with `python -X importtime`, so
+every measurement is a cold import (apart from the OS file cache).
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Everything app.py imports at the top, in order
+APP_MODULES = [
+    "streamlit",
+    "services.resume_analyzer",
+    "services.interview_coach",
+    "services.question_prefetcher",
+    "services.batch_screening",
+    "services.ats_scorer",
+    "utils.pdf_parser",
+    "utils.telemetry",
+    "database",
+]
+
+# Dependencies that should only load when a feature is first used
+HEAVY_MODULES = ["sqlalchemy", "google.generativeai", "openai", "pdfplumber", "numpy", "http.server"]
+
+
+def import_time_us(module):
+    """Cumulative import time of a module in a fresh interpreter, in microseconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise Exception(f"import {module} failed: {result.stderr.strip().splitlines()[-1]}")
+    for line in reversed(result.stderr.splitlines()):
+        # "import time: self [us] | cumulative | imported package"
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise Exception(f"no importtime entry for {module}")
+
+
+def loaded_heavy_modules(modules):
+    """Heavy dependencies present in sys.modules after importing the given modules"""
+    code = (
+        "import sys\n"
+        + "".join(f"import {module}\n" for module in modules)
+        + f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(result.stderr.strip().splitlines()[-1])
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'module':<32} {'median ms':>10} {'min ms':>8}")
+    for module in APP_MODULES + HEAVY_MODULES:
+        try:
+            samples = [import_time_us(module) / 1000 for _ in range(args.runs)]
+        except Exception as e:
+            print(f"{module:<32} {'n/a':>10}  ({e})")
+            continue
+        print(f"{module:<32} {statistics.median(samples):10.1f} {min(samples):8.1f}")
+
+    app_only = [m for m in APP_MODULES if m != "streamlit"]
+    print()
+    print("heavy modules loaded by the app's imports:", ", ".join(loaded_heavy_modules(app_only)) or "none")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,25 @@
-# Database initialization
\ No newline at end of file
+# Database initialization
+#
+# Importing this package is cheap: SQLAlchemy, the engine and the DatabaseService
+# are only loaded the first time db_service is actually used.
+import threading
+
+_db_service = None
+_db_service_lock = threading.Lock()
+
+def get_db_service():
+    """Return the shared DatabaseService, creating it on first use"""
+    global _db_service
+    with _db_service_lock:
+        if _db_service is None:
+            from database.service import DatabaseService
+            _db_service = DatabaseService()
+        return _db_service
+
+class LazyDatabaseService:
+    """Stand-in for the shared DatabaseService that creates it on first attribute access"""
+
+    def __getattr__(self, name):
+        return getattr(get_db_service(), name)
+
+db_service = LazyDatabaseService()
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Iterator, Optional, Tuple
+
+
+class BlobStore:
+    """Content-addressed storage for binary uploads, keyed by SHA-256 of the bytes"""
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def put(self, data: bytes) -> Tuple[str, int]:
+        """Store bytes (deduplicated) and return (sha256, size)"""
+        raise NotImplementedError
+
+    def get(self, sha256: str) -> Optional[bytes]:
+        """Return the stored bytes, or None if the blob is missing"""
+        raise NotImplementedError
+
+    def exists(self, sha256: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, sha256: str):
+        raise NotImplementedError
+
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        """Yield (sha256, time last written) for every stored blob"""
+        raise NotImplementedError
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files under root/ab/cd/<sha256>, written atomically"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("BLOB_STORE_PATH", ".blobs")
+
+    def _path(self, sha256: str) -> str:
+        if len(sha256) != 64 or any(c not in "0123456789abcdef" for c in sha256):
+            raise Exception(f"Invalid blob key: {sha256!r}")
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def put(self, data: bytes) -> Tuple[str, int]:
+        sha256 = self.digest(data)
+        path = self._path(sha256)
+        if os.path.exists(path):
+            # Refresh the write time so the orphan sweep leaves a reused blob alone until its row commits
+            os.utime(path)
+            return sha256, len(data)
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temp file in the same directory so concurrent writers never expose a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return sha256, len(data)
+
+    def get(self, sha256: str) -> Optional[bytes]:
+        try:
+            with open(self._path(sha256), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self._path(sha256))
+
+    def delete(self, sha256: str):
+        try:
+            os.remove(self._path(sha256))
+        except FileNotFoundError:
+            pass
+
+    def iter_blobs(self) -> Iterator[Tuple[str, float]]:
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if name.startswith(".tmp-"):
+                    continue
+                try:
+                    yield name, os.path.getmtime(os.path.join(directory, name))
+                except FileNotFoundError:
+                    continue
+
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+def get_blob_store() -> BlobStore:
+    """Process-wide blob store, created on first use"""
+    global _blob_store
+    with _blob_store_lock:
+        if _blob_store is None:
+            _blob_store = LocalBlobStore()
+        return _blob_store
+
+def set_blob_store(store: BlobStore):
+    """Swap in another BlobStore implementation (e.g. an object-storage backend)"""
+    global _blob_store
+    with _blob_store_lock:
+        _blob_store = store
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Lightweight read models built from column projections. Listing queries return
+# these instead of ORM objects so text, JSON and PDF data are never loaded.
+
+@dataclass(frozen=True, slots=True)
+class ResumeSubmissionSummary:
+    id: int
+    session_id: str
+    filename: str
+    alignment_score: Optional[float]
+    pdf_size: Optional[int]
+    created_at: datetime
+
+@dataclass(frozen=True, slots=True)
+class ResumeSubmissionDetail:
+    id: int
+    session_id: str
+    filename: str
+    alignment_score: Optional[float]
+    pdf_size: Optional[int]
+    created_at: datetime
+    extracted_text: str
+    job_description: str
+    analysis_result: Dict[str, Any]
+
+@dataclass(frozen=True, slots=True)
+class InterviewSessionSummary:
+    id: int
+    session_id: str
+    job_role: str
+    interview_type: str
+    focus_areas: List[str]
+    total_questions: Optional[int]
+    average_score: Optional[float]
+    created_at: datetime
+    completed_at: Optional[datetime]
+
+@dataclass(frozen=True, slots=True)
+class InterviewQuestionSummary:
+    id: int
+    interview_session_id: int
+    question_order: int
+    score: Optional[float]
+    created_at: datetime
+
+@dataclass(frozen=True, slots=True)
+class InterviewQuestionDetail:
+    id: int
+    interview_session_id: int
+    question_order: int
+    score: Optional[float]
+    created_at: datetime
+    question_text: str
+    answer_text: str
+    feedback: Dict[str, Any]
+
+@dataclass(frozen=True, slots=True)
+class QuestionBankItem:
+    id: int
+    job_role_key: str
+    focus_area: str
+    question_text: str
+    times_served: int
+    created_at: datetime
+
+@dataclass(frozen=True, slots=True)
+class Page:
+    """One page of a keyset-paginated listing; pass next_cursor back to fetch the next page"""
+    items: List[Any]
+    next_cursor: Optional[str]
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return f"{created_at.isoformat()}|{row_id}"
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, row_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        raise Exception(f"Invalid page cursor: {cursor!r}")
@@ -0,0 +1,262 @@
+"""
+Versioned schema migrations.
+
+    python -m database.migrations upgrade [--batch-size 100] [--drop-legacy-column]
+    python -m database.migrations status
+    python -m database.migrations gc-blobs [--min-age 3600]
+
+Applied revisions are recorded in the schema_migrations table. Each migration
+checks the live schema before changing it, so databases created by the old
+create_all() at import time are brought up to date without errors.
+"""
+import argparse
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Any, List
+from sqlalchemy import inspect, text
+from database.models import Base, QuestionBankEntry, QuestionBankServed, get_engine, create_tables
+from database.blob_store import BlobStore, get_blob_store
+
+logger = logging.getLogger(__name__)
+
+def _ensure_version_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "revision VARCHAR(64) PRIMARY KEY, "
+            "applied_at TIMESTAMP NOT NULL)"
+        ))
+
+def is_unmanaged(engine) -> bool:
+    """True for a database no migration has touched yet: empty, or created by the old create_all()"""
+    return not inspect(engine).has_table("schema_migrations")
+
+def applied_revisions(engine) -> List[str]:
+    """Revisions already applied to the database, in order"""
+    if is_unmanaged(engine):
+        return []
+    with engine.connect() as conn:
+        return [row[0] for row in conn.execute(text("SELECT revision FROM schema_migrations ORDER BY revision"))]
+
+def pending_revisions(engine) -> List[str]:
+    applied = set(applied_revisions(engine))
+    return [revision for revision, _ in MIGRATIONS if revision not in applied]
+
+def _create_index_if_missing(conn, inspector, table: str, name: str, columns: List[str]):
+    if name not in {index["name"] for index in inspector.get_indexes(table)}:
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+
+# Migrations
+
+def _initial_schema(engine, options: Dict[str, Any]):
+    """Create any missing tables at the current model definition"""
+    create_tables()
+
+def add_pdf_blob_columns(engine) -> bool:
+    """Add the pdf_sha256/pdf_size columns to resume_submissions; returns True if anything changed"""
+    inspector = inspect(engine)
+    if not inspector.has_table("resume_submissions"):
+        return False
+
+    columns = {column["name"] for column in inspector.get_columns("resume_submissions")}
+    indexes = {index["name"] for index in inspector.get_indexes("resume_submissions")}
+    changed = False
+    with engine.begin() as conn:
+        if "pdf_sha256" not in columns:
+            conn.execute(text("ALTER TABLE resume_submissions ADD COLUMN pdf_sha256 VARCHAR(64)"))
+            changed = True
+        if "pdf_size" not in columns:
+            conn.execute(text("ALTER TABLE resume_submissions ADD COLUMN pdf_size INTEGER"))
+            changed = True
+        if "ix_resume_submissions_pdf_sha256" not in indexes:
+            conn.execute(text("CREATE INDEX ix_resume_submissions_pdf_sha256 ON resume_submissions (pdf_sha256)"))
+            changed = True
+    return changed
+
+def migrate_pdf_blobs(engine, store: BlobStore, batch_size: int = 100, drop_legacy_column: bool = False) -> Dict[str, Any]:
+    """Move PDF bytes from resume_submissions.pdf_content into the blob store"""
+    add_pdf_blob_columns(engine)
+
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("resume_submissions")}
+    if "pdf_content" not in columns:
+        return {"migrated": 0, "blobs": 0, "bytes": 0, "dropped_legacy_column": False}
+
+    migrated = 0
+    total_bytes = 0
+    digests = set()
+    last_id = 0
+    while True:
+        # Keyset batches keep memory bounded to batch_size PDFs
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, pdf_content FROM resume_submissions "
+                    "WHERE id > :last_id AND pdf_content IS NOT NULL "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size}
+            ).all()
+            if not rows:
+                break
+
+            for row_id, pdf_content in rows:
+                pdf_sha256, pdf_size = store.put(bytes(pdf_content))
+                conn.execute(
+                    text(
+                        "UPDATE resume_submissions "
+                        "SET pdf_sha256 = :sha, pdf_size = :size, pdf_content = NULL "
+                        "WHERE id = :id"
+                    ),
+                    {"sha": pdf_sha256, "size": pdf_size, "id": row_id}
+                )
+                digests.add(pdf_sha256)
+                total_bytes += pdf_size
+            migrated += len(rows)
+            last_id = rows[-1][0]
+
+    if drop_legacy_column:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE resume_submissions DROP COLUMN pdf_content"))
+
+    return {
+        "migrated": migrated,
+        "blobs": len(digests),
+        "bytes": total_bytes,
+        "dropped_legacy_column": drop_legacy_column
+    }
+
+def collect_orphan_blobs(engine, store: BlobStore, min_age_seconds: float = 3600) -> Dict[str, int]:
+    """Delete blobs no resume_submissions row references, e.g. left behind by a rolled-back save"""
+    # Saves write the blob before their transaction commits, so recent blobs may belong to a save in flight
+    cutoff = time.time() - min_age_seconds
+    candidates = [sha256 for sha256, written_at in store.iter_blobs() if written_at < cutoff]
+    if not candidates:
+        return {"checked": 0, "deleted": 0}
+
+    with engine.connect() as conn:
+        referenced = {
+            row[0] for row in conn.execute(
+                text("SELECT DISTINCT pdf_sha256 FROM resume_submissions WHERE pdf_sha256 IS NOT NULL")
+            )
+        }
+    deleted = 0
+    for sha256 in candidates:
+        if sha256 not in referenced:
+            store.delete(sha256)
+            deleted += 1
+    return {"checked": len(candidates), "deleted": deleted}
+
+def _pdf_blob_store(engine, options: Dict[str, Any]):
+    """Move PDFs out of resume_submissions into the content-addressed blob store"""
+    result = migrate_pdf_blobs(
+        engine,
+        get_blob_store(),
+        options.get("batch_size", 100),
+        options.get("drop_legacy_column", False)
+    )
+    if result["migrated"]:
+        logger.info("Moved %d PDFs (%d bytes) into %d blobs", result["migrated"], result["bytes"], result["blobs"])
+
+def _foreign_keys_and_indexes(engine, options: Dict[str, Any]):
+    """Link interview_questions to interview_sessions and add the composite listing indexes"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        _create_index_if_missing(conn, inspector, "resume_submissions",
+                                 "ix_resume_submissions_session_id_created_at", ["session_id", "created_at"])
+        _create_index_if_missing(conn, inspector, "interview_sessions",
+                                 "ix_interview_sessions_session_id_created_at", ["session_id", "created_at"])
+        _create_index_if_missing(conn, inspector, "interview_questions",
+                                 "ix_interview_questions_session_id_created_at", ["session_id", "created_at"])
+        _create_index_if_missing(conn, inspector, "interview_questions",
+                                 "ix_interview_questions_interview_session_id_question_order",
+                                 ["interview_session_id", "question_order"])
+
+        foreign_keys = {fk["name"] for fk in inspector.get_foreign_keys("interview_questions")}
+        if "fk_interview_questions_interview_session_id" in foreign_keys or engine.dialect.name == "sqlite":
+            # SQLite cannot add constraints to an existing table; fresh SQLite databases get it from create_all
+            return
+
+        # Detach answers whose session row no longer exists so the constraint can be validated
+        conn.execute(text(
+            "UPDATE interview_questions SET interview_session_id = NULL "
+            "WHERE interview_session_id IS NOT NULL "
+            "AND interview_session_id NOT IN (SELECT id FROM interview_sessions)"
+        ))
+        conn.execute(text(
+            "ALTER TABLE interview_questions ADD CONSTRAINT fk_interview_questions_interview_session_id "
+            "FOREIGN KEY (interview_session_id) REFERENCES interview_sessions (id) ON DELETE CASCADE"
+        ))
+
+def _question_bank(engine, options: Dict[str, Any]):
+    """Create the interview question bank and the per-user served log"""
+    Base.metadata.create_all(bind=engine, tables=[QuestionBankEntry.__table__, QuestionBankServed.__table__])
+
+MIGRATIONS = [
+    ("0001_initial_schema", _initial_schema),
+    ("0002_pdf_blob_store", _pdf_blob_store),
+    ("0003_foreign_keys_and_indexes", _foreign_keys_and_indexes),
+    ("0004_question_bank", _question_bank),
+]
+
+HEAD_REVISION = MIGRATIONS[-1][0]
+
+def upgrade(engine, **options) -> List[str]:
+    """Apply every pending migration in order and return the revisions applied"""
+    _ensure_version_table(engine)
+    applied = []
+    for revision, migrate in MIGRATIONS:
+        if revision in applied_revisions(engine):
+            continue
+        logger.info("Applying %s", revision)
+        migrate(engine, options)
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO schema_migrations (revision, applied_at) VALUES (:revision, :applied_at)"),
+                {"revision": revision, "applied_at": datetime.utcnow()}
+            )
+        applied.append(revision)
+    return applied
+
+def ensure_schema_current(engine):
+    """Fail fast when the database has not been migrated to the code's schema"""
+    pending = pending_revisions(engine)
+    if pending:
+        raise Exception(
+            f"Database schema is out of date (pending: {', '.join(pending)}). "
+            f"Run `python -m database.migrations upgrade` or set DB_AUTO_MIGRATE=true."
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", choices=["upgrade", "status", "gc-blobs"], default="upgrade")
+    parser.add_argument("--batch-size", type=int, default=100,
+                        help="PDFs moved per transaction by the blob store migration")
+    parser.add_argument("--drop-legacy-column", action="store_true",
+                        help="drop resume_submissions.pdf_content once every blob has moved")
+    parser.add_argument("--min-age", type=float, default=3600,
+                        help="seconds a blob must have existed before gc-blobs may delete it")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    engine = get_engine()
+
+    if args.command == "status":
+        applied = set(applied_revisions(engine))
+        for revision, _ in MIGRATIONS:
+            print(f"[{'x' if revision in applied else ' '}] {revision}")
+        return
+
+    if args.command == "gc-blobs":
+        result = collect_orphan_blobs(engine, get_blob_store(), args.min_age)
+        print(f"Deleted {result['deleted']} unreferenced blob(s) of {result['checked']} checked")
+        return
+
+    applied = upgrade(engine, batch_size=args.batch_size, drop_legacy_column=args.drop_legacy_column)
+    if args.drop_legacy_column and "0002_pdf_blob_store" not in applied:
+        # Blobs were moved by an earlier upgrade; drop the column now if it is still there
+        migrate_pdf_blobs(engine, get_blob_store(), args.batch_size, drop_legacy_column=True)
+    print(f"Database is at {HEAD_REVISION}" if not applied else f"Applied {len(applied)} migration(s); now at {HEAD_REVISION}")
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,103 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, LargeBinary, Text, Float, JSON
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import event, create_engine, Column, Integer, String, DateTime, Text, Float, JSON, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from datetime import datetime
 
-# Database configuration
-DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class CheckoutMetrics:
+    """How long callers waited for a pooled connection, measured around Engine.connect()"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+    
+    def record(self, waited, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+    
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_time_total_seconds": round(self.wait_time_total, 6),
+                "wait_time_max_seconds": round(self.wait_time_max, 6),
+                "wait_time_avg_seconds": round(self.wait_time_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+
+checkout_metrics = CheckoutMetrics()
+
+def _engine_options(database_url):
+    """Pool configuration from environment variables"""
+    if not database_url or database_url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": QueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+# Database configuration: the engine is created on first use so importing the models never needs DATABASE_URL
+_engine = None
+_engine_lock = threading.Lock()
+# Objects stay readable after commit so service methods can return them once the session closes
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def get_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            database_url = os.getenv("DATABASE_URL")
+            if not database_url:
+                raise Exception("DATABASE_URL is not set")
+            _engine = create_engine(database_url, **_engine_options(database_url))
+            if _engine.dialect.name == "sqlite":
+                # SQLite ignores foreign keys (and ON DELETE CASCADE) unless enabled on every connection
+                event.listen(_engine, "connect", _enable_sqlite_foreign_keys)
+            SessionLocal.configure(bind=_engine)
+        return _engine
+
 class ResumeSubmission(Base):
     __tablename__ = "resume_submissions"
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String, index=True)
     filename = Column(String)
-    pdf_content = Column(LargeBinary)  # Store PDF as BLOB
+    # PDF bytes live in the blob store (database/blob_store.py), keyed by content hash
+    pdf_sha256 = Column(String(64), index=True)
+    pdf_size = Column(Integer)
     extracted_text = Column(Text)
     job_description = Column(Text)
     analysis_result = Column(JSON)
     alignment_score = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index("ix_resume_submissions_session_id_created_at", "session_id", "created_at"),
+    )
+    
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
     
@@ -35,28 +110,121 @@ class InterviewSession(Base):
     average_score = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime)
+    
+    __table_args__ = (
+        Index("ix_interview_sessions_session_id_created_at", "session_id", "created_at"),
+    )
 
 class InterviewQuestion(Base):
     __tablename__ = "interview_questions"
     
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String, index=True)
-    interview_session_id = Column(Integer)
+    interview_session_id = Column(
+        Integer,
+        ForeignKey("interview_sessions.id", name="fk_interview_questions_interview_session_id", ondelete="CASCADE")
+    )
     question_text = Column(Text)
     answer_text = Column(Text)
     feedback = Column(JSON)
     score = Column(Float)
     question_order = Column(Integer)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_interview_questions_session_id_created_at", "session_id", "created_at"),
+        Index("ix_interview_questions_interview_session_id_question_order", "interview_session_id", "question_order"),
+    )
+
+class QuestionBankEntry(Base):
+    __tablename__ = "question_bank"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    # Normalized job role and focus area the question was generated for (see services/question_bank.py)
+    job_role_key = Column(String(200), nullable=False)
+    focus_area = Column(String(100), nullable=False)
+    question_text = Column(Text, nullable=False)
+    # Hash of the normalized question words; collapses exact rewordings
+    fingerprint = Column(String(64), nullable=False)
+    source = Column(String(20), default="generated")
+    times_served = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_served_at = Column(DateTime)
+    
+    __table_args__ = (
+        UniqueConstraint("job_role_key", "focus_area", "fingerprint", name="uq_question_bank_key_fingerprint"),
+        Index("ix_question_bank_job_role_key_focus_area", "job_role_key", "focus_area"),
+    )
+
+class QuestionBankServed(Base):
+    __tablename__ = "question_bank_served"
+    
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String, nullable=False)
+    question_id = Column(
+        Integer,
+        ForeignKey("question_bank.id", name="fk_question_bank_served_question_id", ondelete="CASCADE"),
+        nullable=False
+    )
+    served_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("session_id", "question_id", name="uq_question_bank_served_session_id_question_id"),
+    )
 
-# Create all tables
+# Create all tables at the latest schema (used by the initial migration; see database/migrations.py)
 def create_tables():
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
+
+def connect():
+    """Check a connection out of the pool, recording the wait in checkout_metrics"""
+    engine = get_engine()
+    started = time.perf_counter()
+    try:
+        connection = engine.connect()
+    except PoolTimeoutError:
+        # Only an exhausted pool counts as a timeout; connection errors are not pool waits
+        checkout_metrics.record(time.perf_counter() - started, timed_out=True)
+        raise
+    checkout_metrics.record(time.perf_counter() - started)
+    return connection
 
 # Database dependency
 def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+    with connect() as connection:
+        db = SessionLocal(bind=connection)
+        try:
+            yield db
+        finally:
+            db.close()
+
+# Unit of work: commit on success, roll back on error
+@contextmanager
+def session_scope():
+    with connect() as connection:
+        db = SessionLocal(bind=connection)
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+def get_pool_metrics():
+    """Connection pool gauges and wait-time counters for monitoring"""
+    pool = get_engine().pool
+    metrics = {
+        "pool_class": type(pool).__name__,
+        "status": pool.status(),
+    }
+    if isinstance(pool, QueuePool):
+        metrics.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+        })
+    metrics.update(checkout_metrics.snapshot())
+    return metrics
\ No newline at end of file
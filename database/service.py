@@ -1,14 +1,148 @@
+import functools
+import os
+import threading
+import time
 import uuid
+from contextlib import contextmanager
+from concurrent.futures import Future
+from contextvars import ContextVar
+from dataclasses import fields
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.orm import Session
-from database.models import ResumeSubmission, InterviewSession, InterviewQuestion, get_db, create_tables
-from typing import Optional, List, Dict, Any
+from database.models import (
+    ResumeSubmission, InterviewSession, InterviewQuestion, QuestionBankEntry, QuestionBankServed,
+    get_engine, session_scope, get_pool_metrics
+)
+from database.migrations import upgrade, ensure_schema_current, is_unmanaged
+from database.blob_store import get_blob_store
+from database.write_behind import WriteBehindQueue
+from database.dto import (
+    Page, ResumeSubmissionSummary, ResumeSubmissionDetail, InterviewSessionSummary,
+    InterviewQuestionSummary, InterviewQuestionDetail, QuestionBankItem, encode_cursor, decode_cursor
+)
+from typing import Optional, List, Dict, Any, Callable
 from datetime import datetime
+from utils.telemetry import cache_lookups, current_span, registry, tracer
+
+# Session of the unit of work active in the current thread/task, if any
+_current_unit_of_work: ContextVar[Optional[Session]] = ContextVar("current_unit_of_work", default=None)
+
+operation_duration = registry.histogram(
+    "db_operation_duration_seconds", "Latency of DatabaseService operations", ("operation", "outcome")
+)
+
+def _instrumented(method: Callable) -> Callable:
+    """Run a service method in a db.<name> span and record its latency"""
+    operation = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with tracer.start_span(f"db.{operation}", {"db.operation": operation}):
+                result = method(self, *args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            operation_duration.observe(time.perf_counter() - started, operation=operation, outcome=outcome)
+    return wrapper
 
 class DatabaseService:
     def __init__(self):
-        # Create tables if they don't exist
-        create_tables()
+        # Schema changes go through database/migrations.py. By default ("auto") they are applied here only
+        # for a database no migration has touched yet; pending upgrades of a managed database need the CLI
+        auto_migrate = os.getenv("DB_AUTO_MIGRATE", "auto").lower()
+        engine = get_engine()
+        if auto_migrate in ("1", "true", "yes") or (auto_migrate == "auto" and is_unmanaged(engine)):
+            upgrade(engine)
+        else:
+            ensure_schema_current(engine)
+        self.blob_store = get_blob_store()
+        
+        # Short-lived per-session statistics cache; save_* methods invalidate it
+        self.stats_ttl_seconds = float(os.getenv("STATS_CACHE_TTL_SECONDS", 30))
+        self._stats_cache: Dict[str, Any] = {}
+        self._stats_lock = threading.Lock()
+        # Bumped on every committed write so callers can key their own caches on it
+        self._data_versions: Dict[str, int] = {}
+        
+        # Optional write-behind mode: saves submitted via enqueue() are applied by a background worker
+        self.write_behind = None
+        if os.getenv("DB_WRITE_BEHIND", "false").lower() in ("1", "true", "yes"):
+            self.write_behind = WriteBehindQueue(self)
+    
+    def _invalidate_statistics(self, session_id: str):
+        with self._stats_lock:
+            self._stats_cache.pop(session_id, None)
+            self._data_versions[session_id] = self._data_versions.get(session_id, 0) + 1
+    
+    def get_data_version(self, session_id: str) -> int:
+        """Counter that changes whenever data for the session is written (for cache keys)"""
+        with self._stats_lock:
+            return self._data_versions.get(session_id, 0)
+    
+    def _invalidate_statistics_on_commit(self, db: Session, session_id: str):
+        db.info.setdefault("invalidate_statistics", set()).add(session_id)
     
+    def _after_commit(self, db: Session):
+        for session_id in db.info.pop("invalidate_statistics", set()):
+            self._invalidate_statistics(session_id)
+    
+    @contextmanager
+    def unit_of_work(self):
+        """Group several service calls into one transaction, committed when the block exits"""
+        db = _current_unit_of_work.get()
+        if db is not None:
+            # Nested unit of work joins the outer transaction
+            yield db
+            return
+        
+        with session_scope() as db:
+            token = _current_unit_of_work.set(db)
+            try:
+                yield db
+            finally:
+                _current_unit_of_work.reset(token)
+        self._after_commit(db)
+    
+    @contextmanager
+    def _session(self):
+        """Session for one service call: joins the active unit of work or runs its own transaction"""
+        db = _current_unit_of_work.get()
+        if db is not None:
+            yield db
+            db.flush()
+            return
+        
+        with session_scope() as db:
+            yield db
+        self._after_commit(db)
+    
+    def enqueue(self, method: str, **kwargs) -> Future:
+        """Run a save_*/update_* method in write-behind mode if enabled, otherwise right away"""
+        if not method.startswith(("save_", "update_")):
+            raise Exception(f"Only save_*/update_* methods can be enqueued, got {method}")
+        
+        if self.write_behind is not None:
+            return self.write_behind.submit(getattr(self, method), **kwargs)
+        
+        future: Future = Future()
+        try:
+            future.set_result(getattr(self, method)(**kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def get_write_behind_stats(self) -> Optional[Dict[str, Any]]:
+        """Write-behind queue depth and flush latency, or None when the mode is off"""
+        return self.write_behind.stats() if self.write_behind is not None else None
+    
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Connection pool metrics for monitoring"""
+        return get_pool_metrics()
+    
+    @_instrumented
     def save_resume_submission(self, 
                              session_id: str,
                              filename: str,
@@ -17,32 +151,60 @@ class DatabaseService:
                              job_description: str,
                              analysis_result: Dict[str, Any]) -> int:
         """Save resume submission to database"""
-        db = next(get_db())
-        try:
+        # Written before the row so a committed row never points at a missing blob; a rollback leaves
+        # an orphan that `python -m database.migrations gc-blobs` removes
+        pdf_sha256, pdf_size = self.blob_store.put(pdf_content)
+        with self._session() as db:
             submission = ResumeSubmission(
                 session_id=session_id,
                 filename=filename,
-                pdf_content=pdf_content,
+                pdf_sha256=pdf_sha256,
+                pdf_size=pdf_size,
                 extracted_text=extracted_text,
                 job_description=job_description,
                 analysis_result=analysis_result,
                 alignment_score=analysis_result.get('alignment_score', 0)
             )
             db.add(submission)
-            db.commit()
-            db.refresh(submission)
+            db.flush()
+            self._invalidate_statistics_on_commit(db, session_id)
             return submission.id
-        finally:
-            db.close()
     
+    @_instrumented
+    def save_resume_submissions(self,
+                              session_id: str,
+                              job_description: str,
+                              submissions: List[Dict[str, Any]]) -> List[int]:
+        """Save many resume submissions for one job description in a single transaction"""
+        blobs = [self.blob_store.put(submission["pdf_content"]) for submission in submissions]
+        with self._session() as db:
+            rows = [
+                ResumeSubmission(
+                    session_id=session_id,
+                    filename=submission["filename"],
+                    pdf_sha256=pdf_sha256,
+                    pdf_size=pdf_size,
+                    extracted_text=submission["extracted_text"],
+                    job_description=job_description,
+                    analysis_result=submission["analysis_result"],
+                    alignment_score=submission["analysis_result"].get('alignment_score', 0)
+                )
+                for submission, (pdf_sha256, pdf_size) in zip(submissions, blobs)
+            ]
+            db.add_all(rows)
+            db.flush()
+            ids = [row.id for row in rows]
+            self._invalidate_statistics_on_commit(db, session_id)
+            return ids
+    
+    @_instrumented
     def save_interview_session(self,
                              session_id: str,
                              job_role: str,
                              focus_areas: List[str],
                              interview_type: str) -> int:
         """Save interview session to database"""
-        db = next(get_db())
-        try:
+        with self._session() as db:
             session = InterviewSession(
                 session_id=session_id,
                 job_role=job_role,
@@ -50,12 +212,11 @@ class DatabaseService:
                 interview_type=interview_type
             )
             db.add(session)
-            db.commit()
-            db.refresh(session)
+            db.flush()
+            self._invalidate_statistics_on_commit(db, session_id)
             return session.id
-        finally:
-            db.close()
     
+    @_instrumented
     def save_interview_question(self,
                               session_id: str,
                               interview_session_id: int,
@@ -65,8 +226,7 @@ class DatabaseService:
                               score: float,
                               question_order: int) -> int:
         """Save interview question and answer to database"""
-        db = next(get_db())
-        try:
+        with self._session() as db:
             question = InterviewQuestion(
                 session_id=session_id,
                 interview_session_id=interview_session_id,
@@ -77,101 +237,335 @@ class DatabaseService:
                 question_order=question_order
             )
             db.add(question)
-            db.commit()
-            db.refresh(question)
+            db.flush()
+            self._invalidate_statistics_on_commit(db, session_id)
             return question.id
-        finally:
-            db.close()
     
+    @_instrumented
     def update_interview_session_completion(self,
-                                          session_id: str,
+                                          interview_session_id: int,
                                           total_questions: int,
-                                          average_score: float):
-        """Update interview session with completion data"""
-        db = next(get_db())
-        try:
-            session = db.query(InterviewSession).filter(
-                InterviewSession.session_id == session_id
-            ).first()
+                                          average_score: float) -> bool:
+        """Update interview session with completion data; returns False if the session does not exist"""
+        with self._session() as db:
+            session = db.get(InterviewSession, interview_session_id)
+            if session is None:
+                return False
             
-            if session:
-                session.total_questions = total_questions
-                session.average_score = average_score
-                session.completed_at = datetime.utcnow()
-                db.commit()
-        finally:
-            db.close()
+            session.total_questions = total_questions
+            session.average_score = average_score
+            session.completed_at = datetime.utcnow()
+            self._invalidate_statistics_on_commit(db, session.session_id)
+            return True
+    
+    @staticmethod
+    def _project(dto):
+        """Columns to select for a DTO, in field order"""
+        return [field.name for field in fields(dto)]
+    
+    def _fetch(self, db: Session, dto, model, *filters, order_by=None, limit: Optional[int] = None) -> List[Any]:
+        query = select(*[getattr(model, name) for name in self._project(dto)]).where(*filters)
+        if order_by is not None:
+            query = query.order_by(*order_by)
+        if limit is not None:
+            query = query.limit(limit)
+        return [dto(*row) for row in db.execute(query)]
+    
+    def _fetch_page(self, db: Session, dto, model, *filters, limit: int = 20, cursor: Optional[str] = None) -> Page:
+        """Newest-first keyset pagination on (created_at, id)"""
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            filters += (or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < row_id)
+            ),)
+        # One extra row tells us whether another page exists
+        items = self._fetch(db, dto, model, *filters,
+                            order_by=(model.created_at.desc(), model.id.desc()), limit=limit + 1)
+        if len(items) > limit:
+            items = items[:limit]
+            return Page(items, encode_cursor(items[-1].created_at, items[-1].id))
+        return Page(items, None)
+    
+    @_instrumented
+    def list_resume_submissions(self, session_id: Optional[str] = None, limit: int = 20, cursor: Optional[str] = None) -> Page:
+        """Page of resume submission summaries, newest first; all sessions when session_id is None"""
+        filters = (ResumeSubmission.session_id == session_id,) if session_id is not None else ()
+        with self._session() as db:
+            return self._fetch_page(db, ResumeSubmissionSummary, ResumeSubmission, *filters, limit=limit, cursor=cursor)
+    
+    @_instrumented
+    def list_interview_sessions(self, session_id: str, limit: int = 20, cursor: Optional[str] = None) -> Page:
+        """Page of interview session summaries, newest first"""
+        with self._session() as db:
+            return self._fetch_page(db, InterviewSessionSummary, InterviewSession,
+                                    InterviewSession.session_id == session_id, limit=limit, cursor=cursor)
+    
+    @_instrumented
+    def list_interview_questions(self, session_id: str, limit: int = 20, cursor: Optional[str] = None) -> Page:
+        """Page of interview question summaries (scores only), newest first"""
+        with self._session() as db:
+            return self._fetch_page(db, InterviewQuestionSummary, InterviewQuestion,
+                                    InterviewQuestion.session_id == session_id, limit=limit, cursor=cursor)
     
-    def get_resume_submissions_by_session(self, session_id: str) -> List[ResumeSubmission]:
+    @_instrumented
+    def get_resume_submissions_by_session(self, session_id: str) -> List[ResumeSubmissionSummary]:
         """Get all resume submissions for a session"""
-        db = next(get_db())
-        try:
-            return db.query(ResumeSubmission).filter(
-                ResumeSubmission.session_id == session_id
-            ).all()
-        finally:
-            db.close()
+        with self._session() as db:
+            return self._fetch(db, ResumeSubmissionSummary, ResumeSubmission,
+                               ResumeSubmission.session_id == session_id,
+                               order_by=(ResumeSubmission.created_at, ResumeSubmission.id))
     
-    def get_interview_sessions_by_session(self, session_id: str) -> List[InterviewSession]:
+    @_instrumented
+    def get_interview_sessions_by_session(self, session_id: str) -> List[InterviewSessionSummary]:
         """Get all interview sessions for a session"""
-        db = next(get_db())
-        try:
-            return db.query(InterviewSession).filter(
-                InterviewSession.session_id == session_id
-            ).all()
-        finally:
-            db.close()
+        with self._session() as db:
+            return self._fetch(db, InterviewSessionSummary, InterviewSession,
+                               InterviewSession.session_id == session_id,
+                               order_by=(InterviewSession.created_at, InterviewSession.id))
     
-    def get_interview_questions_by_session(self, session_id: str) -> List[InterviewQuestion]:
+    @_instrumented
+    def get_interview_questions_by_session(self, session_id: str) -> List[InterviewQuestionSummary]:
         """Get all interview questions for a session"""
-        db = next(get_db())
-        try:
-            return db.query(InterviewQuestion).filter(
-                InterviewQuestion.session_id == session_id
-            ).order_by(InterviewQuestion.question_order).all()
-        finally:
-            db.close()
+        with self._session() as db:
+            return self._fetch(db, InterviewQuestionSummary, InterviewQuestion,
+                               InterviewQuestion.session_id == session_id,
+                               order_by=(InterviewQuestion.question_order, InterviewQuestion.id))
+    
+    @_instrumented
+    def get_resume_submission_detail(self, submission_id: int) -> Optional[ResumeSubmissionDetail]:
+        """Load a submission including its text and analysis (but not the PDF, see get_resume_pdf)"""
+        with self._session() as db:
+            rows = self._fetch(db, ResumeSubmissionDetail, ResumeSubmission, ResumeSubmission.id == submission_id)
+        return rows[0] if rows else None
+    
+    @_instrumented
+    def get_interview_question_details(self, interview_session_id: int) -> List[InterviewQuestionDetail]:
+        """Load the questions, answers and feedback of one interview session"""
+        with self._session() as db:
+            return self._fetch(db, InterviewQuestionDetail, InterviewQuestion,
+                               InterviewQuestion.interview_session_id == interview_session_id,
+                               order_by=(InterviewQuestion.question_order, InterviewQuestion.id))
     
-    def get_recent_submissions(self, limit: int = 10) -> List[ResumeSubmission]:
+    @_instrumented
+    def get_resume_pdf(self, submission_id: int) -> Optional[bytes]:
+        """Load the original PDF of a resume submission from the blob store"""
+        with self._session() as db:
+            pdf_sha256 = db.execute(
+                select(ResumeSubmission.pdf_sha256).where(ResumeSubmission.id == submission_id)
+            ).scalar_one_or_none()
+        return self.blob_store.get(pdf_sha256) if pdf_sha256 else None
+    
+    def get_recent_submissions(self, limit: int = 10) -> List[ResumeSubmissionSummary]:
         """Get recent resume submissions"""
-        db = next(get_db())
-        try:
-            return db.query(ResumeSubmission).order_by(
-                ResumeSubmission.created_at.desc()
-            ).limit(limit).all()
-        finally:
-            db.close()
+        return self.list_resume_submissions(limit=limit).items
+    
+    def _insert_or_ignore(self, db: Session, model, values: Dict[str, Any], conflict_columns: List[str]) -> None:
+        """INSERT that does nothing when a row with the same conflict_columns exists, without a savepoint"""
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            key_filters = [getattr(model, name) == values[name] for name in conflict_columns]
+            if db.execute(select(model.id).where(*key_filters)).first() is None:
+                db.add(model(**values))
+                db.flush()
+            return
+        db.execute(insert(model).values(**values).on_conflict_do_nothing(index_elements=conflict_columns))
     
+    @_instrumented
+    def save_bank_question(self,
+                         job_role_key: str,
+                         focus_area: str,
+                         question_text: str,
+                         fingerprint: str,
+                         source: str = "generated") -> int:
+        """Add a question to the bank; returns the existing entry's id if the fingerprint is already banked"""
+        with self._session() as db:
+            # Concurrent workers banking the same question both end up with the one row
+            self._insert_or_ignore(db, QuestionBankEntry, {
+                "job_role_key": job_role_key,
+                "focus_area": focus_area,
+                "question_text": question_text,
+                "fingerprint": fingerprint,
+                "source": source
+            }, ["job_role_key", "focus_area", "fingerprint"])
+            return db.execute(select(QuestionBankEntry.id).where(
+                QuestionBankEntry.job_role_key == job_role_key,
+                QuestionBankEntry.focus_area == focus_area,
+                QuestionBankEntry.fingerprint == fingerprint,
+            )).scalar_one()
+    
+    @_instrumented
+    def get_bank_questions(self, job_role_key: str, focus_area: str, limit: Optional[int] = None) -> List[QuestionBankItem]:
+        """Banked questions for a job role and focus area, newest first; the most recent limit when given"""
+        with self._session() as db:
+            return self._fetch(db, QuestionBankItem, QuestionBankEntry,
+                               QuestionBankEntry.job_role_key == job_role_key,
+                               QuestionBankEntry.focus_area == focus_area,
+                               order_by=(QuestionBankEntry.id.desc(),), limit=limit)
+    
+    @_instrumented
+    def get_fresh_bank_questions(self,
+                               session_id: Optional[str],
+                               job_role_key: str,
+                               focus_area: str,
+                               limit: int = 50) -> List[QuestionBankItem]:
+        """Banked questions not yet served to the user, least served first"""
+        filters = [
+            QuestionBankEntry.job_role_key == job_role_key,
+            QuestionBankEntry.focus_area == focus_area,
+        ]
+        if session_id is not None:
+            served = select(QuestionBankServed.question_id).where(QuestionBankServed.session_id == session_id)
+            filters.append(QuestionBankEntry.id.not_in(served))
+        with self._session() as db:
+            return self._fetch(db, QuestionBankItem, QuestionBankEntry, *filters,
+                               order_by=(QuestionBankEntry.times_served, QuestionBankEntry.id), limit=limit)
+    
+    @_instrumented
+    def save_bank_question_served(self, session_id: Optional[str], question_id: int) -> bool:
+        """Record that a banked question was served; returns False if the question does not exist"""
+        with self._session() as db:
+            updated = db.execute(
+                update(QuestionBankEntry)
+                .where(QuestionBankEntry.id == question_id)
+                .values(times_served=QuestionBankEntry.times_served + 1, last_served_at=datetime.utcnow())
+            )
+            if updated.rowcount == 0:
+                return False
+            if session_id is not None:
+                self._insert_or_ignore(db, QuestionBankServed, {
+                    "session_id": session_id,
+                    "question_id": question_id
+                }, ["session_id", "question_id"])
+            return True
+    
+    @_instrumented
+    def get_interview_score_timeline(self, session_id: str) -> List[Dict[str, Any]]:
+        """Question count and average score per interview session, oldest first, aggregated in the database"""
+        with self._session() as db:
+            totals = select(
+                InterviewQuestion.interview_session_id,
+                func.count(InterviewQuestion.id).label("questions"),
+                func.avg(InterviewQuestion.score).label("average_score")
+            ).where(
+                InterviewQuestion.session_id == session_id
+            ).group_by(InterviewQuestion.interview_session_id).subquery()
+            
+            rows = db.execute(
+                select(
+                    InterviewSession.id,
+                    InterviewSession.job_role,
+                    InterviewSession.created_at,
+                    totals.c.questions,
+                    totals.c.average_score
+                ).join(
+                    totals, totals.c.interview_session_id == InterviewSession.id
+                ).where(
+                    InterviewSession.session_id == session_id
+                ).order_by(InterviewSession.created_at, InterviewSession.id)
+            ).all()
+        
+        return [
+            {
+                "interview_session_id": row.id,
+                "job_role": row.job_role,
+                "started_at": row.created_at,
+                "questions": row.questions,
+                "average_score": round(float(row.average_score or 0), 2)
+            }
+            for row in rows
+        ]
+    
+    @_instrumented
+    def get_resume_score_trend(self, session_id: str) -> List[Dict[str, Any]]:
+        """Submission count and alignment scores per day, oldest first, aggregated in the database"""
+        day = func.date(ResumeSubmission.created_at)
+        with self._session() as db:
+            rows = db.execute(
+                select(
+                    day.label("day"),
+                    func.count(ResumeSubmission.id).label("submissions"),
+                    func.avg(ResumeSubmission.alignment_score).label("average_score"),
+                    func.max(ResumeSubmission.alignment_score).label("best_score")
+                ).where(
+                    ResumeSubmission.session_id == session_id
+                ).group_by(day).order_by(day)
+            ).all()
+        
+        return [
+            {
+                "day": str(row.day),
+                "submissions": row.submissions,
+                "average_score": round(float(row.average_score or 0), 2),
+                "best_score": float(row.best_score or 0)
+            }
+            for row in rows
+        ]
+    
+    @_instrumented
     def get_session_statistics(self, session_id: str) -> Dict[str, Any]:
         """Get statistics for a session"""
-        db = next(get_db())
-        try:
-            resume_count = db.query(ResumeSubmission).filter(
+        now = time.monotonic()
+        with self._stats_lock:
+            cached = self._stats_cache.get(session_id)
+            if cached and cached[0] > now:
+                cache_lookups.inc(cache="session_statistics", result="hit")
+                current_span().set_attribute("cache.hit", True)
+                return dict(cached[1])
+            # A save that commits while the query runs bumps the version; its result must not be cached
+            version = self._data_versions.get(session_id, 0)
+        cache_lookups.inc(cache="session_statistics", result="miss")
+        
+        with self._session() as db:
+            # One round trip: every count and the score sum come from scalar subqueries
+            resume_count = select(func.count(ResumeSubmission.id)).where(
                 ResumeSubmission.session_id == session_id
-            ).count()
+            ).scalar_subquery()
             
-            interview_count = db.query(InterviewSession).filter(
+            interview_count = select(func.count(InterviewSession.id)).where(
                 InterviewSession.session_id == session_id
-            ).count()
+            ).scalar_subquery()
             
-            questions_count = db.query(InterviewQuestion).filter(
+            question_totals = select(
+                func.count(InterviewQuestion.id).label("questions_count"),
+                func.coalesce(func.sum(InterviewQuestion.score), 0).label("score_sum")
+            ).where(
                 InterviewQuestion.session_id == session_id
-            ).count()
+            ).subquery()
             
-            avg_score = db.query(InterviewQuestion).filter(
-                InterviewQuestion.session_id == session_id
-            ).with_entities(InterviewQuestion.score).all()
+            row = db.execute(
+                select(
+                    resume_count,
+                    interview_count,
+                    question_totals.c.questions_count,
+                    question_totals.c.score_sum
+                )
+            ).one()
             
-            average_score = sum([s[0] for s in avg_score if s[0]]) / len(avg_score) if avg_score else 0
+            resume_submissions, interview_sessions, questions_count, score_sum = row
+            average_score = float(score_sum) / questions_count if questions_count else 0
             
-            return {
-                "resume_submissions": resume_count,
-                "interview_sessions": interview_count,
+            stats = {
+                "resume_submissions": resume_submissions,
+                "interview_sessions": interview_sessions,
                 "total_questions": questions_count,
                 "average_score": round(average_score, 2)
             }
-        finally:
-            db.close()
+        
+        # Uncommitted writes inside a unit of work must not leak into the shared cache
+        if _current_unit_of_work.get() is None:
+            with self._stats_lock:
+                if self._data_versions.get(session_id, 0) == version:
+                    self._stats_cache[session_id] = (now + self.stats_ttl_seconds, stats)
+        return dict(stats)
 
-# Global database service instance
-db_service = DatabaseService()
\ No newline at end of file
+def __getattr__(name):
+    # `from database.service import db_service` still works; the instance is created on first use
+    if name == "db_service":
+        from database import get_db_service
+        return get_db_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
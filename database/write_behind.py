@@ -0,0 +1,174 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.telemetry import tracer
+
+class WriteBehindQueue:
+    """
+    Bounded in-process queue that applies DatabaseService writes on a background thread.
+
+    Writes are applied in submission order, grouped into batches that commit in
+    one unit of work. A failed batch is retried with backoff; if it keeps
+    failing, its writes are applied one by one so a single bad write does not
+    take the rest of the batch down with it. Every write has a Future that
+    resolves to the method's return value (e.g. the new row ID).
+    """
+
+    def __init__(self,
+                 db_service,
+                 max_size: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None,
+                 max_attempts: Optional[int] = None,
+                 enqueue_timeout: Optional[float] = None):
+        self.db_service = db_service
+        self.max_size = max_size or int(os.getenv("DB_WRITE_BEHIND_MAX_SIZE", 1000))
+        self.batch_size = batch_size or int(os.getenv("DB_WRITE_BEHIND_BATCH_SIZE", 50))
+        self.flush_interval = flush_interval or float(os.getenv("DB_WRITE_BEHIND_FLUSH_INTERVAL", 0.5))
+        self.max_attempts = max_attempts or int(os.getenv("DB_WRITE_BEHIND_MAX_ATTEMPTS", 3))
+        self.enqueue_timeout = enqueue_timeout if enqueue_timeout is not None else float(os.getenv("DB_WRITE_BEHIND_ENQUEUE_TIMEOUT", 1.0))
+
+        self._queue: "queue.Queue[Optional[Tuple[Future, Callable, Dict[str, Any]]]]" = queue.Queue(self.max_size)
+        self._closed = False
+        # Orders submits against close(), so nothing is queued behind the stop sentinel
+        self._submit_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "failed": 0,
+            "retries": 0,
+            "batches": 0,
+            "synchronous_fallbacks": 0,
+            "flush_seconds_total": 0.0,
+            "flush_seconds_max": 0.0,
+            "last_flush_seconds": 0.0,
+        }
+
+        self._worker = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def submit(self, method: Callable, **kwargs) -> Future:
+        """Queue a write and return a Future for its result"""
+        future: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise Exception("Write-behind queue is closed")
+            try:
+                self._queue.put((future, method, kwargs), timeout=self.enqueue_timeout)
+            except queue.Full:
+                queued = False
+            else:
+                queued = True
+
+        if not queued:
+            # Backpressure: when the database cannot keep up, write in the caller's thread
+            self._increment("synchronous_fallbacks")
+            self._apply_one(future, method, kwargs)
+            return future
+
+        self._increment("enqueued")
+        return future
+
+    def _increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._fail_pending()
+                return
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+            if stop:
+                self._fail_pending()
+                return
+
+    def _fail_pending(self):
+        """Fail any write that reached the queue after the stop sentinel instead of dropping it"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                self._increment("failed")
+                item[0].set_exception(Exception("Write-behind queue is closed"))
+
+    def _flush(self, batch: List[Tuple[Future, Callable, Dict[str, Any]]]):
+        started = time.monotonic()
+        # Runs on the worker thread, so it starts its own trace
+        with tracer.start_span("db.write_behind_flush", {"db.batch_size": len(batch)}):
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    with self.db_service.unit_of_work():
+                        results = [method(**kwargs) for _, method, kwargs in batch]
+                except Exception:
+                    if attempt == self.max_attempts:
+                        # Isolate the failing write(s); the rest still land
+                        for future, method, kwargs in batch:
+                            self._apply_one(future, method, kwargs)
+                        break
+                    self._increment("retries")
+                    time.sleep(min(0.1 * 2 ** attempt, 5))
+                else:
+                    for (future, _, _), result in zip(batch, results):
+                        future.set_result(result)
+                    self._increment("written", len(batch))
+                    break
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["flush_seconds_total"] += elapsed
+            self._stats["flush_seconds_max"] = max(self._stats["flush_seconds_max"], elapsed)
+            self._stats["last_flush_seconds"] = elapsed
+
+    def _apply_one(self, future: Future, method: Callable, kwargs: Dict[str, Any]):
+        try:
+            result = method(**kwargs)
+        except Exception as e:
+            self._increment("failed")
+            future.set_exception(e)
+        else:
+            self._increment("written")
+            future.set_result(result)
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop accepting writes and wait for everything queued to be written"""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, write counters and flush latency"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["depth"] = self._queue.qsize()
+        stats["flush_seconds_avg"] = round(stats["flush_seconds_total"] / stats["batches"], 6) if stats["batches"] else 0.0
+        for name in ("flush_seconds_total", "flush_seconds_max", "last_flush_seconds"):
+            stats[name] = round(stats[name], 6)
+        return stats
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from utils.telemetry import cache_lookups, current_span, traced
+
+
+class AnalysisCache:
+    """
+    Persistent, content-addressed cache for resume analysis results.
+
+    Entries live in a local SQLite file so they survive Streamlit restarts and
+    are shared by every worker process on the host.
+    """
+
+    def __init__(self, path=None, ttl_seconds=None, max_entries=None):
+        self.path = path or os.getenv("ANALYSIS_CACHE_PATH", ".cache/analysis_cache.db")
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", 1000))
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_analysis_cache_last_accessed ON analysis_cache (last_accessed)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_cache_stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO analysis_cache_stats (name, value) VALUES ('hits', 0), ('misses', 0), ('evictions', 0)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def _normalize(text):
+        return " ".join((text or "").split())
+
+    def make_key(self, resume_text, job_description, model_name, prompt_version, generation_config):
+        """
+        Build a stable hash over the normalized inputs that determine an analysis
+        """
+        payload = json.dumps({
+            "resume_text": self._normalize(resume_text),
+            "job_description": self._normalize(job_description),
+            "model_name": model_name,
+            "prompt_version": prompt_version,
+            "generation_config": generation_config,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @traced("analysis_cache.get")
+    def get(self, key):
+        """
+        Return the cached result for a key, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    conn.execute("DELETE FROM analysis_cache WHERE cache_key = ?", (key,))
+                conn.execute("UPDATE analysis_cache_stats SET value = value + 1 WHERE name = 'misses'")
+                cache_lookups.inc(cache="analysis", result="miss")
+                current_span().set_attribute("cache.hit", False)
+                return None
+
+            conn.execute("UPDATE analysis_cache SET last_accessed = ? WHERE cache_key = ?", (now, key))
+            conn.execute("UPDATE analysis_cache_stats SET value = value + 1 WHERE name = 'hits'")
+            cache_lookups.inc(cache="analysis", result="hit")
+            current_span().set_attribute("cache.hit", True)
+            return json.loads(row[0])
+
+    def set(self, key, value):
+        """
+        Store a result and evict least recently used entries beyond max_entries
+        """
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (cache_key, value, created_at, last_accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+
+            if self.max_entries:
+                evicted = conn.execute("""
+                    DELETE FROM analysis_cache WHERE cache_key IN (
+                        SELECT cache_key FROM analysis_cache
+                        ORDER BY last_accessed DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,)).rowcount
+                if evicted:
+                    conn.execute("UPDATE analysis_cache_stats SET value = value + ? WHERE name = 'evictions'", (evicted,))
+
+    def stats(self):
+        """
+        Return hit/miss counters and current size of the cache
+        """
+        with closing(self._connect()) as conn:
+            counters = dict(conn.execute("SELECT name, value FROM analysis_cache_stats").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+        lookups = counters.get("hits", 0) + counters.get("misses", 0)
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "evictions": counters.get("evictions", 0),
+            "entries": entries,
+            "hit_rate": round(counters.get("hits", 0) / lookups, 4) if lookups else 0.0
+        }
+
+    def clear(self):
+        """
+        Remove every cached entry and reset the counters
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM analysis_cache")
+            conn.execute("UPDATE analysis_cache_stats SET value = 0")
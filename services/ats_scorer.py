@@ -0,0 +1,180 @@
+import math
+import os
+import re
+from collections import Counter
+
+# Words, including tech names such as c++, c#, node.js, ci/cd and scikit-learn
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*", re.IGNORECASE)
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further had has
+have having he her here hers him his how i if in into is it its itself just may me might more most must
+my no nor not now of off on once only or other our ours out over own per same she should so some such
+than that the their them then there these they this those through to too under until up upon us very
+via was we were what when where which while who whom why will with within without would you your yours
+""".split())
+
+# Words every job posting uses; they say nothing about the role
+POSTING_WORDS = frozenset("""
+ability able applicant applicants apply based benefit benefits build building candidate candidates
+company competitive demonstrated description desired develop developing employee employees employer
+environment equal excellent experience experienced familiar familiarity good great help ideal
+including job join knowledge looking member new offer opportunities opportunity plus position
+preferred proven provide qualification qualifications required requirement requirements
+responsibilities responsibility responsible role salary seeking skill skills strong successful
+support team teams understanding using work working world year years
+""".split())
+
+# Job description terms used for scoring, highest weight first
+MAX_TERMS = int(os.getenv("ATS_MAX_TERMS", 40))
+
+
+def normalize_token(token):
+    """
+    Lowercase a token and fold simple plurals ("APIs" -> "api")
+    """
+    token = token.lower()
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us")):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [normalize_token(token) for token in TOKEN_PATTERN.findall(text or "")]
+
+
+def _is_content_word(token):
+    return len(token) > 1 and token not in STOPWORDS and token not in POSTING_WORDS
+
+
+class ATSScorer:
+    """
+    Fast, local keyword match of resumes against one job description.
+
+    The job description is reduced to its most distinctive terms (single
+    words plus repeated or capitalized two-word phrases), weighted by TF-IDF
+    with each non-empty line of the posting treated as a document. A resume
+    scores the weighted share of those terms it contains, from 0 to 10.
+    Scoring many resumes builds one presence matrix and scores it with a
+    single matrix-vector product.
+
+    This is a rough pre-score for instant feedback and for deciding which
+    resumes are worth a full LLM analysis, not a replacement for it.
+    """
+
+    def __init__(self, job_description, max_terms=None):
+        import numpy as np
+
+        self._np = np
+        max_terms = max_terms or MAX_TERMS
+        lines = [line for line in (job_description or "").splitlines() if line.strip()]
+
+        counts = Counter()
+        line_frequency = Counter()
+        display = {}
+        for line in lines:
+            line_terms = set()
+            for term, original in self._line_terms(line):
+                counts[term] += 1
+                line_terms.add(term)
+                display.setdefault(term, original)
+            line_frequency.update(line_terms)
+
+        # Keep a phrase when it repeats or is capitalized like a product name ("Google Cloud")
+        phrases = {
+            term for term in counts
+            if " " in term and (counts[term] >= 2 or display[term].istitle() or display[term].isupper())
+        }
+        # Drop words that only ever appear inside a kept phrase
+        covered = Counter()
+        for phrase in phrases:
+            for word in phrase.split():
+                covered[word] += counts[phrase]
+        candidates = [
+            term for term in counts
+            if (" " in term and term in phrases) or (" " not in term and counts[term] > covered[term])
+        ]
+
+        num_lines = max(1, len(lines))
+        weights = {
+            term: (1 + math.log(counts[term])) * (math.log((1 + num_lines) / (1 + line_frequency[term])) + 1)
+            for term in candidates
+        }
+        # Stable sort keeps equally weighted terms in the order the posting lists them
+        ranked = sorted(candidates, key=lambda term: -weights[term])[:max_terms]
+
+        self.terms = ranked
+        self.keywords = [display[term] for term in ranked]
+        self.weights = np.array([weights[term] for term in ranked], dtype=np.float64)
+        self._index = {term: i for i, term in enumerate(self.terms)}
+        self._has_phrases = any(" " in term for term in self.terms)
+
+    @staticmethod
+    def _line_terms(line):
+        """
+        (normalized term, original text) for every content word and two-word phrase in a line
+        """
+        previous = None
+        end = 0
+        for match in TOKEN_PATTERN.finditer(line):
+            original = match.group()
+            term = normalize_token(original)
+            # Phrases never span punctuation, so "Python, SQL" stays two terms
+            if line[end:match.start()].strip():
+                previous = None
+            end = match.end()
+            if not _is_content_word(term):
+                previous = None
+                continue
+            yield term, original
+            if previous is not None:
+                yield f"{previous[0]} {term}", f"{previous[1]} {original}"
+            previous = (term, original)
+
+    def _term_ids(self, text):
+        index = self._index
+        tokens = tokenize(text)
+        ids = {index[token] for token in tokens if token in index}
+        # "PostgreSQL/SQL" or "AWS/GCP" in a resume should match each side
+        ids.update(
+            index[part]
+            for token in tokens if "/" in token
+            for part in token.split("/") if part in index
+        )
+        if self._has_phrases:
+            ids.update(
+                index[phrase]
+                for phrase in (f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+                if phrase in index
+            )
+        return ids
+
+    def score_many(self, resume_texts):
+        """
+        Score a list of resume texts; returns one result dict per resume
+        """
+        np = self._np
+        resume_texts = list(resume_texts)
+        presence = np.zeros((len(resume_texts), len(self.terms)), dtype=np.float64)
+        term_ids = [self._term_ids(text) for text in resume_texts]
+        rows = np.repeat(np.arange(len(resume_texts)), [len(ids) for ids in term_ids])
+        columns = np.fromiter((i for ids in term_ids for i in ids), dtype=np.intp, count=len(rows))
+        presence[rows, columns] = 1.0
+
+        total_weight = self.weights.sum()
+        coverage = presence @ self.weights / total_weight if total_weight else np.zeros(len(resume_texts))
+
+        results = []
+        for row, share in zip(presence, coverage):
+            present = row.astype(bool)
+            results.append({
+                "score": round(float(share) * 10, 1),
+                "coverage": round(float(share), 3),
+                "present_keywords": [keyword for keyword, found in zip(self.keywords, present) if found],
+                "missing_keywords": [keyword for keyword, found in zip(self.keywords, present) if not found],
+            })
+        return results
+
+    def score(self, resume_text):
+        return self.score_many([resume_text])[0]
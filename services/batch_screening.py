@@ -0,0 +1,175 @@
+import io
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from services.ats_scorer import ATSScorer
+from services.llm_resilience import is_retryable
+from utils.pdf_parser import PDFParser
+
+
+def expand_uploads(uploads, max_members=None, max_member_bytes=None, max_total_bytes=None):
+    """
+    Turn (filename, bytes) pairs into a flat list of PDFs, unpacking zip archives.
+
+    Archives are checked against member count and uncompressed size limits
+    before anything is decompressed, so a zip bomb is rejected up front.
+    """
+    max_members = max_members or int(os.getenv("BATCH_ZIP_MAX_MEMBERS", 500))
+    max_member_bytes = max_member_bytes or int(os.getenv("BATCH_ZIP_MAX_MEMBER_BYTES", 20 * 1024 * 1024))
+    max_total_bytes = max_total_bytes or int(os.getenv("BATCH_ZIP_MAX_TOTAL_BYTES", 200 * 1024 * 1024))
+
+    pdfs = []
+    for filename, data in uploads:
+        if filename.lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                members = []
+                for member in archive.infolist():
+                    name = os.path.basename(member.filename)
+                    if not member.is_dir() and name.lower().endswith(".pdf") and not name.startswith("."):
+                        members.append((name, member))
+                if len(members) > max_members:
+                    raise Exception(f"{filename} contains {len(members)} PDFs; at most {max_members} are allowed")
+                # file_size is what decompression yields: zipfile stops reading a member there
+                for name, member in members:
+                    if member.file_size > max_member_bytes:
+                        raise Exception(f"{name} in {filename} is larger than {max_member_bytes} bytes uncompressed")
+                total = sum(member.file_size for _, member in members)
+                if total > max_total_bytes:
+                    raise Exception(f"{filename} is larger than {max_total_bytes} bytes uncompressed")
+                pdfs.extend((name, archive.read(member)) for name, member in members)
+        elif filename.lower().endswith(".pdf"):
+            pdfs.append((filename, data))
+    return pdfs
+
+
+class RateLimiter:
+    """
+    Spaces out requests so no more than requests_per_minute are started
+    """
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def penalize(self, seconds):
+        """
+        Push back every future slot, e.g. after the backend reports a rate limit
+        """
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+class BatchScreener:
+    """
+    Screens many resumes against one job description.
+
+    PDFs are parsed by the shared extraction engine's process pool, analyses
+    run with bounded concurrency behind a rate limiter, and results are
+    yielded as soon as each completes. Every resume gets a local ATS
+    pre-score first; resumes below min_prescore are reported as filtered
+    without an LLM call.
+
+    Retries are left to the LLM backend (services/llm_resilience.py); when an
+    analysis still fails with a rate limit or overload error, the rate
+    limiter backs off so the rest of the batch does not pile on.
+    """
+
+    def __init__(self, resume_analyzer, concurrency=None, parse_workers=None, requests_per_minute=None, pdf_parser=None, min_prescore=None, backoff_seconds=None):
+        self.resume_analyzer = resume_analyzer
+        self.pdf_parser = pdf_parser or PDFParser()
+        self.concurrency = concurrency or int(os.getenv("BATCH_LLM_CONCURRENCY", 4))
+        self.parse_workers = parse_workers or int(os.getenv("BATCH_PARSE_WORKERS", os.cpu_count() or 2))
+        self.rate_limiter = RateLimiter(
+            requests_per_minute if requests_per_minute is not None else int(os.getenv("BATCH_REQUESTS_PER_MINUTE", 60))
+        )
+        self.backoff_seconds = backoff_seconds or float(os.getenv("BATCH_BACKOFF_SECONDS", 10))
+        self.min_prescore = min_prescore if min_prescore is not None else float(os.getenv("BATCH_MIN_PRESCORE", 0))
+
+    def screen(self, pdfs, job_description):
+        """
+        Yield one result dict per resume in completion order. pdfs are
+        (filename, bytes) pairs, as returned by expand_uploads.
+        """
+        if not pdfs:
+            return
+
+        # Parse threads only wait on the engine's worker processes, which do the CPU-bound work
+        with ThreadPoolExecutor(max_workers=min(self.parse_workers, len(pdfs)), thread_name_prefix="batch-parse") as parse_pool, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch-analysis") as analysis_pool:
+            parse_futures = {
+                parse_pool.submit(self.pdf_parser.extract_text_from_pdf, data): (filename, data)
+                for filename, data in pdfs
+            }
+            analysis_futures = set()
+            scorer = ATSScorer(job_description)
+
+            # Extract the job description keywords once while the PDFs are parsing,
+            # so concurrent analyses all hit the cached result
+            try:
+                self.resume_analyzer.suggest_keywords(job_description)
+            except Exception:
+                pass
+
+            for future in as_completed(parse_futures):
+                filename, data = parse_futures[future]
+                try:
+                    resume_text = future.result()
+                except Exception as e:
+                    yield self._result(filename, data, error=str(e))
+                else:
+                    prescore = scorer.score(resume_text)
+                    if prescore["score"] < self.min_prescore:
+                        yield self._result(filename, data, resume_text, prescore=prescore, filtered=True)
+                    else:
+                        analysis_futures.add(
+                            analysis_pool.submit(self._analyze, filename, data, resume_text, job_description, prescore)
+                        )
+
+                for done in [f for f in analysis_futures if f.done()]:
+                    analysis_futures.remove(done)
+                    yield done.result()
+
+            for future in as_completed(analysis_futures):
+                yield future.result()
+
+    def _analyze(self, filename, data, resume_text, job_description, prescore):
+        started = time.monotonic()
+        self.rate_limiter.acquire()
+        try:
+            analysis = self.resume_analyzer.analyze_resume_bundle(resume_text, job_description, reuse_keywords=True)
+        except Exception as e:
+            # The backend already retried; a transient error that outlasted that means the batch is going too fast
+            if is_retryable(e.__cause__ or e):
+                self.rate_limiter.penalize(self.backoff_seconds)
+            return self._result(filename, data, resume_text, error=str(e), prescore=prescore, elapsed=time.monotonic() - started)
+        return self._result(filename, data, resume_text, analysis, prescore=prescore, elapsed=time.monotonic() - started)
+
+    @staticmethod
+    def _result(filename, data, resume_text="", analysis=None, error=None, prescore=None, filtered=False, elapsed=0.0):
+        analysis = analysis or {}
+        prescore = prescore or {}
+        return {
+            "filename": filename,
+            "status": "error" if error else "filtered" if filtered else "ok",
+            "error": error,
+            "prescore": prescore.get("score", 0),
+            "alignment_score": analysis.get("alignment_score", 0),
+            "missing_keywords": analysis.get("keywords_analysis", {}).get("missing_keywords", prescore.get("missing_keywords", [])),
+            "analysis": analysis,
+            "extracted_text": resume_text,
+            "pdf_content": data,
+            "elapsed_seconds": round(elapsed, 3)
+        }
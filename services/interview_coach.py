@@ -1,12 +1,96 @@
 import json
 import os
 import random
-import google.generativeai as genai
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from services.json_extractor import IncrementalJSONExtractor, JSONSchema, extract_json
+from services.llm_backend import get_backend
+from services.llm_resilience import LATENCY_WINDOW, metrics as llm_metrics, percentile
+from services.prompt_builder import PromptBuilder
+from utils.telemetry import context_bound, traced, tracer
+
+# Default per-call timeouts (seconds) used by full_review
+REVIEW_TIMEOUTS = {
+    "evaluation": 30,
+    "star_coaching": 20,
+    "follow_up": 15,
+}
+
+# Expected shape of each JSON response; see services/json_extractor.py
+EVALUATION_SCHEMA = JSONSchema(
+    required={"score": float},
+    optional={
+        "feedback": str,
+        "strengths": list,
+        "areas_for_improvement": list,
+        "suggested_improvements": str,
+        "star_format_feedback": str,
+        "example_improvement": str,
+    }
+)
+
+STAR_COACHING_SCHEMA = JSONSchema(optional={
+    "star_analysis": JSONSchema(optional={"situation": str, "task": str, "action": str, "result": str}),
+    "improved_structure": str,
+    "example_phrases": list,
+    "coaching_tips": list,
+})
+
+# Questions that missed the deadline kept for the next turn, oldest evicted first
+MAX_LATE_QUESTIONS = 1000
+
+# Where a served question came from; the *_fallback sources count towards the fallback rate
+QUESTION_SOURCES = ("model", "bank", "late", "prefetch", "deadline_fallback", "error_fallback")
+
+
+class QuestionServingStats:
+    """
+    How long users waited for each interview question, by where it came from
+    """
 
-class InterviewCoach:
     def __init__(self):
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        self.model = genai.GenerativeModel('gemini-1.5-pro')
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.counts = {source: 0 for source in QUESTION_SOURCES}
+
+    def record(self, source, seconds):
+        with self._lock:
+            self.counts[source] += 1
+            self._latencies.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            served = sum(self.counts.values())
+            fallbacks = self.counts["deadline_fallback"] + self.counts["error_fallback"]
+            return {
+                "served": served,
+                "sources": dict(self.counts),
+                "fallback_rate": round(fallbacks / served, 4) if served else 0.0,
+                "latency_p50_seconds": round(percentile(latencies, 0.50), 4),
+                "latency_p95_seconds": round(percentile(latencies, 0.95), 4),
+                "latency_p99_seconds": round(percentile(latencies, 0.99), 4),
+            }
+
+
+class InterviewCoach:
+    def __init__(self, question_bank=None, prompt_builder=None):
+        self.backends = {
+            call_type: get_backend(call_type)
+            for call_type in ("question", "evaluation", "star_coaching", "follow_up")
+        }
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="interview-review")
+        self.question_bank = question_bank
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self._top_ups = set()
+        self._top_up_lock = threading.Lock()
+        # Latency SLO for question generation; 0 waits for the model however long it takes
+        self.question_deadline_seconds = float(os.getenv("QUESTION_DEADLINE_SECONDS", 0))
+        self._late_questions = {}
+        self._late_lock = threading.Lock()
+        self.serving_stats = QuestionServingStats()
         
         # Question categories for different interview types
         self.question_types = {
@@ -47,163 +131,349 @@ class InterviewCoach:
             ]
         }
 
-    def generate_question(self, job_role, focus_areas, interview_type):
+    @staticmethod
+    def _select_focus(focus_areas, interview_type):
         """
-        Generate an interview question based on job role and focus areas
+        Focus areas a question may target for the interview type
         """
-        try:
-            # Select question type based on focus areas
-            if interview_type == "Behavioral Only":
-                selected_focus = ["Behavioral"]
-            elif interview_type == "Technical Only":
-                selected_focus = [area for area in focus_areas if area in ["Technical", "System Design"]]
-                if not selected_focus:
-                    selected_focus = ["Technical"]
-            else:
-                selected_focus = focus_areas
+        if interview_type == "Behavioral Only":
+            return ["Behavioral"]
+        if interview_type == "Technical Only":
+            return [area for area in focus_areas if area in ["Technical", "System Design"]] or ["Technical"]
+        return focus_areas
 
-            # Generate AI-powered question
-            prompt = f"""
-            Generate a thoughtful interview question for a {job_role} position.
-            
-            Focus areas: {', '.join(selected_focus)}
-            Interview type: {interview_type}
-            
-            The question should be:
-            1. Relevant to the {job_role} position
-            2. Focused on {', '.join(selected_focus)} skills
-            3. Designed to assess the candidate's experience and problem-solving abilities
-            4. Clear and specific enough to allow for a structured response
-            
-            Return only the question, no additional text or formatting.
-            """
+    def generate_question(self, job_role, focus_areas, interview_type, session_id=None):
+        """
+        Generate an interview question based on job role and focus areas.
 
-            full_prompt = f"""You are an expert interviewer who creates insightful, role-specific interview questions. Generate questions that help assess a candidate's skills, experience, and fit for the position.
+        Each question targets one of the selected focus areas. With a question
+        bank, a question the user has not seen is served from the bank when
+        enough are banked (topping the bank up in the background when it runs
+        low); otherwise the model is called and its question is banked.
 
-{prompt}"""
+        With a question deadline set, a model call still running at the
+        deadline is not waited for: a fallback question is served and the late
+        answer is kept for this user's next question.
+        """
+        return self._generate_question(job_role, focus_areas, interview_type, session_id, background=False)[0]
 
-            response = self.model.generate_content(
-                full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=200,
-                )
-            )
+    def prefetch_question(self, job_role, focus_areas, interview_type, session_id=None):
+        """
+        Speculative generate_question for QuestionPrefetcher. Waits for the
+        model, is left out of the serving stats and records nothing as served
+        to the user. Returns (question, bank id or None); pass the id to
+        mark_question_served() when the question is handed over.
+        """
+        return self._generate_question(job_role, focus_areas, interview_type, session_id, background=True)
 
-            question = response.text.strip()
-            return question
+    def mark_question_served(self, session_id, question_id):
+        """
+        Record a prefetched banked question as served to the user
+        """
+        if self.question_bank is not None and question_id is not None:
+            self.question_bank.mark_served(session_id, question_id)
+
+    def _generate_question(self, job_role, focus_areas, interview_type, session_id, background):
+        started = time.monotonic()
+        late_key = (session_id, job_role, tuple(focus_areas), interview_type)
+        with tracer.start_span("interview_coach.generate_question", {"question.background": background}) as span:
+            question, source, question_id = self._next_question(
+                job_role, focus_areas, interview_type, session_id, late_key, background
+            )
+            span.set_attribute("question.source", source)
+        if not background:
+            self.serving_stats.record(source, time.monotonic() - started)
+        return question, question_id
+
+    def _next_question(self, job_role, focus_areas, interview_type, session_id, late_key, background):
+        # Speculative questions are recorded as served at handover, not here
+        served_to = None if background else session_id
+        with self._late_lock:
+            late = self._late_questions.pop(late_key, None)
+        if late is not None:
+            question_id = None
+            if self.question_bank is not None:
+                question_id = self.question_bank.add(job_role, late[0], late[1], served_to=served_to)
+            return late[1], "late", question_id
+
+        focus_area = random.choice(self._select_focus(focus_areas, interview_type))
+
+        if self.question_bank is not None:
+            entry, fresh_left = self.question_bank.take(session_id, job_role, focus_area, mark_served=not background)
+            if entry is not None:
+                if fresh_left < self.question_bank.min_fresh:
+                    self._top_up_bank(job_role, focus_area, interview_type)
+                return entry.question_text, "bank", entry.id
 
-        except Exception as e:
-            # Fallback to predefined questions if AI generation fails
-            focus_area = random.choice(focus_areas)
-            if focus_area in self.question_types:
-                return random.choice(self.question_types[focus_area])
+        try:
+            if self.question_deadline_seconds and not background:
+                future = self.executor.submit(
+                    context_bound(self._generate_model_question), job_role, focus_area, interview_type
+                )
+                try:
+                    question = future.result(timeout=self.question_deadline_seconds)
+                except TimeoutError:
+                    llm_metrics.record("question", fallbacks=1)
+                    future.add_done_callback(
+                        lambda done: self._keep_late_question(late_key, job_role, focus_area, done)
+                    )
+                    question, question_id = self._fallback_question(job_role, focus_area, session_id)
+                    return question, "deadline_fallback", question_id
             else:
-                return "Tell me about your experience and what makes you a good fit for this role."
+                question = self._generate_model_question(job_role, focus_area, interview_type)
+        except Exception as e:
+            # Fallback to an unseen banked question, then to the predefined questions
+            llm_metrics.record("question", fallbacks=1)
+            question, question_id = self._fallback_question(job_role, focus_area, session_id, mark_served=not background)
+            return question, "error_fallback", question_id
 
-    def evaluate_answer(self, question, answer, job_role, focus_areas):
+        question_id = None
+        if self.question_bank is not None:
+            question_id = self.question_bank.add(job_role, focus_area, question, served_to=served_to)
+        return question, "model", question_id
+
+    def _fallback_question(self, job_role, focus_area, session_id, mark_served=True):
         """
-        Evaluate the candidate's answer and provide feedback
+        An unseen banked question or a predefined one, as (question, bank id or None)
+        """
+        if self.question_bank is not None:
+            entry, _ = self.question_bank.take(session_id, job_role, focus_area, min_fresh=1, mark_served=mark_served)
+            if entry is not None:
+                return entry.question_text, entry.id
+        if focus_area in self.question_types:
+            return random.choice(self.question_types[focus_area]), None
+        return "Tell me about your experience and what makes you a good fit for this role.", None
+
+    def fallback_question(self, job_role, focus_areas, interview_type, session_id=None):
+        """
+        A question served without waiting for the model: an unseen banked question or a predefined one
+        """
+        focus_area = random.choice(self._select_focus(focus_areas, interview_type))
+        return self._fallback_question(job_role, focus_area, session_id)[0]
+
+    def _keep_late_question(self, late_key, job_role, focus_area, future):
+        """
+        Keep a model question that arrived after the deadline for the user's next turn, and bank it
         """
         try:
-            # Determine if this is a behavioral question for STAR format coaching
-            is_behavioral = any(word in question.lower() for word in ['tell me about', 'describe a time', 'give me an example'])
-            
-            prompt = f"""
-            You are an expert interview coach. Evaluate this candidate's answer and provide constructive feedback.
+            question = future.result()
+        except Exception:
+            return
+        with self._late_lock:
+            self._late_questions[late_key] = (focus_area, question)
+            while len(self._late_questions) > MAX_LATE_QUESTIONS:
+                self._late_questions.pop(next(iter(self._late_questions)))
+        if self.question_bank is not None:
+            self.question_bank.add(job_role, focus_area, question)
+
+    def question_stats(self):
+        """
+        Question serving latency percentiles, sources and fallback rate
+        """
+        return self.serving_stats.snapshot()
 
-            POSITION: {job_role}
-            FOCUS AREAS: {', '.join(focus_areas)}
-            QUESTION: {question}
-            CANDIDATE'S ANSWER: {answer}
+    def _generate_model_question(self, job_role, focus_area, interview_type):
+        prompt = f"""
+        Generate a thoughtful interview question for a {job_role} position.
+        
+        Focus area: {focus_area}
+        Interview type: {interview_type}
+        
+        The question should be:
+        1. Relevant to the {job_role} position
+        2. Focused on {focus_area} skills
+        3. Designed to assess the candidate's experience and problem-solving abilities
+        4. Clear and specific enough to allow for a structured response
+        
+        Return only the question, no additional text or formatting.
+        """
 
-            Evaluate the answer and provide feedback in JSON format:
-            {{
-                "score": <score from 1-10>,
-                "feedback": "<detailed constructive feedback>",
-                "strengths": ["<strength1>", "<strength2>", ...],
-                "areas_for_improvement": ["<area1>", "<area2>", ...],
-                "suggested_improvements": "<specific suggestions for better answer>",
-                "star_format_feedback": "<feedback on STAR format if applicable>",
-                "example_improvement": "<example of how to improve the answer>"
-            }}
+        full_prompt = f"""You are an expert interviewer who creates insightful, role-specific interview questions. Generate questions that help assess a candidate's skills, experience, and fit for the position.
 
-            Evaluation Criteria:
-            1. Relevance to the question and role
-            2. Specificity and concrete examples
-            3. Structure and clarity
-            4. Demonstration of skills/experience
-            5. STAR format usage (for behavioral questions)
-            
-            {'Focus on STAR format (Situation, Task, Action, Result) for this behavioral question.' if is_behavioral else 'Focus on technical accuracy and problem-solving approach.'}
-            
-            Be constructive, specific, and encouraging in your feedback.
-            """
+{prompt}"""
 
-            full_prompt = f"""You are an expert interview coach and evaluator. Provide detailed, constructive feedback to help candidates improve their interview performance. Be encouraging but honest about areas for improvement.
+        return self.backends["question"].generate(
+            full_prompt,
+            call_type="question",
+            temperature=0.7,
+            max_output_tokens=200,
+        ).strip()
+
+    def _top_up_bank(self, job_role, focus_area, interview_type):
+        """
+        Generate and bank one more question in the background, at most one per role and focus area at a time
+        """
+        key = (job_role, focus_area)
+        with self._top_up_lock:
+            if key in self._top_ups:
+                return
+            self._top_ups.add(key)
+
+        def top_up():
+            try:
+                question = self._generate_model_question(job_role, focus_area, interview_type)
+                self.question_bank.add(job_role, focus_area, question)
+            except Exception:
+                pass
+            finally:
+                with self._top_up_lock:
+                    self._top_ups.discard(key)
+
+        self.executor.submit(top_up)
+
+    def _is_behavioral(self, question):
+        """
+        Determine if this is a behavioral question for STAR format coaching
+        """
+        return any(word in question.lower() for word in ['tell me about', 'describe a time', 'give me an example'])
+
+    def _build_evaluation_prompt(self, question, answer, job_role, focus_areas):
+        """
+        Build the evaluation prompt and report whether the question is behavioral
+        """
+        is_behavioral = self._is_behavioral(question)
+        answer = self.prompt_builder.answer(answer, "evaluation")
+        
+        prompt = f"""
+        You are an expert interview coach. Evaluate this candidate's answer and provide constructive feedback.
+
+        POSITION: {job_role}
+        FOCUS AREAS: {', '.join(focus_areas)}
+        QUESTION: {question}
+        CANDIDATE'S ANSWER: {answer}
+
+        Evaluate the answer and provide feedback in JSON format:
+        {{
+            "score": <score from 1-10>,
+            "feedback": "<detailed constructive feedback>",
+            "strengths": ["<strength1>", "<strength2>", ...],
+            "areas_for_improvement": ["<area1>", "<area2>", ...],
+            "suggested_improvements": "<specific suggestions for better answer>",
+            "star_format_feedback": "<feedback on STAR format if applicable>",
+            "example_improvement": "<example of how to improve the answer>"
+        }}
+
+        Evaluation Criteria:
+        1. Relevance to the question and role
+        2. Specificity and concrete examples
+        3. Structure and clarity
+        4. Demonstration of skills/experience
+        5. STAR format usage (for behavioral questions)
+        
+        {'Focus on STAR format (Situation, Task, Action, Result) for this behavioral question.' if is_behavioral else 'Focus on technical accuracy and problem-solving approach.'}
+        
+        Be constructive, specific, and encouraging in your feedback.
+        """
+
+        full_prompt = f"""You are an expert interview coach and evaluator. Provide detailed, constructive feedback to help candidates improve their interview performance. Be encouraging but honest about areas for improvement.
 
 {prompt}
 
 Please ensure your response is valid JSON format."""
 
-            response = self.model.generate_content(
-                full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.3,
-                    max_output_tokens=1536,
-                )
-            )
+        return full_prompt, is_behavioral
 
-            # Clean and parse JSON response
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            result = json.loads(response_text.strip())
-            
-            # Format the feedback for display
-            feedback_text = result.get("feedback", "")
-            
-            # Add STAR format guidance for behavioral questions
-            if is_behavioral and result.get("star_format_feedback"):
-                feedback_text += f"\n\n**STAR Format Feedback:** {result.get('star_format_feedback')}"
-            
-            # Add improvement suggestions
-            if result.get("suggested_improvements"):
-                feedback_text += f"\n\n**Suggestions:** {result.get('suggested_improvements')}"
-            
-            return {
-                "score": max(1, min(10, result.get("score", 5))),
-                "feedback": feedback_text,
-                "strengths": result.get("strengths", []),
-                "areas_for_improvement": result.get("areas_for_improvement", []),
-                "example_improvement": result.get("example_improvement", "")
-            }
+    def _format_evaluation(self, result, is_behavioral):
+        """
+        Turn the raw model output into the feedback record shown and persisted by the app
+        """
+        # Format the feedback for display
+        feedback_text = result.get("feedback", "")
+        
+        # Add STAR format guidance for behavioral questions
+        if is_behavioral and result.get("star_format_feedback"):
+            feedback_text += f"\n\n**STAR Format Feedback:** {result.get('star_format_feedback')}"
+        
+        # Add improvement suggestions
+        if result.get("suggested_improvements"):
+            feedback_text += f"\n\n**Suggestions:** {result.get('suggested_improvements')}"
+        
+        return {
+            "score": max(1, min(10, result.get("score", 5))),
+            "feedback": feedback_text,
+            "strengths": result.get("strengths", []),
+            "areas_for_improvement": result.get("areas_for_improvement", []),
+            "example_improvement": result.get("example_improvement", "")
+        }
 
-        except json.JSONDecodeError as e:
+    def _evaluation_fallback(self, error):
+        """
+        Feedback returned when the evaluation could not be completed
+        """
+        if isinstance(error, json.JSONDecodeError):
             return {
                 "score": 5,
-                "feedback": f"I had trouble analyzing your answer, but I appreciate your response. Try to be more specific and provide concrete examples. {str(e)}",
+                "feedback": f"I had trouble analyzing your answer, but I appreciate your response. Try to be more specific and provide concrete examples. {str(error)}",
                 "strengths": [],
                 "areas_for_improvement": ["Provide more specific examples", "Structure your answer more clearly"],
                 "example_improvement": ""
             }
+        return {
+            "score": 5,
+            "feedback": f"I encountered an error while evaluating your answer. Please try again. Error: {str(error)}",
+            "strengths": [],
+            "areas_for_improvement": [],
+            "example_improvement": ""
+        }
+
+    @traced("interview_coach.evaluate_answer")
+    def evaluate_answer(self, question, answer, job_role, focus_areas):
+        """
+        Evaluate the candidate's answer and provide feedback
+        """
+        try:
+            full_prompt, is_behavioral = self._build_evaluation_prompt(question, answer, job_role, focus_areas)
+
+            response_text = self.backends["evaluation"].generate(
+                full_prompt,
+                call_type="evaluation",
+                temperature=0.3,
+                max_output_tokens=1536,
+            ).strip()
+
+            result = extract_json(response_text, EVALUATION_SCHEMA, call_type="evaluation")
+            return self._format_evaluation(result, is_behavioral)
+
         except Exception as e:
-            return {
-                "score": 5,
-                "feedback": f"I encountered an error while evaluating your answer. Please try again. Error: {str(e)}",
-                "strengths": [],
-                "areas_for_improvement": [],
-                "example_improvement": ""
-            }
+            return self._evaluation_fallback(e)
+
+    def evaluate_answer_stream(self, question, answer, job_role, focus_areas):
+        """
+        Stream the evaluation of the candidate's answer.
+
+        Yields {"done": False, "partial": {...}} with the raw fields parsed so far
+        (score first, then feedback text, then the lists) and finishes with
+        {"done": True, "feedback": {...}} holding the same record evaluate_answer returns.
+        """
+        try:
+            full_prompt, is_behavioral = self._build_evaluation_prompt(question, answer, job_role, focus_areas)
 
+            extractor = IncrementalJSONExtractor(EVALUATION_SCHEMA, call_type="evaluation")
+            last_partial = {}
+            for chunk in self.backends["evaluation"].stream(
+                full_prompt,
+                call_type="evaluation",
+                temperature=0.3,
+                max_output_tokens=1536,
+            ):
+                partial = extractor.feed(chunk)
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    yield {"done": False, "partial": partial}
+
+            result = extractor.result()
+            yield {"done": True, "feedback": self._format_evaluation(result, is_behavioral)}
+
+        except Exception as e:
+            yield {"done": True, "feedback": self._evaluation_fallback(e)}
+
+    @traced("interview_coach.provide_star_coaching")
     def provide_star_coaching(self, question, answer):
         """
         Provide specific STAR format coaching for behavioral questions
         """
         try:
+            answer = self.prompt_builder.answer(answer, "star_coaching")
             prompt = f"""
             Help the candidate improve their answer using the STAR format (Situation, Task, Action, Result).
 
@@ -230,22 +500,14 @@ Please ensure your response is valid JSON format."""
 
 Please ensure your response is valid JSON format."""
 
-            response = self.model.generate_content(
+            response_text = self.backends["star_coaching"].generate(
                 full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.3,
-                    max_output_tokens=1024,
-                )
-            )
+                call_type="star_coaching",
+                temperature=0.3,
+                max_output_tokens=1024,
+            ).strip()
 
-            # Clean and parse JSON response
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            result = json.loads(response_text.strip())
+            result = extract_json(response_text, STAR_COACHING_SCHEMA, call_type="star_coaching")
             return result
 
         except Exception as e:
@@ -261,11 +523,13 @@ Please ensure your response is valid JSON format."""
                 "coaching_tips": ["Be specific with examples", "Quantify your results when possible", "Focus on your individual contributions"]
             }
 
+    @traced("interview_coach.generate_follow_up_question")
     def generate_follow_up_question(self, previous_question, previous_answer, job_role):
         """
         Generate a follow-up question based on the candidate's previous answer
         """
         try:
+            previous_answer = self.prompt_builder.answer(previous_answer, "follow_up")
             prompt = f"""
             Based on the candidate's previous answer, generate a thoughtful follow-up question for a {job_role} interview.
 
@@ -285,15 +549,57 @@ Please ensure your response is valid JSON format."""
 
 {prompt}"""
 
-            response = self.model.generate_content(
+            return self.backends["follow_up"].generate(
                 full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.6,
-                    max_output_tokens=150,
-                )
-            )
-
-            return response.text.strip()
+                call_type="follow_up",
+                temperature=0.6,
+                max_output_tokens=150,
+            ).strip()
 
         except Exception as e:
             return "Can you tell me more about the specific challenges you faced in that situation and how you overcame them?"
+
+    @traced("interview_coach.full_review")
+    def full_review(self, question, answer, job_role, focus_areas, timeouts=None):
+        """
+        Run evaluation, STAR coaching (behavioral questions only) and follow-up
+        generation concurrently and merge them into one response.
+
+        Each call has its own timeout measured from the start of the review; a
+        call that misses it is reported in "timed_out" and replaced by the
+        evaluation fallback or None, so total latency is bounded by the slowest
+        call rather than the sum.
+        """
+        timeouts = {**REVIEW_TIMEOUTS, **(timeouts or {})}
+        started = time.monotonic()
+
+        futures = {
+            "evaluation": self.executor.submit(context_bound(self.evaluate_answer), question, answer, job_role, focus_areas),
+            "follow_up": self.executor.submit(context_bound(self.generate_follow_up_question), question, answer, job_role),
+        }
+        if self._is_behavioral(question):
+            futures["star_coaching"] = self.executor.submit(context_bound(self.provide_star_coaching), question, answer)
+
+        results = {}
+        timed_out = []
+        # Collect in deadline order so a long wait never hides a shorter deadline
+        for name, future in sorted(futures.items(), key=lambda item: timeouts[item[0]]):
+            remaining = max(0, timeouts[name] - (time.monotonic() - started))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except TimeoutError:
+                future.cancel()
+                timed_out.append(name)
+                results[name] = None
+
+        evaluation = results["evaluation"]
+        if evaluation is None:
+            evaluation = self._evaluation_fallback(Exception("Evaluation timed out"))
+
+        return {
+            "evaluation": evaluation,
+            "star_coaching": results.get("star_coaching"),
+            "follow_up_question": results["follow_up"],
+            "timed_out": timed_out,
+            "elapsed_seconds": round(time.monotonic() - started, 3)
+        }
@@ -0,0 +1,362 @@
+import json
+import re
+from utils.telemetry import current_span, registry
+
+# Candidate object starts tried before giving up on a response
+MAX_CANDIDATES = 32
+
+_decoder = json.JSONDecoder()
+_LITERAL = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+_NUMBER_IN_TEXT = re.compile(r'-?\d+(?:\.\d+)?')
+
+parse_failures = registry.counter(
+    "llm_parse_failures_total", "LLM responses with no acceptable JSON object", ("call_type",)
+)
+parse_repairs = registry.counter(
+    "llm_parse_repairs_total", "LLM responses whose JSON object needed repair (truncated or malformed)", ("call_type",)
+)
+
+
+class JSONExtractionError(json.JSONDecodeError):
+    """
+    Raised when no object matching the expected schema can be recovered from a response
+    """
+
+    def __init__(self, msg, doc="", pos=0):
+        super().__init__(msg, doc or "", pos)
+        self.args = (msg,)
+
+
+class JSONSchema:
+    """
+    Expected top-level fields of an LLM JSON response.
+
+    Field types are float (any number; numeric strings such as "7" or "7/10" are
+    coerced), str, list (a bare string becomes a one-item list), dict, or a
+    nested JSONSchema. Unknown fields are passed through untouched.
+    """
+
+    def __init__(self, required=None, optional=None):
+        self.required = required or {}
+        self.optional = optional or {}
+        self.fields = {**self.optional, **self.required}
+
+    def validate(self, obj):
+        """
+        Return a copy of obj with field types coerced, or raise JSONExtractionError
+        """
+        if not isinstance(obj, dict):
+            raise JSONExtractionError(f"expected a JSON object, got {type(obj).__name__}")
+
+        result = dict(obj)
+        for name, expected in self.fields.items():
+            if result.get(name) is None:
+                if name in self.required:
+                    raise JSONExtractionError(f"missing required field '{name}'")
+                result.pop(name, None)
+                continue
+            result[name] = self._coerce(name, result[name], expected)
+        return result
+
+    @staticmethod
+    def _coerce(name, value, expected):
+        if isinstance(expected, JSONSchema):
+            return expected.validate(value)
+        if expected is float:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return value
+            if isinstance(value, str):
+                match = _NUMBER_IN_TEXT.search(value)
+                if match:
+                    number = float(match.group())
+                    return int(number) if number.is_integer() else number
+        elif expected is list:
+            if isinstance(value, list):
+                return value
+            if isinstance(value, str):
+                return [value]
+        elif expected is str:
+            if isinstance(value, str):
+                return value
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return str(value)
+        elif isinstance(value, expected):
+            return value
+        raise JSONExtractionError(f"field '{name}' should be {getattr(expected, '__name__', expected)}, got {type(value).__name__}")
+
+
+def _object_starts(text, start=0):
+    """
+    Positions of '{' that can open an object: followed by a key or the closing brace
+    """
+    pos = text.find('{', start)
+    while pos != -1:
+        nxt = pos + 1
+        while nxt < len(text) and text[nxt] in ' \t\r\n':
+            nxt += 1
+        if nxt >= len(text) or text[nxt] in '"}':
+            yield pos
+        pos = text.find('{', pos + 1)
+
+
+def repair_json(fragment):
+    """
+    Best-effort fix of a JSON object that starts at fragment[0].
+
+    Drops trailing commas and closes a truncated document after its last
+    complete value; an unfinished trailing string is dropped with its key,
+    since half a sentence reads as a finished one. Returns the repaired
+    JSON text, or None when nothing usable is left.
+    """
+    out = []
+    stack = []   # closing characters of the open containers
+    modes = []   # per container: "key", "colon", "value" or "comma" (what comes next)
+    safe = None  # (len(out), closers) right after the last complete value
+
+    def value_done():
+        nonlocal safe
+        modes[-1] = "comma"
+        safe = (len(out), "".join(reversed(stack)))
+
+    i, n = 0, len(fragment)
+    while i < n:
+        ch = fragment[i]
+        if ch in ' \t\r\n':
+            out.append(ch)
+            i += 1
+            continue
+
+        mode = modes[-1] if modes else "value"
+        if ch == '"':
+            j, escaped = i + 1, False
+            while j < n:
+                c = fragment[j]
+                if escaped:
+                    escaped = False
+                elif c == '\\':
+                    escaped = True
+                elif c == '"':
+                    break
+                j += 1
+            if j >= n or mode not in ("key", "value"):
+                break
+            out.append(fragment[i:j + 1])
+            i = j + 1
+            if mode == "key":
+                modes[-1] = "colon"
+            else:
+                value_done()
+            continue
+
+        if ch in '{[':
+            if stack and mode != "value":
+                break
+            out.append(ch)
+            stack.append('}' if ch == '{' else ']')
+            modes.append("key" if ch == '{' else "value")
+            i += 1
+            continue
+
+        if ch in '}]':
+            if not stack or stack[-1] != ch or mode == "colon":
+                break
+            if mode in ("key", "value"):
+                # Trailing comma before the closer
+                k = len(out) - 1
+                while k >= 0 and out[k].isspace():
+                    k -= 1
+                if k >= 0 and out[k] == ',':
+                    del out[k]
+            out.append(ch)
+            stack.pop()
+            modes.pop()
+            if not stack:
+                return "".join(out)
+            value_done()
+            i += 1
+            continue
+
+        if ch == ':':
+            if mode != "colon":
+                break
+            modes[-1] = "value"
+        elif ch == ',':
+            if mode != "comma":
+                break
+            modes[-1] = "key" if stack[-1] == '}' else "value"
+        else:
+            match = _LITERAL.match(fragment, i)
+            # A literal touching the end of the buffer may itself be cut short ("1" of "10")
+            if not match or match.end() >= n or mode != "value" or not stack:
+                break
+            out.append(match.group())
+            i = match.end()
+            value_done()
+            continue
+
+        out.append(ch)
+        i += 1
+
+    if safe is not None:
+        return "".join(out[:safe[0]]) + safe[1]
+    return None
+
+
+def extract_json(text, schema=None, repair=True, call_type=None):
+    """
+    Return the first JSON object in an LLM response that matches the schema.
+
+    Handles markdown fences (with or without a language tag), prose before
+    or after the object, trailing commas and truncated output. An object that
+    shares no field with the schema is skipped, so stray braces in the prose
+    are never mistaken for the answer. Raises JSONExtractionError when no
+    acceptable object can be recovered. call_type labels the parse metrics.
+    """
+    return parse_json_response(text, schema, repair, call_type)[0]
+
+
+def parse_json_response(text, schema=None, repair=True, call_type=None):
+    """
+    Like extract_json, but return (result, repaired). repaired is True when the
+    object was truncated or malformed and had to be fixed up, in which case
+    fields may be missing and the result should not be cached.
+    """
+    try:
+        result, repaired = _extract_json(text, schema, repair)
+    except JSONExtractionError as e:
+        parse_failures.inc(call_type=call_type or "default")
+        current_span().add_event("json_parse_failed", {"error": str(e)[:200]})
+        raise
+    if repaired:
+        parse_repairs.inc(call_type=call_type or "default")
+        current_span().add_event("json_repaired")
+    return result, repaired
+
+
+def _extract_json(text, schema, repair):
+    text = text or ""
+    schema = schema or JSONSchema()
+    last_error = None
+
+    def validate(obj):
+        result = schema.validate(obj)
+        if schema.fields and not any(name in result for name in schema.fields):
+            raise JSONExtractionError("object has none of the expected fields")
+        return result
+
+    stripped = text.strip()
+    if stripped.startswith('{'):
+        # Fast path: the whole response is the object
+        try:
+            return validate(json.loads(stripped)), False
+        except ValueError as e:
+            last_error = e
+
+    starts = []
+    for count, pos in enumerate(_object_starts(text)):
+        if count >= MAX_CANDIDATES:
+            break
+        starts.append(pos)
+        try:
+            obj, _ = _decoder.raw_decode(text, pos)
+            return validate(obj), False
+        except ValueError as e:
+            last_error = e
+
+    if repair:
+        for pos in starts:
+            repaired = repair_json(text[pos:])
+            if repaired is None:
+                continue
+            try:
+                return validate(json.loads(repaired)), True
+            except ValueError as e:
+                last_error = e
+
+    message = f"No valid JSON object found in response: {last_error}" if last_error else "No JSON object found in response"
+    raise JSONExtractionError(message, text, starts[0] if starts else 0)
+
+
+class IncrementalJSONExtractor:
+    """
+    Parses the top-level fields of a JSON object while it is being streamed.
+
+    feed() appends a chunk and returns the fields completed so far; a string
+    value that is still being written is included with the text received up
+    to now. Completed fields are never re-parsed, so the total work is linear
+    in the response length. result() parses the full response with
+    extract_json once the stream has ended.
+    """
+
+    def __init__(self, schema=None, call_type=None):
+        self.schema = schema
+        self.call_type = call_type
+        self.buffer = ""
+        self.fields = {}
+        self._pos = None        # where parsing of the next top-level field resumes
+        self._partial_key = None
+        self._closed = False
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        if self._closed:
+            return dict(self.fields)
+
+        if self._pos is None:
+            self._pos = next(_object_starts(self.buffer), None)
+            if self._pos is None:
+                return {}
+            self._pos += 1
+
+        self._advance()
+        return dict(self.fields)
+
+    def _advance(self):
+        text = self.buffer
+        while True:
+            pos = self._pos
+            while pos < len(text) and text[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(text):
+                return
+            if text[pos] == '}':
+                self._closed = True
+                return
+            if text[pos] != '"':
+                return
+
+            try:
+                key, pos = _decoder.raw_decode(text, pos)
+            except ValueError:
+                return
+
+            while pos < len(text) and text[pos] in ' \t\r\n:':
+                pos += 1
+            if pos >= len(text):
+                return
+
+            try:
+                value, end = _decoder.raw_decode(text, pos)
+            except ValueError:
+                if text[pos] == '"':
+                    # Close the unfinished string, dropping a dangling escape character
+                    partial = text[pos:]
+                    if partial.endswith('\\') and not partial.endswith('\\\\'):
+                        partial = partial[:-1]
+                    try:
+                        self.fields[key] = json.loads(partial + '"')
+                    except ValueError:
+                        pass
+                return
+
+            # A number at the very end of the buffer may still be growing (e.g. "1" of "10")
+            if end >= len(text) and not isinstance(value, (str, list, dict)):
+                return
+            self.fields[key] = value
+            self._pos = end
+
+    def result(self):
+        """
+        Parse and validate the complete response
+        """
+        return extract_json(self.buffer, self.schema, call_type=self.call_type)
@@ -0,0 +1,366 @@
+import json
+import os
+import random
+import threading
+import time
+
+from services.llm_resilience import LLMStatusError, ResilientBackend
+
+# Default model per provider when neither LLM_MODEL nor LLM_MODEL_<CALL_TYPE> is set
+DEFAULT_MODELS = {
+    "gemini": "gemini-1.5-pro",
+    "openai": "gpt-4o-mini",
+    "fake": "fake-model",
+}
+
+# Call types used by the services; each can be routed to its own provider/model
+CALL_TYPES = [
+    "resume_analysis",
+    "keywords",
+    "improvements",
+    "resume_bundle",
+    "question",
+    "evaluation",
+    "star_coaching",
+    "follow_up",
+]
+
+
+def _request_timeout():
+    return float(os.getenv("LLM_TIMEOUT_SECONDS", 60))
+
+
+class LLMBackend:
+    """
+    Common interface for text generation backends
+    """
+    provider = None
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        # Passed to the SDK so a hung request is abandoned by the client, not only by its caller
+        self.request_timeout = _request_timeout()
+
+    @property
+    def identity(self):
+        return f"{self.provider}:{self.model_name}"
+
+    def generate(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        raise NotImplementedError
+
+    def stream(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        """
+        Yield the response text in chunks as it is generated
+        """
+        yield self.generate(prompt, temperature, max_output_tokens, call_type)
+
+
+class GeminiBackend(LLMBackend):
+    provider = "gemini"
+    _configured = False
+
+    def __init__(self, model_name):
+        super().__init__(model_name)
+        self._genai = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        # The SDK takes most of a second to import, so load it on the first request
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+
+                if not GeminiBackend._configured:
+                    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+                    GeminiBackend._configured = True
+                self._genai = genai
+                self._model = genai.GenerativeModel(self.model_name)
+            return self._model
+
+    def generate(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self._genai.types.GenerationConfig(
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+            ),
+            request_options={"timeout": self.request_timeout}
+        )
+        return response.text
+
+    def stream(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self._genai.types.GenerationConfig(
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+            ),
+            request_options={"timeout": self.request_timeout},
+            stream=True
+        )
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+
+class OpenAIBackend(LLMBackend):
+    provider = "openai"
+
+    def __init__(self, model_name):
+        super().__init__(model_name)
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        # Imported on the first request rather than when the backend is resolved
+        with self._lock:
+            if self._client is None:
+                from openai import OpenAI
+
+                # Retries are done by ResilientBackend so they share its backoff and circuit breaker
+                self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=self.request_timeout, max_retries=0)
+            return self._client
+
+    def generate(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_output_tokens,
+        )
+        return response.choices[0].message.content or ""
+
+    def stream(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_output_tokens,
+            stream=True,
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class FakeBackend(LLMBackend):
+    """
+    Offline backend returning canned or recorded responses with simulated latency.
+
+    Recorded responses are read from a JSON file mapping call type to either a
+    response string or a list of strings that is cycled through in order.
+    LLM_FAKE_FAILURE_RATE makes that fraction of requests fail with a rate
+    limit error, to exercise retries and the circuit breaker offline.
+    """
+    provider = "fake"
+    STREAM_CHUNK_SIZE = 24
+
+    CANNED_RESPONSES = {
+        "resume_analysis": {
+            "alignment_score": 7,
+            "score_interpretation": "Good alignment with a few gaps in the required qualifications.",
+            "gaps": ["No cloud platform experience listed", "Limited leadership examples"],
+            "suggestions": ["Quantify achievements with metrics", "Add a skills section that mirrors the posting"],
+            "keywords_analysis": {
+                "missing_keywords": ["AWS", "Kubernetes"],
+                "present_keywords": ["Python", "SQL", "REST APIs"]
+            },
+            "strengths": ["Relevant project experience", "Clear formatting"],
+            "improvement_areas": ["Impact statements", "Keyword coverage"]
+        },
+        "keywords": {
+            "technical_skills": ["Python", "SQL"],
+            "soft_skills": ["Communication", "Collaboration"],
+            "tools_technologies": ["Docker", "Git"],
+            "certifications": [],
+            "key_phrases": ["cross-functional teams", "data-driven decisions"]
+        },
+        "improvements": {
+            "content_improvements": ["Lead each bullet with an action verb"],
+            "formatting_suggestions": ["Keep the resume to two pages"],
+            "keyword_integration": ["Mention AWS in the projects section"],
+            "achievement_enhancements": ["Add measurable outcomes to recent roles"],
+            "priority_actions": ["Tailor the summary to the posting"]
+        },
+        "resume_bundle": {
+            "alignment_score": 7,
+            "score_interpretation": "Good alignment with a few gaps in the required qualifications.",
+            "gaps": ["No cloud platform experience listed", "Limited leadership examples"],
+            "suggestions": ["Quantify achievements with metrics", "Add a skills section that mirrors the posting"],
+            "keywords_analysis": {
+                "missing_keywords": ["AWS", "Kubernetes"],
+                "present_keywords": ["Python", "SQL", "REST APIs"]
+            },
+            "strengths": ["Relevant project experience", "Clear formatting"],
+            "improvement_areas": ["Impact statements", "Keyword coverage"],
+            "keywords": {
+                "technical_skills": ["Python", "SQL"],
+                "soft_skills": ["Communication", "Collaboration"],
+                "tools_technologies": ["Docker", "Git"],
+                "certifications": [],
+                "key_phrases": ["cross-functional teams", "data-driven decisions"]
+            },
+            "improvements": {
+                "content_improvements": ["Lead each bullet with an action verb"],
+                "formatting_suggestions": ["Keep the resume to two pages"],
+                "keyword_integration": ["Mention AWS in the projects section"],
+                "achievement_enhancements": ["Add measurable outcomes to recent roles"],
+                "priority_actions": ["Tailor the summary to the posting"]
+            }
+        },
+        "question": "Tell me about a project where you had to balance technical quality against a tight deadline.",
+        "evaluation": {
+            "score": 6,
+            "feedback": "A solid answer with a clear example, but the outcome could be more specific.",
+            "strengths": ["Relevant example", "Clear structure"],
+            "areas_for_improvement": ["Quantify the result", "Explain your individual contribution"],
+            "suggested_improvements": "Close with the measurable impact of your actions.",
+            "star_format_feedback": "Situation and task are clear; the result is vague.",
+            "example_improvement": "As a result, we shipped two weeks early and cut support tickets by 30%."
+        },
+        "star_coaching": {
+            "star_analysis": {
+                "situation": "Situation is described clearly.",
+                "task": "Task could be more explicit.",
+                "action": "Actions are present but generic.",
+                "result": "Result is missing measurable outcomes."
+            },
+            "improved_structure": "Open with context, state your goal, walk through your actions, finish with results.",
+            "example_phrases": ["In this situation...", "My goal was...", "I decided to...", "As a result..."],
+            "coaching_tips": ["Use numbers for results", "Keep the situation brief"]
+        },
+        "follow_up": "What would you do differently if you faced the same situation again?",
+    }
+
+    def __init__(self, model_name, latency_seconds=None, responses_path=None, failure_rate=None):
+        super().__init__(model_name)
+        self.latency_seconds = latency_seconds if latency_seconds is not None else float(os.getenv("LLM_FAKE_LATENCY_SECONDS", 0))
+        self.failure_rate = failure_rate if failure_rate is not None else float(os.getenv("LLM_FAKE_FAILURE_RATE", 0))
+        self.responses = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+
+        responses_path = responses_path or os.getenv("LLM_FAKE_RESPONSES_PATH")
+        if responses_path and os.path.exists(responses_path):
+            with open(responses_path, "r", encoding="utf-8") as f:
+                self.responses = json.load(f)
+
+    def generate(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        self._maybe_fail()
+        return self._response_for(call_type)
+
+    def stream(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        self._maybe_fail()
+        text = self._response_for(call_type)
+        chunks = [text[i:i + self.STREAM_CHUNK_SIZE] for i in range(0, len(text), self.STREAM_CHUNK_SIZE)] or [""]
+        # Spread the simulated latency over the chunks so time-to-first-token is realistic
+        for chunk in chunks:
+            if self.latency_seconds:
+                time.sleep(self.latency_seconds / len(chunks))
+            yield chunk
+
+    def _maybe_fail(self):
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise LLMStatusError(429, "Resource exhausted (fake backend)")
+
+    def _response_for(self, call_type):
+        recorded = self.responses.get(call_type)
+        if isinstance(recorded, list) and recorded:
+            with self._lock:
+                position = self._positions.get(call_type, 0)
+                self._positions[call_type] = position + 1
+            return recorded[position % len(recorded)]
+        if isinstance(recorded, str):
+            return recorded
+
+        canned = self.CANNED_RESPONSES.get(call_type, "")
+        return canned if isinstance(canned, str) else json.dumps(canned)
+
+
+class RecordingBackend(LLMBackend):
+    """
+    Wraps a real backend and appends every response to a JSON file that
+    FakeBackend can later replay
+    """
+
+    def __init__(self, backend, record_path):
+        self.backend = backend
+        super().__init__(backend.model_name)
+        self.provider = backend.provider
+        self.record_path = record_path
+        self._lock = threading.Lock()
+
+    @property
+    def request_timeout(self):
+        return self.backend.request_timeout
+
+    @request_timeout.setter
+    def request_timeout(self, seconds):
+        self.backend.request_timeout = seconds
+
+    def generate(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        text = self.backend.generate(prompt, temperature, max_output_tokens, call_type)
+        self._record(call_type, text)
+        return text
+
+    def stream(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        chunks = []
+        for chunk in self.backend.stream(prompt, temperature, max_output_tokens, call_type):
+            chunks.append(chunk)
+            yield chunk
+        self._record(call_type, "".join(chunks))
+
+    def _record(self, call_type, text):
+        with self._lock:
+            recorded = {}
+            if os.path.exists(self.record_path):
+                with open(self.record_path, "r", encoding="utf-8") as f:
+                    recorded = json.load(f)
+            recorded.setdefault(call_type or "default", []).append(text)
+            with open(self.record_path, "w", encoding="utf-8") as f:
+                json.dump(recorded, f, indent=2)
+
+
+BACKEND_CLASSES = {
+    "gemini": GeminiBackend,
+    "openai": OpenAIBackend,
+    "fake": FakeBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(call_type=None):
+    """
+    Resolve the backend for a call type from the environment.
+
+    LLM_BACKEND / LLM_MODEL select the default provider and model, and
+    LLM_BACKEND_<CALL_TYPE> / LLM_MODEL_<CALL_TYPE> override them per call type.
+    Backends are shared across services for the same provider and model, and
+    are wrapped with timeouts, retries and a circuit breaker unless
+    LLM_RESILIENCE=false.
+    """
+    suffix = f"_{call_type.upper()}" if call_type else ""
+    provider = (os.getenv(f"LLM_BACKEND{suffix}") or os.getenv("LLM_BACKEND", "gemini")).lower()
+    if provider not in BACKEND_CLASSES:
+        raise Exception(f"Unknown LLM backend: {provider}")
+    model_name = os.getenv(f"LLM_MODEL{suffix}") or os.getenv("LLM_MODEL") or DEFAULT_MODELS[provider]
+    record_path = os.getenv("LLM_RECORD_PATH")
+    resilient = os.getenv("LLM_RESILIENCE", "true").lower() == "true"
+
+    key = (provider, model_name, record_path, resilient)
+    with _backends_lock:
+        if key not in _backends:
+            backend = BACKEND_CLASSES[provider](model_name)
+            if record_path and provider != "fake":
+                backend = RecordingBackend(backend, record_path)
+            if resilient:
+                backend = ResilientBackend(backend)
+            _backends[key] = backend
+        return _backends[key]
@@ -0,0 +1,358 @@
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from utils.telemetry import current_span, registry, tracer
+
+# HTTP statuses worth retrying: request timeout, conflict, rate limit and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+# Latency samples kept per call type for percentiles
+LATENCY_WINDOW = 512
+
+
+class LLMTimeoutError(Exception):
+    pass
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class LLMStatusError(Exception):
+    """
+    A backend error carrying the HTTP status code of the failed request
+    """
+
+    def __init__(self, status_code, message):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+
+
+def is_retryable(error):
+    """
+    Whether a failed request is worth retrying: timeouts, connection errors,
+    rate limits and transient server errors. Provider errors are classified
+    by exception type and HTTP status code, never by their message.
+    """
+    if isinstance(error, (LLMTimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if isinstance(error, LLMStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+
+    # The SDKs are imported lazily; an error cannot come from one that was never loaded
+    openai = sys.modules.get("openai")
+    if openai is not None:
+        # APIConnectionError covers APITimeoutError
+        if isinstance(error, openai.APIConnectionError):
+            return True
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+    google_exceptions = sys.modules.get("google.api_core.exceptions")
+    if google_exceptions is not None and isinstance(error, google_exceptions.GoogleAPICallError):
+        # code is the HTTP status, e.g. 429 for ResourceExhausted and 504 for DeadlineExceeded
+        return error.code in RETRYABLE_STATUS_CODES
+    return False
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated failures of one backend.
+
+    After failure_threshold consecutive failed attempts the circuit opens and
+    calls are rejected for reset_seconds. Then a single trial call is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, name, failure_threshold=None, reset_seconds=None):
+        self.name = name
+        self.failure_threshold = failure_threshold or int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", 5))
+        self.reset_seconds = reset_seconds if reset_seconds is not None else float(os.getenv("LLM_BREAKER_RESET_SECONDS", 30))
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    raise CircuitOpenError(f"LLM backend {self.name} is unavailable (circuit open)")
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._trial_in_flight:
+                    raise CircuitOpenError(f"LLM backend {self.name} is unavailable (circuit half-open)")
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """
+        End a call that says nothing about the backend's health (e.g. a bad
+        request): frees the half-open trial slot without closing or opening
+        the circuit
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._trial_in_flight = False
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+            }
+
+
+class LLMMetrics:
+    """
+    Attempt, outcome, latency and estimated prompt token counters per call type
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _entry(self, call_type):
+        entry = self._stats.get(call_type)
+        if entry is None:
+            entry = self._stats[call_type] = {
+                "calls": 0,
+                "attempts": 0,
+                "retries": 0,
+                "successes": 0,
+                "failures": 0,
+                "timeouts": 0,
+                "short_circuits": 0,
+                "fallbacks": 0,
+                "prompt_tokens_sent": 0,
+                "prompt_tokens_saved": 0,
+                "latencies": deque(maxlen=LATENCY_WINDOW),
+            }
+        return entry
+
+    def record(self, call_type, **increments):
+        with self._lock:
+            entry = self._entry(call_type or "default")
+            for name, amount in increments.items():
+                entry[name] += amount
+
+    def record_latency(self, call_type, seconds):
+        with self._lock:
+            self._entry(call_type or "default")["latencies"].append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            snapshot = {}
+            for call_type, entry in self._stats.items():
+                latencies = sorted(entry["latencies"])
+                stats = {name: value for name, value in entry.items() if name != "latencies"}
+                stats["latency_p50_seconds"] = round(percentile(latencies, 0.50), 4)
+                stats["latency_p95_seconds"] = round(percentile(latencies, 0.95), 4)
+                stats["latency_p99_seconds"] = round(percentile(latencies, 0.99), 4)
+                stats["latency_max_seconds"] = round(latencies[-1], 4) if latencies else 0.0
+                snapshot[call_type] = stats
+            return snapshot
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+metrics = LLMMetrics()
+_breakers = {}
+_breakers_lock = threading.Lock()
+# Runs backend calls so a hung request can be abandoned at its deadline
+_max_workers = int(os.getenv("LLM_MAX_CONCURRENT_CALLS", 32))
+_executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="llm-call")
+# An abandoned call keeps its worker until the SDK gives up; past this many, new calls fail fast
+# instead of queueing behind hung ones
+_max_abandoned = int(os.getenv("LLM_MAX_ABANDONED_CALLS", max(1, _max_workers // 2)))
+_abandoned = 0
+_abandoned_lock = threading.Lock()
+
+
+def _release_abandoned(future):
+    global _abandoned
+    with _abandoned_lock:
+        _abandoned -= 1
+
+
+request_duration = registry.histogram(
+    "llm_request_duration_seconds", "Latency of each LLM request attempt", ("call_type", "provider", "outcome")
+)
+token_usage = registry.counter(
+    "llm_tokens_total", "Estimated LLM tokens by direction (prompt or completion)", ("call_type", "provider", "direction")
+)
+
+
+def get_breaker(name):
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def get_llm_metrics():
+    """
+    Per call type attempt/latency metrics plus the state of every circuit breaker
+    """
+    with _breakers_lock:
+        breakers = {name: breaker.snapshot() for name, breaker in _breakers.items()}
+    with _abandoned_lock:
+        abandoned = _abandoned
+    return {"calls": metrics.snapshot(), "breakers": breakers, "abandoned_calls": abandoned}
+
+
+class ResilientBackend:
+    """
+    Wraps a backend with request timeouts, jittered exponential backoff for
+    retryable errors and a circuit breaker shared by every call type on the
+    same provider and model.
+
+    Streams are retried only until the first chunk arrives; after that a
+    failure is raised to the caller, since the partial text has been seen.
+    """
+
+    def __init__(self, backend, breaker=None, timeout_seconds=None, max_attempts=None, backoff_base=None, backoff_max=None):
+        self.backend = backend
+        self.provider = backend.provider
+        self.model_name = backend.model_name
+        self.breaker = breaker or get_breaker(backend.identity)
+        self.timeout_seconds = timeout_seconds or float(os.getenv("LLM_TIMEOUT_SECONDS", 60))
+        self.max_attempts = max_attempts or int(os.getenv("LLM_MAX_ATTEMPTS", 3))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv("LLM_BACKOFF_BASE_SECONDS", 0.5))
+        self.backoff_max = backoff_max if backoff_max is not None else float(os.getenv("LLM_BACKOFF_MAX_SECONDS", 8))
+        # The SDK request gives up at the same deadline, which frees the worker of an abandoned call
+        self.backend.request_timeout = self.timeout_seconds
+
+    @property
+    def identity(self):
+        return self.backend.identity
+
+    def _backoff(self, attempt):
+        # Full jitter: spreads retries from concurrent sessions instead of synchronizing them
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _span_attributes(self, call_type):
+        return {"llm.call_type": call_type or "default", "llm.provider": self.provider, "llm.model": self.model_name}
+
+    def _record_tokens(self, call_type, prompt, text, span=None):
+        # Imported here because prompt_builder records into this module's metrics
+        from services.prompt_builder import estimate_tokens
+
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+        token_usage.inc(prompt_tokens, call_type=call_type or "default", provider=self.provider, direction="prompt")
+        token_usage.inc(completion_tokens, call_type=call_type or "default", provider=self.provider, direction="completion")
+        if span is not None:
+            span.set_attribute("llm.prompt_tokens", prompt_tokens)
+            span.set_attribute("llm.completion_tokens", completion_tokens)
+
+    def _call_with_retries(self, call_type, attempt_once):
+        metrics.record(call_type, calls=1)
+        span = current_span()
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                metrics.record(call_type, short_circuits=1, failures=1)
+                span.set_attribute("llm.short_circuited", True)
+                raise
+
+            metrics.record(call_type, attempts=1)
+            span.set_attribute("llm.attempts", attempt)
+            started = time.monotonic()
+            try:
+                result = attempt_once()
+            except Exception as e:
+                elapsed = time.monotonic() - started
+                metrics.record_latency(call_type, elapsed)
+                outcome = "timeout" if isinstance(e, LLMTimeoutError) else "error"
+                request_duration.observe(elapsed, call_type=call_type or "default", provider=self.provider, outcome=outcome)
+                if isinstance(e, LLMTimeoutError):
+                    metrics.record(call_type, timeouts=1)
+                if not is_retryable(e):
+                    # A bad request or safety block neither proves nor disproves the backend is healthy
+                    self.breaker.release()
+                    metrics.record(call_type, failures=1)
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_attempts:
+                    metrics.record(call_type, failures=1)
+                    raise
+                metrics.record(call_type, retries=1)
+                delay = self._backoff(attempt)
+                span.add_event("retry", {"attempt": attempt, "error": str(e)[:200], "backoff_seconds": round(delay, 3)})
+                time.sleep(delay)
+            else:
+                elapsed = time.monotonic() - started
+                metrics.record_latency(call_type, elapsed)
+                request_duration.observe(elapsed, call_type=call_type or "default", provider=self.provider, outcome="success")
+                self.breaker.record_success()
+                metrics.record(call_type, successes=1)
+                return result
+
+    def _with_timeout(self, fn, *args):
+        global _abandoned
+        with _abandoned_lock:
+            if _abandoned >= _max_abandoned:
+                raise LLMTimeoutError(f"{_abandoned} timed-out LLM requests are still running; not starting another")
+        future = _executor.submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except TimeoutError:
+            # cancel() only stops a call still queued; a running one holds its worker until it returns
+            if not future.cancel():
+                with _abandoned_lock:
+                    _abandoned += 1
+                future.add_done_callback(_release_abandoned)
+            raise LLMTimeoutError(f"LLM request timed out after {self.timeout_seconds:g}s")
+
+    def generate(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        with tracer.start_span("llm.generate", self._span_attributes(call_type)) as span:
+            text = self._call_with_retries(
+                call_type,
+                lambda: self._with_timeout(self.backend.generate, prompt, temperature, max_output_tokens, call_type)
+            )
+            self._record_tokens(call_type, prompt, text, span)
+            return text
+
+    def stream(self, prompt, temperature=0.7, max_output_tokens=1024, call_type=None):
+        _end = object()
+
+        def open_stream():
+            iterator = iter(self.backend.stream(prompt, temperature, max_output_tokens, call_type))
+            return iterator, self._with_timeout(next, iterator, _end)
+
+        # The span covers the wait for the first chunk; the rest is paced by the consumer
+        with tracer.start_span("llm.stream", self._span_attributes(call_type)):
+            iterator, chunk = self._call_with_retries(call_type, open_stream)
+        chunks = []
+        while chunk is not _end:
+            chunks.append(chunk)
+            yield chunk
+            # The timeout applies to each gap between chunks, not the whole stream
+            chunk = self._with_timeout(next, iterator, _end)
+        self._record_tokens(call_type, prompt, "".join(chunks))
@@ -0,0 +1,217 @@
+import math
+import os
+import re
+from services.llm_resilience import metrics as llm_metrics
+from utils.section_segmenter import SectionSegmenter, segment_sections
+from utils.telemetry import registry
+
+# Rough size of a token for English prose; no tokenizer is bundled, so counts are estimates
+CHARS_PER_TOKEN = 4
+
+# Bump when compaction rules change what reaches a prompt, so cached results built from older text are not reused
+PROMPT_BUILDER_VERSION = "2"
+
+# Resume sections in the order they are kept when a resume is over budget
+RESUME_SECTION_PRIORITY = [
+    "header", "summary", "experience", "skills", "projects", "education", "certifications",
+    "achievements", "awards", "publications", "languages", "interests",
+]
+
+# Job description sections, matched against whole lines like resume headings
+JOB_DESCRIPTION_HEADINGS = {
+    "requirements": [
+        "requirements", "qualifications", "minimum qualifications", "basic qualifications",
+        "preferred qualifications", "what you'll need", "what you bring", "what we're looking for",
+        "who you are", "skills", "must have", "nice to have", "about you",
+    ],
+    "responsibilities": [
+        "responsibilities", "key responsibilities", "what you'll do", "the role", "your role",
+        "duties", "role overview", "job description", "overview",
+    ],
+    "about": ["about us", "about the company", "who we are", "our mission", "company overview"],
+    "benefits": ["benefits", "perks", "perks and benefits", "what we offer", "compensation", "why join us"],
+}
+JOB_DESCRIPTION_SECTION_PRIORITY = ["header", "requirements", "responsibilities", "about", "benefits"]
+
+# Phrases of legal or HR boilerplate; a prose paragraph naming two different ones is a notice, not a requirement
+BOILERPLATE_PATTERN = re.compile(
+    r"equal (?:employment )?opportunity|without regard to|affirmative action|reasonable accommodations?"
+    r"|e-verify|protected veteran|veteran status|sexual orientation|gender identity|pay transparency"
+    r"|privacy (?:notice|policy)|do not accept unsolicited|recruitment agencies|qualified applicants"
+    r"|national origin|protected characteristics?|application process",
+    re.IGNORECASE
+)
+# "- item", "• item", "1. item" and "1) item"
+LIST_ITEM_PATTERN = re.compile(r"^\s*(?:[-*•·▪◦–]|\d+[.)])\s")
+# "Page 2", "Page 2 of 5", "Page 2/5", "2 of 5" and "- 2 -"; bare numbers are left alone, they are usually years
+PAGE_NUMBER_PATTERN = re.compile(
+    r"^\s*(?:page\s+\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s+of\s+\d+|[-–—]\s*\d+\s*[-–—])\s*$", re.IGNORECASE
+)
+
+_job_description_segmenter = SectionSegmenter(JOB_DESCRIPTION_HEADINGS)
+
+tokens_saved = registry.counter(
+    "prompt_tokens_saved_total", "Estimated tokens removed from prompt inputs by compaction", ("call_type",)
+)
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def normalize_whitespace(text):
+    """
+    Collapse runs of spaces and tabs, trim every line and keep at most one blank line in a row
+    """
+    lines = [" ".join(line.split()) for line in (text or "").replace("\r\n", "\n").replace("\r", "\n").split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def is_boilerplate(paragraph):
+    """
+    True when a paragraph as a whole is an EEO, accommodation, privacy or agency notice.
+
+    The paragraph has to be prose, with no list items or section headings,
+    and name at least two different boilerplate phrases. A requirement that
+    mentions one of them ("experience maintaining a privacy policy") is kept.
+    """
+    lines = [line for line in paragraph.split("\n") if line.strip()]
+    if any(LIST_ITEM_PATTERN.match(line) or _job_description_segmenter.match_heading(line) for line in lines):
+        return False
+    phrases = {match.lower() for match in BOILERPLATE_PATTERN.findall(" ".join(lines))}
+    return len(phrases) >= 2
+
+
+def strip_boilerplate(text):
+    """
+    Drop EEO, accommodation, privacy and agency paragraphs from a job description
+    """
+    paragraphs = re.split(r"\n\s*\n", text)
+    return "\n\n".join(p for p in paragraphs if p.strip() and not is_boilerplate(p))
+
+
+def strip_page_furniture(text):
+    """
+    Drop page numbers and running headers/footers from text extracted from a PDF.
+
+    Only the page breaks inserted by the extraction engine count as page
+    boundaries, so text without them is returned unchanged. A page number
+    ("Page 2", "2 of 5", "- 2 -") is dropped from the first or last two lines
+    of a page. A line in those positions on every page is a running header
+    or footer; it is kept on the first page, which usually carries the
+    candidate's name, and dropped from the others.
+    """
+    if "\f" not in (text or ""):
+        return text
+
+    def edges(lines):
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        return set(filled[:2] + filled[-2:])
+
+    pages = []
+    for page in text.split("\f"):
+        lines = page.strip("\n").split("\n")
+        edge = edges(lines)
+        pages.append([line for i, line in enumerate(lines) if i not in edge or not PAGE_NUMBER_PATTERN.match(line)])
+
+    repeated = None
+    for lines in pages:
+        keys = {lines[i].strip().lower() for i in edges(lines) if len(lines[i].strip()) <= 80}
+        repeated = keys if repeated is None else repeated & keys
+
+    out = [pages[0]]
+    for lines in pages[1:]:
+        edge = edges(lines)
+        out.append([line for i, line in enumerate(lines) if i not in edge or line.strip().lower() not in repeated])
+    return "\n\n".join("\n".join(lines) for lines in out if any(line.strip() for line in lines))
+
+
+def truncate_sections(sections, priority, budget):
+    """
+    Keep sections in priority order until the token budget is spent.
+
+    A section that does not fit whole keeps its first lines (the most recent
+    roles, for experience) and notes how many were omitted. The result is in
+    document order.
+    """
+    rank = {name: index for index, name in enumerate(priority)}
+    order = sorted(range(len(sections)), key=lambda i: (rank.get(sections[i]["name"], len(priority)), i))
+
+    kept = {}
+    remaining = budget
+    for i in order:
+        section = sections[i]
+        heading = section["heading"]
+        cost = estimate_tokens(heading) + 1 if heading else 0
+        if cost >= remaining:
+            continue
+        lines = []
+        remaining -= cost
+        for line in section["lines"]:
+            line_cost = estimate_tokens(line) + 1
+            if line_cost > remaining:
+                break
+            lines.append(line)
+            remaining -= line_cost
+        if not lines and not heading:
+            continue
+        omitted = len(section["lines"]) - len(lines)
+        if omitted:
+            lines.append(f"[{omitted} more lines omitted]")
+        kept[i] = ([heading] if heading else []) + lines
+
+    return "\n\n".join("\n".join(kept[i]) for i in sorted(kept))
+
+
+class PromptBuilder:
+    """
+    Prepares user-supplied text for prompts within a token budget.
+
+    Text is whitespace-normalized and stripped of boilerplate first (EEO and
+    legal paragraphs in job descriptions, page numbers and running
+    headers/footers in resumes). Anything still over budget is truncated by
+    section priority: the least useful sections go first. Answers keep their
+    beginning and end, where the context and the result of a STAR answer are.
+
+    Estimated tokens sent and saved are added to the LLM metrics of the call type.
+    """
+
+    def __init__(self, resume_budget=None, job_description_budget=None, answer_budget=None):
+        self.resume_budget = resume_budget or int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", 3000))
+        self.job_description_budget = job_description_budget or int(os.getenv("PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET", 1500))
+        self.answer_budget = answer_budget or int(os.getenv("PROMPT_ANSWER_TOKEN_BUDGET", 1000))
+
+    @property
+    def version(self):
+        """
+        Identifies the prepared text: the compaction rules plus the budgets, for use in cache keys
+        """
+        return f"{PROMPT_BUILDER_VERSION}:{self.resume_budget}:{self.job_description_budget}:{self.answer_budget}"
+
+    def _record(self, call_type, original, prepared):
+        sent = estimate_tokens(prepared)
+        saved = max(0, estimate_tokens(original) - sent)
+        llm_metrics.record(call_type, prompt_tokens_sent=sent, prompt_tokens_saved=saved)
+        tokens_saved.inc(saved, call_type=call_type or "default")
+        return prepared
+
+    def resume(self, resume_text, call_type=None):
+        text = normalize_whitespace(strip_page_furniture(resume_text))
+        if estimate_tokens(text) > self.resume_budget:
+            text = truncate_sections(segment_sections(text), RESUME_SECTION_PRIORITY, self.resume_budget)
+        return self._record(call_type, resume_text, text)
+
+    def job_description(self, job_description, call_type=None):
+        text = strip_boilerplate(normalize_whitespace(job_description))
+        if estimate_tokens(text) > self.job_description_budget:
+            text = truncate_sections(
+                _job_description_segmenter.segment(text), JOB_DESCRIPTION_SECTION_PRIORITY, self.job_description_budget
+            )
+        return self._record(call_type, job_description, text)
+
+    def answer(self, answer, call_type=None):
+        text = normalize_whitespace(answer)
+        if estimate_tokens(text) > self.answer_budget:
+            keep = self.answer_budget * CHARS_PER_TOKEN // 2
+            text = f"{text[:keep].rstrip()}\n[... middle of the answer omitted ...]\n{text[-keep:].lstrip()}"
+        return self._record(call_type, answer, text)
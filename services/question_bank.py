@@ -0,0 +1,188 @@
+import hashlib
+import os
+import random
+import re
+import threading
+from utils.telemetry import cache_lookups
+
+# Seniority and level words dropped from job roles, so "Sr. Software Engineer II" shares a bank with "Software Engineer"
+ROLE_NOISE_WORDS = frozenset([
+    "senior", "sr", "junior", "jr", "lead", "principal", "staff", "associate", "entry", "level", "mid",
+    "i", "ii", "iii", "iv", "intern", "trainee",
+])
+
+# Filler words ignored when comparing questions
+QUESTION_STOPWORDS = frozenset("""
+a an and are as at be can could describe did do does example explain for from give had has have how i
+if in is it me of on or our situation tell that the this time to us was we were what when where which
+while who why will with would you your
+""".split())
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+def normalize_job_role(job_role):
+    words = _WORD.findall((job_role or "").lower())
+    core = [word for word in words if word not in ROLE_NOISE_WORDS]
+    return " ".join(core or words)
+
+
+def _fold(word):
+    """
+    Crude stemming so inflections compare equal ("outages", "outage" -> "outag")
+    """
+    if len(word) > 4 and word.endswith("ies"):
+        word = word[:-3] + "y"
+    elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    for suffix in ("ing", "ed"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            word = word[:-len(suffix)]
+            break
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def question_terms(question_text):
+    """
+    Folded content words of a question
+    """
+    return frozenset(
+        _fold(word) for word in _WORD.findall((question_text or "").lower()) if word not in QUESTION_STOPWORDS
+    )
+
+
+def question_fingerprint(question_text):
+    terms = question_terms(question_text)
+    key = " ".join(sorted(terms)) if terms else " ".join(_WORD.findall((question_text or "").lower()))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def similarity(terms_a, terms_b):
+    if not terms_a or not terms_b:
+        return 0.0
+    return len(terms_a & terms_b) / len(terms_a | terms_b)
+
+
+class QuestionBank:
+    """
+    Interview questions harvested from the LLM and shared across users.
+
+    Questions are keyed by normalized job role and focus area. A new question
+    whose content words overlap one of the dedup_window most recently banked
+    ones by at least similarity_threshold (Jaccard) is collapsed into it;
+    exact rewordings are collapsed by fingerprint however old. Each user is
+    served a banked question at most once.
+
+    The bank is a best-effort cache: when the database is unavailable every
+    lookup misses and questions come from the LLM as before.
+    """
+
+    def __init__(self, db_service=None, min_fresh=None, similarity_threshold=None, dedup_window=None):
+        self._db_service = db_service
+        self.min_fresh = min_fresh if min_fresh is not None else int(os.getenv("QUESTION_BANK_MIN_FRESH", 3))
+        self.similarity_threshold = similarity_threshold or float(os.getenv("QUESTION_BANK_SIMILARITY", 0.7))
+        self.dedup_window = dedup_window or int(os.getenv("QUESTION_BANK_DEDUP_WINDOW", 200))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.harvested = 0
+        self.duplicates = 0
+        self.errors = 0
+
+    @property
+    def db_service(self):
+        if self._db_service is None:
+            from database import db_service
+
+            self._db_service = db_service
+        return self._db_service
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def take(self, session_id, job_role, focus_area, min_fresh=None, mark_served=True):
+        """
+        Pick a random question the user has not seen, provided at least
+        min_fresh such questions are banked. Returns (entry or None, number of
+        unseen questions left afterwards). With mark_served=False the entry is
+        not recorded as served; call mark_served() when it is handed over.
+        """
+        min_fresh = self.min_fresh if min_fresh is None else min_fresh
+        try:
+            fresh = self.db_service.get_fresh_bank_questions(session_id, normalize_job_role(job_role), focus_area)
+            if not fresh or len(fresh) < min_fresh:
+                self._count("misses")
+                cache_lookups.inc(cache="question_bank", result="miss")
+                return None, len(fresh)
+
+            entry = random.choice(fresh)
+            if mark_served:
+                self.db_service.save_bank_question_served(session_id, entry.id)
+        except Exception:
+            self._count("errors")
+            cache_lookups.inc(cache="question_bank", result="error")
+            return None, 0
+        self._count("hits")
+        cache_lookups.inc(cache="question_bank", result="hit")
+        return entry, len(fresh) - 1
+
+    def mark_served(self, session_id, question_id):
+        """
+        Record a banked question as served to the user. Returns False if that failed.
+        """
+        try:
+            return self.db_service.save_bank_question_served(session_id, question_id)
+        except Exception:
+            self._count("errors")
+            return False
+
+    def add(self, job_role, focus_area, question_text, served_to=None):
+        """
+        Bank a generated question, collapsing near-duplicates, and record it as
+        served to the served_to user if given. Returns the banked entry's id,
+        or None if it could not be stored.
+        """
+        question_text = (question_text or "").strip()
+        if not question_text:
+            return None
+
+        job_role_key = normalize_job_role(job_role)
+        terms = question_terms(question_text)
+        try:
+            question_id = None
+            for entry in self.db_service.get_bank_questions(job_role_key, focus_area, limit=self.dedup_window):
+                if similarity(terms, question_terms(entry.question_text)) >= self.similarity_threshold:
+                    question_id = entry.id
+                    self._count("duplicates")
+                    break
+
+            if question_id is None:
+                question_id = self.db_service.save_bank_question(
+                    job_role_key, focus_area, question_text, question_fingerprint(question_text)
+                )
+                self._count("harvested")
+
+            if served_to is not None:
+                self.db_service.save_bank_question_served(served_to, question_id)
+        except Exception:
+            self._count("errors")
+            return None
+        return question_id
+
+    def stats(self):
+        """
+        Return bank lookup counters and the hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "harvested": self.harvested,
+                "duplicates": self.duplicates,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from utils.telemetry import cache_lookups
+
+
+class QuestionPrefetcher:
+    """
+    Speculatively generates the next interview question in the background.
+
+    Prefetches are keyed by the owner (the user's session id) and the interview
+    settings, so a prefetch started for old settings is never handed over. A
+    banked question is recorded as served to the owner only when take()
+    hands it over.
+    When the coach has a question deadline, take() waits no longer than that:
+    a fallback question is served and the prefetch stays in flight for the
+    next turn.
+    """
+
+    def __init__(self, interview_coach, max_workers=4):
+        self.interview_coach = interview_coach
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="question-prefetch")
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.late = 0
+
+    @staticmethod
+    def _make_key(owner_id, job_role, focus_areas, interview_type):
+        return (owner_id, job_role, tuple(focus_areas), interview_type)
+
+    def prefetch(self, owner_id, job_role, focus_areas, interview_type):
+        """
+        Start generating the next question unless one is already in flight
+        """
+        key = self._make_key(owner_id, job_role, focus_areas, interview_type)
+        with self._lock:
+            self._discard_stale(owner_id, keep=key)
+            if key not in self._pending:
+                self._pending[key] = self.executor.submit(
+                    self.interview_coach.prefetch_question, job_role, list(focus_areas), interview_type,
+                    session_id=owner_id
+                )
+
+    def take(self, owner_id, job_role, focus_areas, interview_type):
+        """
+        Hand over the prefetched question, waiting for it if still in flight.
+        Returns None when nothing was prefetched for these settings.
+        """
+        key = self._make_key(owner_id, job_role, focus_areas, interview_type)
+        with self._lock:
+            self._discard_stale(owner_id, keep=key)
+            future = self._pending.pop(key, None)
+            if future is None or future.cancelled():
+                self._record_miss()
+                return None
+
+        started = time.monotonic()
+        deadline = self.interview_coach.question_deadline_seconds or None
+        try:
+            question, question_id = future.result(timeout=deadline)
+        except TimeoutError:
+            with self._lock:
+                self._record_miss()
+                self.late += 1
+                # Keep it for the next turn unless the settings changed meanwhile
+                self._pending.setdefault(key, future)
+            self.interview_coach.serving_stats.record("deadline_fallback", time.monotonic() - started)
+            return self.interview_coach.fallback_question(job_role, list(focus_areas), interview_type, session_id=owner_id)
+        except Exception:
+            with self._lock:
+                self._record_miss()
+            return None
+        # Only now has the user seen it; a discarded prefetch leaves the question unseen
+        with self._lock:
+            self.hits += 1
+            cache_lookups.inc(cache="question_prefetch", result="hit")
+        self.interview_coach.mark_question_served(owner_id, question_id)
+        self.interview_coach.serving_stats.record("prefetch", time.monotonic() - started)
+        return question
+
+    def cancel(self, owner_id):
+        """
+        Drop every prefetch belonging to an owner, e.g. when the interview ends
+        """
+        with self._lock:
+            self._discard_stale(owner_id, keep=None)
+
+    def _record_miss(self):
+        self.misses += 1
+        cache_lookups.inc(cache="question_prefetch", result="miss")
+
+    def _discard_stale(self, owner_id, keep):
+        for key in [k for k in self._pending if k[0] == owner_id and k != keep]:
+            self._pending.pop(key).cancel()
+            self.discarded += 1
+
+    def stats(self):
+        """
+        Return prefetch counters and the hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "discarded": self.discarded,
+                "late": self.late,
+                "in_flight": len(self._pending),
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -1,17 +1,84 @@
 import json
-import os
-import google.generativeai as genai
+from services.analysis_cache import AnalysisCache
+from services.json_extractor import JSONSchema, extract_json, parse_json_response
+from services.llm_backend import get_backend
+from services.prompt_builder import PromptBuilder
+from utils.telemetry import traced
+
+# Bump whenever a prompt changes so stale cached results are not served
+ANALYSIS_PROMPT_VERSION = "3"
+KEYWORDS_PROMPT_VERSION = "keywords-2"
+BUNDLE_PROMPT_VERSION = "bundle-3"
+
+# Expected shape of each response; see services/json_extractor.py
+KEYWORDS_SCHEMA = JSONSchema(optional={
+    "technical_skills": list,
+    "soft_skills": list,
+    "tools_technologies": list,
+    "certifications": list,
+    "key_phrases": list,
+})
+
+IMPROVEMENTS_SCHEMA = JSONSchema(optional={
+    "content_improvements": list,
+    "formatting_suggestions": list,
+    "keyword_integration": list,
+    "achievement_enhancements": list,
+    "priority_actions": list,
+})
+
+ANALYSIS_SCHEMA = JSONSchema(
+    required={"alignment_score": float},
+    optional={
+        "score_interpretation": str,
+        "gaps": list,
+        "suggestions": list,
+        "keywords_analysis": JSONSchema(optional={"missing_keywords": list, "present_keywords": list}),
+        "strengths": list,
+        "improvement_areas": list,
+    }
+)
+
+BUNDLE_SCHEMA = JSONSchema(
+    required=ANALYSIS_SCHEMA.required,
+    optional={**ANALYSIS_SCHEMA.optional, "keywords": KEYWORDS_SCHEMA, "improvements": IMPROVEMENTS_SCHEMA}
+)
 
 class ResumeAnalyzer:
-    def __init__(self):
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        self.model = genai.GenerativeModel('gemini-1.5-pro')
+    def __init__(self, cache=None, prompt_builder=None):
+        self.backends = {
+            call_type: get_backend(call_type)
+            for call_type in ("resume_analysis", "keywords", "improvements", "resume_bundle")
+        }
+        self.analysis_config = {"temperature": 0.3, "max_output_tokens": 2048}
+        self.keywords_config = {"temperature": 0.2, "max_output_tokens": 1024}
+        self.bundle_config = {"temperature": 0.3, "max_output_tokens": 4096}
+        self.cache = cache if cache is not None else AnalysisCache()
+        self.prompt_builder = prompt_builder or PromptBuilder()
     
+    @traced("resume_analyzer.analyze_resume")
     def analyze_resume(self, resume_text, job_description):
         """
         Analyze resume against job description and provide comprehensive feedback
         """
+        cache_key = self.cache.make_key(
+            resume_text, job_description, self.backends["resume_analysis"].identity,
+            f"{ANALYSIS_PROMPT_VERSION}/{self.prompt_builder.version}", self.analysis_config
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result, repaired = self._run_analysis(resume_text, job_description)
+        # A repaired response was cut short; serve it, but ask the model again next time
+        if not repaired:
+            self.cache.set(cache_key, result)
+        return result
+
+    def _run_analysis(self, resume_text, job_description):
         try:
+            resume_text = self.prompt_builder.resume(resume_text, "resume_analysis")
+            job_description = self.prompt_builder.job_description(job_description, "resume_analysis")
             prompt = f"""
             You are an expert career coach and resume analyzer. Analyze the provided resume against the job description and provide comprehensive feedback.
 
@@ -53,35 +120,41 @@ class ResumeAnalyzer:
 
 Please ensure your response is valid JSON format."""
 
-            response = self.model.generate_content(
+            response_text = self.backends["resume_analysis"].generate(
                 full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.3,
-                    max_output_tokens=2048,
-                )
-            )
-
-            # Clean and parse JSON response
-            response_text = response.text.strip()
-            # Remove any markdown code block formatting if present
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            result = json.loads(response_text.strip())
-            return result
+                call_type="resume_analysis",
+                **self.analysis_config,
+            ).strip()
+
+            return parse_json_response(response_text, ANALYSIS_SCHEMA, call_type="resume_analysis")
 
         except json.JSONDecodeError as e:
-            raise Exception(f"Failed to parse analysis results: {str(e)}")
+            raise Exception(f"Failed to parse analysis results: {str(e)}") from e
         except Exception as e:
-            raise Exception(f"Resume analysis failed: {str(e)}")
+            raise Exception(f"Resume analysis failed: {str(e)}") from e
 
+    @traced("resume_analyzer.suggest_keywords")
     def suggest_keywords(self, job_description):
         """
-        Extract key terms and skills from job description for ATS optimization
+        Extract key terms and skills from job description for ATS optimization.
+        Results are cached per job description so they can be reused across resumes.
         """
+        cache_key = self.cache.make_key(
+            None, job_description, self.backends["keywords"].identity,
+            f"{KEYWORDS_PROMPT_VERSION}/{self.prompt_builder.version}", self.keywords_config
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result, repaired = self._run_keyword_extraction(job_description)
+        if not repaired:
+            self.cache.set(cache_key, result)
+        return result
+
+    def _run_keyword_extraction(self, job_description):
         try:
+            job_description = self.prompt_builder.job_description(job_description, "keywords")
             prompt = f"""
             Extract the most important keywords, skills, and phrases from this job description that should be included in a resume for ATS optimization:
 
@@ -104,27 +177,18 @@ Please ensure your response is valid JSON format."""
 
 Please ensure your response is valid JSON format."""
 
-            response = self.model.generate_content(
+            response_text = self.backends["keywords"].generate(
                 full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.2,
-                    max_output_tokens=1024,
-                )
-            )
-
-            # Clean and parse JSON response
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            result = json.loads(response_text.strip())
-            return result
+                call_type="keywords",
+                **self.keywords_config,
+            ).strip()
+
+            return parse_json_response(response_text, KEYWORDS_SCHEMA, call_type="keywords")
 
         except Exception as e:
-            raise Exception(f"Keyword extraction failed: {str(e)}")
+            raise Exception(f"Keyword extraction failed: {str(e)}") from e
 
+    @traced("resume_analyzer.generate_improvement_suggestions")
     def generate_improvement_suggestions(self, resume_text, analysis_result):
         """
         Generate specific improvement suggestions based on analysis
@@ -157,23 +221,121 @@ Please ensure your response is valid JSON format."""
 
 Please ensure your response is valid JSON format."""
 
-            response = self.model.generate_content(
+            response_text = self.backends["improvements"].generate(
                 full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.3,
-                    max_output_tokens=1536,
-                )
-            )
-
-            # Clean and parse JSON response
-            response_text = response.text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            result = json.loads(response_text.strip())
+                call_type="improvements",
+                temperature=0.3,
+                max_output_tokens=1536,
+            ).strip()
+
+            result = extract_json(response_text, IMPROVEMENTS_SCHEMA, call_type="improvements")
             return result
 
         except Exception as e:
-            raise Exception(f"Failed to generate improvement suggestions: {str(e)}")
+            raise Exception(f"Failed to generate improvement suggestions: {str(e)}") from e
+
+    @traced("resume_analyzer.analyze_resume_bundle")
+    def analyze_resume_bundle(self, resume_text, job_description, reuse_keywords=False):
+        """
+        Produce alignment analysis, ATS keywords and prioritized improvements from a single prompt.
+
+        With reuse_keywords=True the job description keywords come from the cached
+        suggest_keywords result and are passed to the prompt instead of being
+        extracted again, which suits screening many resumes against one posting.
+        """
+        keywords = self.suggest_keywords(job_description) if reuse_keywords else None
+
+        cache_key = self.cache.make_key(
+            resume_text,
+            job_description,
+            self.backends["resume_bundle"].identity,
+            f"{BUNDLE_PROMPT_VERSION}{'-reuse' if reuse_keywords else ''}/{self.prompt_builder.version}",
+            self.bundle_config
+        )
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            cached, repaired = self._run_bundle(resume_text, job_description, keywords)
+            if not repaired:
+                self.cache.set(cache_key, cached)
+
+        result = dict(cached)
+        if keywords is not None:
+            result["keywords"] = keywords
+        return result
+
+    def _run_bundle(self, resume_text, job_description, keywords):
+        try:
+            resume_text = self.prompt_builder.resume(resume_text, "resume_bundle")
+            job_description = self.prompt_builder.job_description(job_description, "resume_bundle")
+            if keywords is None:
+                keywords_context = ""
+                keywords_schema = """
+                "keywords": {
+                    "technical_skills": ["<skill1>", "<skill2>", ...],
+                    "soft_skills": ["<skill1>", "<skill2>", ...],
+                    "tools_technologies": ["<tool1>", "<tool2>", ...],
+                    "certifications": ["<cert1>", "<cert2>", ...],
+                    "key_phrases": ["<phrase1>", "<phrase2>", ...]
+                },"""
+            else:
+                keywords_context = f"""
+            TARGET KEYWORDS (already extracted from the job description):
+            {json.dumps(keywords)}
+"""
+                keywords_schema = ""
+
+            prompt = f"""
+            Analyze the provided resume against the job description in a single pass.
+
+            RESUME:
+            {resume_text}
+
+            JOB DESCRIPTION:
+            {job_description}
+            {keywords_context}
+            Provide the complete result in the following JSON format:
+            {{
+                "alignment_score": <score from 1-10>,
+                "score_interpretation": "<brief explanation of the score>",
+                "gaps": ["<gap1>", "<gap2>", ...],
+                "suggestions": ["<suggestion1>", "<suggestion2>", ...],
+                "keywords_analysis": {{
+                    "missing_keywords": ["<keyword1>", "<keyword2>", ...],
+                    "present_keywords": ["<keyword1>", "<keyword2>", ...]
+                }},
+                "strengths": ["<strength1>", "<strength2>", ...],
+                "improvement_areas": ["<area1>", "<area2>", ...],{keywords_schema}
+                "improvements": {{
+                    "content_improvements": ["<suggestion1>", "<suggestion2>", ...],
+                    "formatting_suggestions": ["<suggestion1>", "<suggestion2>", ...],
+                    "keyword_integration": ["<suggestion1>", "<suggestion2>", ...],
+                    "achievement_enhancements": ["<suggestion1>", "<suggestion2>", ...],
+                    "priority_actions": ["<action1>", "<action2>", ...]
+                }}
+            }}
+
+            Analysis Guidelines:
+            1. alignment_score: Rate how well the resume matches the job requirements (1-10)
+            2. gaps and keywords_analysis: Base missing/present keywords on the job description{' and the target keywords' if keywords is not None else ''}
+            3. improvements: Derive from the gaps and missing keywords, ordering priority_actions from most to least impactful
+            4. Be specific, constructive, and actionable. Focus on ATS optimization and recruiter appeal.
+            """
+
+            full_prompt = f"""You are an expert career coach specializing in resume analysis, ATS optimization and resume writing. Provide detailed, actionable feedback to help candidates improve their job application success rate.
+
+{prompt}
+
+Please ensure your response is valid JSON format."""
+
+            response_text = self.backends["resume_bundle"].generate(
+                full_prompt,
+                call_type="resume_bundle",
+                **self.bundle_config,
+            ).strip()
+
+            return parse_json_response(response_text, BUNDLE_SCHEMA, call_type="resume_bundle")
+
+        except json.JSONDecodeError as e:
+            raise Exception(f"Failed to parse analysis results: {str(e)}") from e
+        except Exception as e:
+            raise Exception(f"Resume analysis failed: {str(e)}") from e
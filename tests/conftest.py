@@ -0,0 +1,21 @@
+import pytest
+
+import database.blob_store
+import database.models
+from database.service import DatabaseService
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """
+    DatabaseService on a fresh, fully migrated SQLite file
+    """
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'app.db'}")
+    monkeypatch.setenv("DB_AUTO_MIGRATE", "true")
+    monkeypatch.setenv("DB_WRITE_BEHIND", "false")
+    monkeypatch.setenv("BLOB_STORE_PATH", str(tmp_path / "blobs"))
+    monkeypatch.setattr(database.models, "_engine", None)
+    monkeypatch.setattr(database.blob_store, "_blob_store", None)
+    service = DatabaseService()
+    yield service
+    database.models.get_engine().dispose()
@@ -0,0 +1,58 @@
+import types
+
+import pytest
+
+import services.analysis_cache
+from services.analysis_cache import AnalysisCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(services.analysis_cache, "time", types.SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def make_cache(tmp_path, **options):
+    return AnalysisCache(path=str(tmp_path / "cache.db"), **options)
+
+
+def test_key_ignores_whitespace_but_not_inputs(tmp_path):
+    cache = make_cache(tmp_path)
+    key = cache.make_key("Python  developer\n", "Backend role", "gemini:flash", "3", {"temperature": 0.3})
+    assert key == cache.make_key("Python developer", " Backend role", "gemini:flash", "3", {"temperature": 0.3})
+    assert key != cache.make_key("Python developer", "Backend role", "gemini:flash", "4", {"temperature": 0.3})
+    assert key != cache.make_key("Python developer", "Backend role", "gemini:flash", "3", {"temperature": 0.7})
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.set("key", {"alignment_score": 8})
+    clock.now += 59
+    assert cache.get("key") == {"alignment_score": 8}
+    # Reading does not extend the lifetime
+    clock.now += 2
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.set("first", 1)
+    clock.now += 1
+    cache.set("second", 2)
+    clock.now += 1
+    assert cache.get("first") == 1
+    clock.now += 1
+    cache.set("third", 3)
+
+    assert cache.get("second") is None
+    assert (cache.get("first"), cache.get("third")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_entries_survive_a_new_instance(tmp_path):
+    make_cache(tmp_path).set("key", {"alignment_score": 8})
+    assert make_cache(tmp_path).get("key") == {"alignment_score": 8}
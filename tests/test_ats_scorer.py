@@ -0,0 +1,47 @@
+from services.ats_scorer import ATSScorer
+
+JOB_DESCRIPTION = """Senior Backend Engineer
+
+Requirements:
+- 5+ years of experience with Python and Django
+- Strong knowledge of PostgreSQL and Redis
+- Deploying services on Google Cloud with Kubernetes
+- Experience with Kubernetes operators and Terraform
+"""
+
+FULL_MATCH = """Backend engineer. Built Django services in Python on PostgreSQL with Redis caching.
+Ran Kubernetes clusters on Google Cloud, provisioned with Terraform."""
+PARTIAL_MATCH = "Python developer. Django web apps backed by MySQL."
+UNRELATED = "Pastry chef. Laminated doughs, sourdough starters and wedding cakes."
+
+
+def test_resumes_rank_by_weighted_keyword_coverage():
+    scorer = ATSScorer(JOB_DESCRIPTION)
+    full, partial, unrelated = scorer.score_many([FULL_MATCH, PARTIAL_MATCH, UNRELATED])
+    assert full["score"] > partial["score"] > unrelated["score"] == 0
+    assert full["score"] <= 10
+    assert {"Python", "Django"} <= set(partial["present_keywords"])
+    assert "PostgreSQL" in partial["missing_keywords"]
+
+
+def test_score_many_matches_scoring_one_at_a_time():
+    scorer = ATSScorer(JOB_DESCRIPTION)
+    resumes = [FULL_MATCH, PARTIAL_MATCH, UNRELATED]
+    assert scorer.score_many(resumes) == [scorer.score(resume) for resume in resumes]
+
+
+def test_posting_words_are_not_keywords_and_phrases_are():
+    scorer = ATSScorer(JOB_DESCRIPTION)
+    keywords = {keyword.lower() for keyword in scorer.keywords}
+    assert not keywords & {"experience", "knowledge", "strong", "requirements", "years"}
+    assert "google cloud" in keywords
+    assert "kubernetes" in keywords
+
+
+def test_slash_separated_skills_match_each_side():
+    scorer = ATSScorer(JOB_DESCRIPTION)
+    assert {"PostgreSQL", "Redis"} <= set(scorer.score("Databases: PostgreSQL/Redis")["present_keywords"])
+
+
+def test_empty_job_description_scores_zero():
+    assert ATSScorer("").score(FULL_MATCH)["score"] == 0
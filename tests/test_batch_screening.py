@@ -0,0 +1,94 @@
+import io
+import time
+import zipfile
+
+import pytest
+
+from services.batch_screening import BatchScreener, expand_uploads
+from services.llm_resilience import LLMStatusError
+
+RESUME = "Jane Doe\nExperience\nPython engineer building data pipelines with SQL and Airflow"
+JOB = "We need a Python engineer with SQL and Airflow experience"
+
+
+class StubParser:
+    def extract_text_from_pdf(self, data):
+        return RESUME
+
+
+class StubAnalyzer:
+    """
+    Fails every analysis with the given error, chained like ResumeAnalyzer does
+    """
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def suggest_keywords(self, job_description):
+        return {}
+
+    def analyze_resume_bundle(self, resume_text, job_description, reuse_keywords=False):
+        self.calls += 1
+        if self.error is None:
+            return {"alignment_score": 8}
+        try:
+            raise self.error
+        except Exception as e:
+            raise Exception(f"Resume analysis failed: {str(e)}") from e
+
+
+def screen(analyzer):
+    screener = BatchScreener(analyzer, pdf_parser=StubParser(), requests_per_minute=0, backoff_seconds=30)
+    return screener, list(screener.screen([("a.pdf", b"%PDF")], JOB))
+
+
+def test_successful_analysis():
+    _, results = screen(StubAnalyzer())
+    assert [(r["status"], r["alignment_score"]) for r in results] == [("ok", 8)]
+
+
+def test_rate_limited_analysis_is_not_retried_but_slows_the_batch():
+    analyzer = StubAnalyzer(LLMStatusError(429, "Resource exhausted"))
+    screener, results = screen(analyzer)
+    assert analyzer.calls == 1
+    assert results[0]["status"] == "error"
+    assert screener.rate_limiter._next_slot > time.monotonic() + 20
+
+
+def test_other_errors_do_not_slow_the_batch():
+    analyzer = StubAnalyzer(ValueError("Invalid quota field 429"))
+    screener, results = screen(analyzer)
+    assert analyzer.calls == 1 and results[0]["status"] == "error"
+    assert screener.rate_limiter._next_slot == 0.0
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_expand_uploads_unpacks_pdfs_from_archives():
+    archive = make_zip([("cvs/a.pdf", b"%PDF a"), ("notes.txt", b"x"), ("__MACOSX/._a.pdf", b"junk")])
+    pdfs = expand_uploads([("batch.zip", archive), ("b.pdf", b"%PDF b"), ("c.docx", b"x")])
+    assert pdfs == [("a.pdf", b"%PDF a"), ("b.pdf", b"%PDF b")]
+
+
+def test_expand_uploads_rejects_oversized_members_before_decompressing():
+    # Compresses to a few KB but expands to 10 MB
+    archive = make_zip([("bomb.pdf", b"\0" * 10_000_000)])
+    assert len(archive) < 100_000
+    with pytest.raises(Exception, match="bomb.pdf"):
+        expand_uploads([("batch.zip", archive)], max_member_bytes=1_000_000)
+
+
+def test_expand_uploads_limits_total_size_and_member_count():
+    archive = make_zip([(f"{n}.pdf", b"\0" * 1000) for n in range(5)])
+    with pytest.raises(Exception, match="uncompressed"):
+        expand_uploads([("batch.zip", archive)], max_total_bytes=4000)
+    with pytest.raises(Exception, match="at most 4"):
+        expand_uploads([("batch.zip", archive)], max_members=4)
+    assert len(expand_uploads([("batch.zip", archive)], max_members=5, max_total_bytes=5000)) == 5
@@ -0,0 +1,32 @@
+import pytest
+
+from database.blob_store import BlobStore
+from database.migrations import collect_orphan_blobs
+from database.models import get_engine
+
+
+def save_resume(db, pdf_content):
+    return db.save_resume_submission(
+        session_id="user-1", filename="cv.pdf", pdf_content=pdf_content, extracted_text="cv",
+        job_description="job", analysis_result={"alignment_score": 7}
+    )
+
+
+def test_sweep_deletes_blobs_of_rolled_back_saves(db):
+    kept = save_resume(db, b"%PDF kept")
+    with pytest.raises(Exception, match="rolled back"):
+        with db.unit_of_work():
+            save_resume(db, b"%PDF rolled back")
+            raise Exception("rolled back")
+    orphan = BlobStore.digest(b"%PDF rolled back")
+    assert db.blob_store.exists(orphan)
+
+    assert collect_orphan_blobs(get_engine(), db.blob_store, min_age_seconds=0) == {"checked": 2, "deleted": 1}
+    assert not db.blob_store.exists(orphan)
+    assert db.get_resume_pdf(kept) == b"%PDF kept"
+
+
+def test_sweep_leaves_recent_blobs_alone(db):
+    db.blob_store.put(b"%PDF save in flight")
+    assert collect_orphan_blobs(get_engine(), db.blob_store, min_age_seconds=3600) == {"checked": 0, "deleted": 0}
+    assert db.blob_store.exists(BlobStore.digest(b"%PDF save in flight"))
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+import database.models
+from database.models import CheckoutMetrics, connect, get_pool_metrics, session_scope
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    monkeypatch.setattr(database.models, "_engine", engine)
+    monkeypatch.setattr(database.models, "checkout_metrics", CheckoutMetrics())
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_and_timeouts_are_counted(engine):
+    with connect():
+        with pytest.raises(PoolTimeoutError):
+            connect()
+    with connect():
+        pass
+
+    metrics = get_pool_metrics()
+    assert metrics["pool_class"] == "QueuePool"
+    assert metrics["checkouts"] == 2
+    assert metrics["timeouts"] == 1
+    assert metrics["wait_time_max_seconds"] >= 0.05
+    assert metrics["checked_out"] == 0
+
+
+def test_connection_errors_are_not_pool_timeouts(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'pool.db'}")
+    monkeypatch.setattr(database.models, "_engine", engine)
+    monkeypatch.setattr(database.models, "checkout_metrics", CheckoutMetrics())
+    with pytest.raises(Exception):
+        connect()
+    assert get_pool_metrics()["timeouts"] == 0
+
+
+def test_session_scope_commits_and_returns_the_connection(engine):
+    with session_scope() as db:
+        db.execute(text("CREATE TABLE notes (body TEXT)"))
+        db.execute(text("INSERT INTO notes VALUES ('kept')"))
+    with pytest.raises(RuntimeError):
+        with session_scope() as db:
+            db.execute(text("INSERT INTO notes VALUES ('rolled back')"))
+            raise RuntimeError("boom")
+    with session_scope() as db:
+        assert db.execute(text("SELECT body FROM notes")).scalars().all() == ["kept"]
+    assert engine.pool.checkedout() == 0
@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+from services.interview_coach import InterviewCoach
+
+SETTINGS = ("Engineer", ["Technical"], "Technical Only")
+
+
+class GatedBackend:
+    """
+    Question backend that answers only once the test opens the gate
+    """
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.calls = 0
+
+    def generate(self, prompt, **kwargs):
+        self.calls += 1
+        call = self.calls
+        self.gate.wait(5)
+        return f"Model question {call}?"
+
+
+@pytest.fixture
+def coach(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    monkeypatch.setenv("QUESTION_DEADLINE_SECONDS", "0.5")
+    coach = InterviewCoach()
+    coach.backends["question"] = GatedBackend()
+    yield coach
+    coach.backends["question"].gate.set()
+
+
+def wait_for_late_question(coach):
+    deadline = time.monotonic() + 2
+    while not coach._late_questions and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_slow_model_falls_back_at_the_deadline(coach):
+    started = time.monotonic()
+    question = coach.generate_question(*SETTINGS, session_id="user-1")
+    assert time.monotonic() - started < 2
+    assert question in coach.question_types["Technical"] + coach.question_types["System Design"]
+    stats = coach.question_stats()
+    assert stats["sources"]["deadline_fallback"] == 1
+    assert stats["fallback_rate"] == 1.0
+
+
+def test_late_question_is_served_on_the_users_next_turn(coach):
+    coach.generate_question(*SETTINGS, session_id="user-1")
+    coach.backends["question"].gate.set()
+    wait_for_late_question(coach)
+
+    # Kept for the same user and settings only
+    assert coach.generate_question("Engineer", ["Behavioral"], "Behavioral Only", session_id="user-1") == "Model question 2?"
+    assert coach.generate_question(*SETTINGS, session_id="user-2") == "Model question 3?"
+    assert coach.generate_question(*SETTINGS, session_id="user-1") == "Model question 1?"
+    assert coach.question_stats()["sources"]["late"] == 1
+    assert not coach._late_questions
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from services.json_extractor import (
+    IncrementalJSONExtractor, JSONExtractionError, JSONSchema, extract_json, parse_json_response, repair_json
+)
+
+SCHEMA = JSONSchema(required={"score": float}, optional={"gaps": list, "summary": str})
+
+
+def repaired(fragment):
+    text = repair_json(fragment)
+    return None if text is None else json.loads(text)
+
+
+def test_complete_object_is_returned_as_is():
+    assert repaired('{"score": 7, "gaps": ["a"]} trailing prose') == {"score": 7, "gaps": ["a"]}
+
+
+def test_truncated_string_value_is_dropped_with_its_key():
+    assert repaired('{"score": 7, "summary": "Strong backend exper') == {"score": 7}
+
+
+def test_truncated_string_in_array_drops_only_that_element():
+    assert repaired('{"score": 7, "gaps": ["No Kubernetes", "Limited lead') == {"score": 7, "gaps": ["No Kubernetes"]}
+
+
+def test_truncated_key_is_dropped():
+    assert repaired('{"score": 7, "gap') == {"score": 7}
+
+
+def test_string_ending_in_escape_is_dropped():
+    assert repaired('{"score": 7, "summary": "says \\') == {"score": 7}
+
+
+def test_nested_containers_are_closed():
+    fragment = '{"score": 7, "keywords": {"present": ["python", "sql"], "missing": ["go", '
+    assert repaired(fragment) == {"score": 7, "keywords": {"present": ["python", "sql"], "missing": ["go"]}}
+
+
+def test_number_touching_the_end_is_dropped():
+    assert repaired('{"gaps": [], "score": 1') == {"gaps": []}
+
+
+def test_trailing_commas_are_removed():
+    assert repaired('{"score": 7, "gaps": ["a", "b",], }') == {"score": 7, "gaps": ["a", "b"]}
+
+
+@pytest.mark.parametrize("fragment", ['{"summary": "only a partial str', '{"score": ', '{', '{"a" 1}'])
+def test_unrepairable_input_returns_none(fragment):
+    assert repair_json(fragment) is None
+
+
+def test_parse_json_response_flags_repairs():
+    assert parse_json_response('```json\n{"score": "8/10"}\n```', SCHEMA) == ({"score": 8}, False)
+    assert parse_json_response('{"score": 8, "gaps": ["a", "b', SCHEMA) == ({"score": 8, "gaps": ["a"]}, True)
+
+
+def test_extract_json_skips_objects_without_schema_fields():
+    text = 'Use {"braces": true} like this. {"score": 6, "gaps": ["x"]}'
+    assert extract_json(text, SCHEMA) == {"score": 6, "gaps": ["x"]}
+
+
+def test_extract_json_raises_when_nothing_is_recoverable():
+    with pytest.raises(JSONExtractionError):
+        extract_json('{"summary": "cut off', SCHEMA)
+
+
+def test_incremental_extractor_reports_fields_as_they_complete():
+    extractor = IncrementalJSONExtractor(SCHEMA)
+    assert extractor.feed('Here you go: {"sco') == {}
+    assert extractor.feed('re": 1') == {}
+    assert extractor.feed('0, "summary": "Good') == {"score": 10, "summary": "Good"}
+    assert extractor.feed(' fit", "gaps": ["a"') == {"score": 10, "summary": "Good fit"}
+    assert extractor.feed(']}') == {"score": 10, "summary": "Good fit", "gaps": ["a"]}
+    assert extractor.result() == {"score": 10, "summary": "Good fit", "gaps": ["a"]}
+
+
+def test_incremental_extractor_ignores_chunks_after_the_object():
+    extractor = IncrementalJSONExtractor()
+    extractor.feed('{"a": 1}')
+    assert extractor.feed(' {"b": 2}') == {"a": 1}
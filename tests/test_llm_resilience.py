@@ -0,0 +1,179 @@
+import threading
+import time
+
+import pytest
+
+import services.llm_resilience
+from services.llm_resilience import (
+    CircuitBreaker, CircuitOpenError, LLMStatusError, LLMTimeoutError, ResilientBackend, get_llm_metrics,
+    is_retryable
+)
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("test", failure_threshold=2, reset_seconds=0.05)
+
+
+def open_circuit(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.snapshot() == {"state": "open", "consecutive_failures": 2, "times_opened": 1}
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_the_failure_count(breaker):
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_lets_one_trial_through(breaker):
+    open_circuit(breaker)
+    time.sleep(0.06)
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_trial_reopens(breaker):
+    open_circuit(breaker)
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_release_frees_the_trial_without_closing(breaker):
+    open_circuit(breaker)
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.release()
+    assert breaker.state == "half_open"
+    breaker.before_call()
+
+
+@pytest.mark.parametrize("error, expected", [
+    (LLMTimeoutError("slow"), True),
+    (TimeoutError(), True),
+    (ConnectionResetError(), True),
+    (LLMStatusError(429, "Resource exhausted"), True),
+    (LLMStatusError(503, "Unavailable"), True),
+    (LLMStatusError(400, "Bad request"), False),
+    # Messages are not inspected: a 429 in the text of a plain error is not a rate limit
+    (Exception("Invalid value 429 in field 'internal_timeout'"), False),
+    (ValueError("Response blocked by safety filters"), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_google_api_errors_are_classified_by_status():
+    exceptions = pytest.importorskip("google.api_core.exceptions")
+    assert is_retryable(exceptions.ResourceExhausted("quota"))
+    assert is_retryable(exceptions.ServiceUnavailable("down"))
+    assert is_retryable(exceptions.DeadlineExceeded("slow"))
+    assert not is_retryable(exceptions.InvalidArgument("bad prompt"))
+    assert not is_retryable(exceptions.PermissionDenied("bad key"))
+
+
+def test_openai_errors_are_classified_by_status():
+    openai = pytest.importorskip("openai")
+    httpx = pytest.importorskip("httpx")
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+    def status_error(cls, status):
+        return cls("error", response=httpx.Response(status, request=request), body=None)
+
+    assert is_retryable(status_error(openai.RateLimitError, 429))
+    assert is_retryable(status_error(openai.InternalServerError, 503))
+    assert is_retryable(openai.APITimeoutError(request=request))
+    assert is_retryable(openai.APIConnectionError(request=request))
+    assert not is_retryable(status_error(openai.BadRequestError, 400))
+    assert not is_retryable(status_error(openai.AuthenticationError, 401))
+
+
+class FailingBackend:
+    provider = "stub"
+    model_name = "stub-model"
+    identity = "stub:stub-model"
+
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def generate(self, prompt, temperature, max_output_tokens, call_type):
+        self.calls += 1
+        raise self.error
+
+
+def test_non_retryable_error_does_not_reset_the_breaker(breaker):
+    breaker.before_call()
+    breaker.record_failure()
+    backend = FailingBackend(ValueError("bad request"))
+    with pytest.raises(ValueError):
+        ResilientBackend(backend, breaker=breaker, max_attempts=3).generate("prompt")
+    assert backend.calls == 1
+    assert breaker.consecutive_failures == 1
+
+
+def test_retryable_error_is_retried_and_opens_the_breaker(breaker):
+    backend = FailingBackend(LLMStatusError(503, "Unavailable"))
+    with pytest.raises(LLMStatusError):
+        ResilientBackend(backend, breaker=breaker, max_attempts=2, backoff_base=0).generate("prompt")
+    assert backend.calls == 2
+    assert breaker.state == "open"
+
+
+class HungBackend(FailingBackend):
+    def __init__(self):
+        super().__init__(None)
+        self.release = threading.Event()
+
+    def generate(self, prompt, temperature, max_output_tokens, call_type):
+        self.calls += 1
+        self.release.wait(5)
+        return "late"
+
+
+def test_abandoned_calls_short_circuit_new_ones(monkeypatch):
+    monkeypatch.setattr(services.llm_resilience, "_max_abandoned", 1)
+    backend = HungBackend()
+    breaker = CircuitBreaker("hung", failure_threshold=5)
+    resilient = ResilientBackend(backend, breaker=breaker, timeout_seconds=0.05, max_attempts=1)
+    assert backend.request_timeout == 0.05
+
+    with pytest.raises(LLMTimeoutError, match="timed out"):
+        resilient.generate("prompt")
+    assert get_llm_metrics()["abandoned_calls"] == 1
+    with pytest.raises(LLMTimeoutError, match="still running"):
+        resilient.generate("prompt")
+    assert backend.calls == 1
+
+    backend.release.set()
+    deadline = time.monotonic() + 2
+    while get_llm_metrics()["abandoned_calls"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert get_llm_metrics()["abandoned_calls"] == 0
+    assert resilient.generate("prompt") == "late"
@@ -0,0 +1,110 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+import database.blob_store
+import database.models
+from database.migrations import HEAD_REVISION, MIGRATIONS, applied_revisions, upgrade
+from database.service import DatabaseService
+
+# The tables as the original create_all() built them, before any migration existed
+BASELINE_SCHEMA = [
+    "CREATE TABLE resume_submissions (id INTEGER PRIMARY KEY, session_id VARCHAR, filename VARCHAR, "
+    "pdf_content BLOB, extracted_text TEXT, job_description TEXT, analysis_result JSON, "
+    "alignment_score FLOAT, created_at DATETIME)",
+    "CREATE TABLE interview_sessions (id INTEGER PRIMARY KEY, session_id VARCHAR, job_role VARCHAR, "
+    "focus_areas JSON, interview_type VARCHAR, total_questions INTEGER, average_score FLOAT, "
+    "created_at DATETIME, completed_at DATETIME)",
+    "CREATE TABLE interview_questions (id INTEGER PRIMARY KEY, session_id VARCHAR, interview_session_id INTEGER, "
+    "question_text TEXT, answer_text TEXT, feedback JSON, score FLOAT, question_order INTEGER, created_at DATETIME)",
+]
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.setenv("DB_WRITE_BEHIND", "false")
+    monkeypatch.setenv("BLOB_STORE_PATH", str(tmp_path / "blobs"))
+    monkeypatch.delenv("DB_AUTO_MIGRATE", raising=False)
+    monkeypatch.setattr(database.models, "_engine", None)
+    monkeypatch.setattr(database.blob_store, "_blob_store", None)
+    yield url
+    if database.models._engine is not None:
+        database.models._engine.dispose()
+
+
+@pytest.fixture
+def baseline_url(database_url):
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text(
+            "INSERT INTO interview_sessions (id, session_id, job_role) VALUES (1, 'user-1', 'Engineer')"
+        ))
+        conn.execute(text(
+            "INSERT INTO interview_questions (session_id, interview_session_id, question_text, question_order) "
+            "VALUES ('user-1', 1, 'Q1', 1)"
+        ))
+    engine.dispose()
+    return database_url
+
+
+def test_upgrade_brings_a_baseline_database_to_head(baseline_url):
+    engine = database.models.get_engine()
+    assert upgrade(engine) == [revision for revision, _ in MIGRATIONS]
+    assert applied_revisions(engine)[-1] == HEAD_REVISION
+    assert upgrade(engine) == []
+
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("resume_submissions")}
+    assert {"pdf_sha256", "pdf_size"} <= columns
+    indexes = {index["name"] for index in inspector.get_indexes("interview_questions")}
+    assert "ix_interview_questions_interview_session_id_question_order" in indexes
+    assert inspector.has_table("question_bank")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT question_text FROM interview_questions")).scalar() == "Q1"
+
+
+def test_default_migrates_an_unmanaged_database(baseline_url):
+    service = DatabaseService()
+    assert applied_revisions(database.models.get_engine())[-1] == HEAD_REVISION
+    assert service.get_session_statistics("user-1")["total_questions"] == 1
+
+
+def test_default_refuses_a_managed_database_with_pending_revisions(database_url):
+    engine = database.models.get_engine()
+    upgrade(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM schema_migrations WHERE revision = :revision"), {"revision": HEAD_REVISION})
+    with pytest.raises(Exception, match="python -m database.migrations upgrade"):
+        DatabaseService()
+
+
+def test_sqlite_enforces_cascading_deletes(db):
+    interview_id = db.save_interview_session("user-1", "Engineer", ["Technical"], "Mixed")
+    db.save_interview_question("user-1", interview_id, "Q1", "answer", {}, 7, 1)
+    with database.models.get_engine().begin() as conn:
+        conn.execute(text("DELETE FROM interview_sessions WHERE id = :id"), {"id": interview_id})
+        assert conn.execute(text("SELECT COUNT(*) FROM interview_questions")).scalar() == 0
+
+
+def test_upgrade_moves_pdf_bytes_into_the_blob_store(baseline_url):
+    engine = database.models.get_engine()
+    with engine.begin() as conn:
+        for filename, pdf in [("a.pdf", b"%PDF a"), ("b.pdf", b"%PDF b"), ("copy.pdf", b"%PDF a")]:
+            conn.execute(
+                text("INSERT INTO resume_submissions (session_id, filename, pdf_content) VALUES ('user-1', :f, :pdf)"),
+                {"f": filename, "pdf": pdf}
+            )
+
+    upgrade(engine, batch_size=2, drop_legacy_column=True)
+
+    service = DatabaseService()
+    assert "pdf_content" not in {column["name"] for column in inspect(engine).get_columns("resume_submissions")}
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, filename, pdf_sha256, pdf_size FROM resume_submissions ORDER BY id")).all()
+    assert [service.get_resume_pdf(row.id) for row in rows] == [b"%PDF a", b"%PDF b", b"%PDF a"]
+    assert rows[0].pdf_sha256 == rows[2].pdf_sha256 != rows[1].pdf_sha256
+    assert [row.pdf_size for row in rows] == [6, 6, 6]
+    assert sorted(sha256 for sha256, _ in service.blob_store.iter_blobs()) == sorted({row.pdf_sha256 for row in rows})
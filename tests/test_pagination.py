@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from database.models import ResumeSubmission, session_scope
+
+NOON = datetime(2024, 5, 1, 12, 0, 0)
+ONE = datetime(2024, 5, 1, 13, 0, 0)
+
+
+def save_resume(db, created_at, session_id="user-1"):
+    submission_id = db.save_resume_submission(
+        session_id=session_id, filename="cv.pdf", pdf_content=b"%PDF cv", extracted_text="cv",
+        job_description="job", analysis_result={"alignment_score": 7}
+    )
+    # Through the ORM so the timestamp is stored in the format the cursor is compared in
+    with session_scope() as session:
+        session.execute(update(ResumeSubmission).where(ResumeSubmission.id == submission_id).values(created_at=created_at))
+    return submission_id
+
+
+def all_pages(db, limit, session_id="user-1"):
+    pages, cursor = [], None
+    for _ in range(10):
+        page = db.list_resume_submissions(session_id, limit=limit, cursor=cursor)
+        pages.append([item.id for item in page.items])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+    raise AssertionError(f"pagination did not finish: {pages}")
+
+
+def test_ties_on_created_at_are_split_across_pages_without_gaps(db):
+    tied = [save_resume(db, NOON) for _ in range(3)]
+    newer = save_resume(db, ONE)
+    save_resume(db, ONE, session_id="user-2")
+
+    # Newest first, ties broken by id descending
+    assert all_pages(db, limit=2) == [[newer, tied[2]], [tied[1], tied[0]]]
+    assert all_pages(db, limit=1) == [[newer], [tied[2]], [tied[1]], [tied[0]]]
+
+
+def test_last_page_has_no_cursor(db):
+    ids = [save_resume(db, NOON) for _ in range(4)]
+    first = db.list_resume_submissions("user-1", limit=4)
+    assert [item.id for item in first.items] == ids[::-1]
+    assert first.next_cursor is None
+
+    assert db.list_resume_submissions("nobody", limit=4).items == []
+    assert db.list_resume_submissions("nobody", limit=4).next_cursor is None
+
+
+def test_invalid_cursor_is_rejected(db):
+    with pytest.raises(Exception, match="Invalid page cursor"):
+        db.list_resume_submissions("user-1", cursor="not-a-cursor")
@@ -0,0 +1,96 @@
+import os
+import threading
+import time
+
+import pytest
+
+from utils.pdf_engine import PAGE_BREAK, PDFExtractionEngine
+
+
+def make_pdf(page_texts):
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = "BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text
+        objects.append("<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append("%d 0 R" % len(objects))
+    objects[1] = "<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(kids), len(kids))
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body.encode())
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return out
+
+
+def slow_echo(value, seconds):
+    time.sleep(seconds)
+    return value
+
+
+@pytest.fixture
+def engine():
+    engine = PDFExtractionEngine(max_workers=2, pages_per_chunk=2, timeout_seconds=10)
+    yield engine
+    engine.shutdown()
+
+
+def test_extracts_pages_in_order(engine):
+    result = engine.extract(make_pdf(["First page", "Second page", "Third page"]))
+    assert result["text"] == PAGE_BREAK.join(["First page", "Second page", "Third page"])
+    assert [page["status"] for page in result["pages"]] == ["ok", "ok", "ok"]
+    assert not result["timed_out"] and not result["truncated"]
+
+
+def test_unreadable_document_raises(engine):
+    with pytest.raises(Exception, match="PDF"):
+        engine.extract(b"not a pdf")
+    # The worker survived the error and is reused
+    assert len(engine._idle) == 1
+
+
+def test_timeout_only_kills_the_late_task(engine):
+    results = {}
+
+    def run(name, args, timeout):
+        try:
+            results[name] = engine._run(slow_echo, args, time.monotonic() + timeout)
+        except TimeoutError:
+            results[name] = "timeout"
+
+    threads = [
+        threading.Thread(target=run, args=("stuck", ("stuck", 30), 1.0)),
+        threading.Thread(target=run, args=("other", ("other", 2), 10)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {"stuck": "timeout", "other": "other"}
+
+
+def test_dead_worker_is_replaced(engine):
+    with pytest.raises(ChildProcessError):
+        engine._run(os._exit, (1,), time.monotonic() + 10)
+    assert engine._run(slow_echo, ("ok", 0), time.monotonic() + 10) == "ok"
+
+
+def test_failed_range_only_costs_its_own_pages(engine, monkeypatch):
+    run = engine._run
+
+    def failing_second_range(function, args, deadline):
+        if function.__name__ == "_extract_page_range" and args[1] == 2:
+            raise RuntimeError("dispatcher failed")
+        return run(function, args, deadline)
+
+    monkeypatch.setattr(engine, "_run", failing_second_range)
+    result = engine.extract(make_pdf(["One", "Two", "Three", "Four"]))
+    assert [page["status"] for page in result["pages"]] == ["ok", "ok", "error", "error"]
+    assert result["pages"][2]["error"] == "dispatcher failed"
+    assert result["text"] == PAGE_BREAK.join(["One", "Two"])
+    assert result["pages_processed"] == 2
@@ -0,0 +1,57 @@
+from utils.pdf_parser import PDFParser
+
+RESUME = "Jane Doe\njane@example.com\n\nExperience\nSoftware Engineer, Acme Corp\n\nSkills\nPython, SQL"
+
+
+class StubEngine:
+    """
+    Returns canned extraction results and counts calls
+    """
+
+    def __init__(self, statuses, timed_out=False, truncated=False):
+        self.statuses = statuses
+        self.timed_out = timed_out
+        self.truncated = truncated
+        self.calls = 0
+
+    def extract(self, pdf_bytes):
+        self.calls += 1
+        pages = [
+            {"page": n, "status": status, "text": RESUME if status == "ok" else "", "chars": 0, "error": None}
+            for n, status in enumerate(self.statuses, start=1)
+        ]
+        return {
+            "text": RESUME, "pages": pages, "page_count": len(pages), "pages_processed": len(pages),
+            "truncated": self.truncated, "timed_out": self.timed_out, "elapsed_seconds": 0.0,
+        }
+
+
+def parse_twice(engine):
+    parser = PDFParser(engine=engine)
+    first = parser.parse(b"%PDF-1.4 resume")
+    second = parser.parse(b"%PDF-1.4 resume")
+    return first, second
+
+
+def test_complete_extraction_is_cached():
+    engine = StubEngine(["ok", "empty"])
+    first, second = parse_twice(engine)
+    assert engine.calls == 1 and first is second
+
+
+def test_truncated_extraction_is_cached():
+    engine = StubEngine(["ok"], truncated=True)
+    parse_twice(engine)
+    assert engine.calls == 1
+
+
+def test_timed_out_extraction_is_not_cached():
+    engine = StubEngine(["ok", "timeout"], timed_out=True)
+    parse_twice(engine)
+    assert engine.calls == 2
+
+
+def test_extraction_with_failed_page_is_not_cached():
+    engine = StubEngine(["ok", "error"])
+    parse_twice(engine)
+    assert engine.calls == 2
@@ -0,0 +1,98 @@
+from services.prompt_builder import PAGE_NUMBER_PATTERN, PromptBuilder, strip_boilerplate, strip_page_furniture, truncate_sections
+from utils.pdf_engine import PAGE_BREAK
+
+
+def pdf_text(*pages):
+    return PAGE_BREAK.join(pages)
+
+
+def test_page_number_pattern_matches_only_page_numbers():
+    for line in ["Page 2", "page 2 of 5", "Page 2/5", "2 of 5", "- 2 -", " — 3 — "]:
+        assert PAGE_NUMBER_PATTERN.match(line), line
+    for line in ["2019", "2015 - 2017", "05/2019", "3", "Page", "Led 2 of 5 teams"]:
+        assert not PAGE_NUMBER_PATTERN.match(line), line
+
+
+def test_text_without_page_breaks_is_unchanged():
+    text = "Jane Doe\nSoftware Engineer\n\n2019\nPage 1\n\nSoftware Engineer\n2017"
+    assert strip_page_furniture(text) == text
+
+
+def test_drops_running_header_footer_and_page_numbers():
+    text = pdf_text(
+        "Jane Doe - Resume\nSummary\nBuilds things\njane@example.com\nPage 1 of 2",
+        "Jane Doe - Resume\nExperience\nAcme Corp\njane@example.com\nPage 2 of 2",
+    )
+    result = strip_page_furniture(text)
+    assert result.count("Jane Doe - Resume") == 1
+    assert result.count("jane@example.com") == 1
+    assert "Page" not in result
+    assert "Acme Corp" in result and "Builds things" in result
+
+
+def test_dates_and_repeated_titles_survive():
+    text = pdf_text(
+        "Jane Doe\nExperience\nSoftware Engineer\nAcme Corp\n2019\nSoftware Engineer\nGlobex\n2017",
+        "Software Engineer\nInitech\n2015\nEducation\nBSc Computer Science\n2013",
+    )
+    result = strip_page_furniture(text)
+    for year in ("2019", "2017", "2015", "2013"):
+        assert year in result.split("\n")
+    assert result.count("Software Engineer") == 3
+
+
+def test_footer_missing_from_one_page_is_kept():
+    text = pdf_text("Summary\nBuilds things\nConfidential", "Experience\nAcme Corp", "Skills\nPython\nConfidential")
+    assert strip_page_furniture(text).count("Confidential") == 2
+
+
+def test_truncate_sections_keeps_priority_sections_in_document_order():
+    sections = [
+        {"name": "header", "heading": "", "lines": ["Jane Doe"]},
+        {"name": "interests", "heading": "Interests", "lines": ["Chess " * 20]},
+        {"name": "experience", "heading": "Experience", "lines": ["Acme Corp", "Globex"]},
+    ]
+    result = truncate_sections(sections, ["header", "experience", "interests"], budget=16)
+    assert result == "Jane Doe\n\nExperience\nAcme Corp\nGlobex"
+
+
+def test_truncate_sections_notes_omitted_lines():
+    sections = [{"name": "experience", "heading": "Experience", "lines": ["Acme Corp " * 3, "Globex " * 10, "Initech"]}]
+    result = truncate_sections(sections, ["experience"], budget=15)
+    assert result.splitlines() == ["Experience", "Acme Corp " * 3, "[2 more lines omitted]"]
+
+
+PRIVACY_ROLE = """Privacy Compliance Analyst
+
+Requirements:
+- Maintain our privacy policy and data retention schedule
+- Review HR systems that store gender identity and veteran status fields
+- Confirm vendors process data without regard to region-specific shortcuts
+
+We are an equal opportunity employer. All qualified applicants will receive
+consideration for employment without regard to race, religion, sexual
+orientation, gender identity or national origin.
+
+We do not accept unsolicited resumes from recruitment agencies."""
+
+
+def test_strip_boilerplate_drops_whole_notice_paragraphs():
+    stripped = strip_boilerplate(PRIVACY_ROLE)
+    assert "equal opportunity" not in stripped
+    assert "orientation, gender identity" not in stripped
+    assert "recruitment agencies" not in stripped
+
+
+def test_strip_boilerplate_keeps_requirement_lines_that_mention_boilerplate_phrases():
+    stripped = strip_boilerplate(PRIVACY_ROLE)
+    assert "- Maintain our privacy policy and data retention schedule" in stripped
+    assert "- Review HR systems that store gender identity and veteran status fields" in stripped
+    assert "- Confirm vendors process data without regard to region-specific shortcuts" in stripped
+    single = "Experience auditing a privacy policy against GDPR."
+    assert strip_boilerplate(single) == single
+
+
+def test_version_changes_with_the_budgets():
+    assert PromptBuilder(3000, 1500, 1000).version == PromptBuilder(3000, 1500, 1000).version
+    assert PromptBuilder(3000, 1500, 1000).version != PromptBuilder(2000, 1500, 1000).version
+    assert PromptBuilder(3000, 1500, 1000).version != PromptBuilder(3000, 800, 1000).version
@@ -0,0 +1,89 @@
+import pytest
+
+from services.interview_coach import InterviewCoach
+from services.question_bank import QuestionBank
+from services.question_prefetcher import QuestionPrefetcher
+
+QUESTIONS = [
+    "Tell me about a time you handled a production outage.",
+    "How would you design a rate limiter for a public API?",
+    "Describe how you review pull requests from junior engineers.",
+]
+
+
+def unseen(db, session_id):
+    return [entry.question_text for entry in db.get_fresh_bank_questions(session_id, "engineer", "Technical")]
+
+
+@pytest.fixture
+def bank(db):
+    return QuestionBank(db_service=db, min_fresh=1)
+
+
+def test_near_duplicates_are_collapsed(bank):
+    first = bank.add("Senior Backend Engineer", "Behavioral", QUESTIONS[0])
+    reworded = bank.add("Backend Engineer II", "Behavioral", "Tell me about a time when you handled production outages?")
+    other = bank.add("Backend Engineer", "Behavioral", QUESTIONS[1])
+    assert first == reworded != other
+    assert bank.stats()["duplicates"] == 1
+
+
+def test_exact_rewording_outside_dedup_window_is_collapsed(db):
+    bank = QuestionBank(db_service=db, dedup_window=1)
+    first = bank.add("Engineer", "Technical", QUESTIONS[0])
+    bank.add("Engineer", "Technical", QUESTIONS[1])
+    assert bank.add("Engineer", "Technical", "Tell me about a time you handled a production outage!") == first
+    assert len(db.get_bank_questions("engineer", "Technical")) == 2
+
+
+def test_insert_or_ignore_is_idempotent(db):
+    first = db.save_bank_question("engineer", "Technical", QUESTIONS[0], "f" * 64)
+    assert db.save_bank_question("engineer", "Technical", QUESTIONS[0], "f" * 64) == first
+    assert db.save_bank_question_served("user-1", first)
+    assert db.save_bank_question_served("user-1", first)
+    assert not db.save_bank_question_served("user-1", first + 100)
+    assert db.get_fresh_bank_questions("user-1", "engineer", "Technical") == []
+    assert db.get_bank_questions("engineer", "Technical")[0].times_served == 2
+
+
+def test_questions_are_never_repeated_for_a_user(bank):
+    for question in QUESTIONS:
+        bank.add("Engineer", "Technical", question)
+
+    served = []
+    for _ in QUESTIONS:
+        entry, _ = bank.take("user-1", "Engineer", "Technical")
+        served.append(entry.question_text)
+    assert sorted(served) == sorted(QUESTIONS)
+    assert bank.take("user-1", "Engineer", "Technical") == (None, 0)
+
+    entry, fresh_left = bank.take("user-2", "Engineer", "Technical")
+    assert entry is not None and fresh_left == 2
+
+
+def test_take_without_marking_served(bank):
+    bank.add("Engineer", "Technical", QUESTIONS[0])
+    entry, _ = bank.take("user-1", "Engineer", "Technical", mark_served=False)
+    assert bank.take("user-1", "Engineer", "Technical", mark_served=False)[0].id == entry.id
+    assert bank.mark_served("user-1", entry.id)
+    assert bank.take("user-1", "Engineer", "Technical") == (None, 0)
+
+
+def test_prefetched_question_is_served_at_handover(db, monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    monkeypatch.setenv("LLM_FAKE_LATENCY_SECONDS", "0")
+    # min_fresh=0 keeps the coach from topping the bank up behind the test's back
+    bank = QuestionBank(db_service=db, min_fresh=0)
+    bank.add("Engineer", "Technical", QUESTIONS[1])
+    prefetcher = QuestionPrefetcher(InterviewCoach(question_bank=bank))
+    settings = ("Engineer", ["Technical"], "Technical Only")
+
+    # A discarded prefetch leaves the question unseen
+    prefetcher.prefetch("user-1", *settings)
+    prefetcher._pending[("user-1", "Engineer", ("Technical",), "Technical Only")].result()
+    prefetcher.cancel("user-1")
+    assert QUESTIONS[1] in unseen(db, "user-1")
+
+    prefetcher.prefetch("user-1", *settings)
+    assert prefetcher.take("user-1", *settings) == QUESTIONS[1]
+    assert QUESTIONS[1] not in unseen(db, "user-1")
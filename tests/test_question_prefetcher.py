@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+from services.interview_coach import InterviewCoach
+from services.question_prefetcher import QuestionPrefetcher
+
+SETTINGS = ("Engineer", ["Technical"], "Technical Only")
+MODEL_QUESTION = "How would you shard a write-heavy table?"
+
+
+class GatedBackend:
+    """
+    Question backend that answers only once the test opens the gate
+    """
+
+    def __init__(self):
+        self.gate = threading.Event()
+
+    def generate(self, prompt, **kwargs):
+        self.gate.wait(5)
+        return MODEL_QUESTION
+
+
+@pytest.fixture
+def coach(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    monkeypatch.setenv("QUESTION_DEADLINE_SECONDS", "0.5")
+    coach = InterviewCoach()
+    coach.backends["question"] = GatedBackend()
+    yield coach
+    coach.backends["question"].gate.set()
+
+
+def test_prefetch_past_the_deadline_is_a_miss_and_is_kept_for_the_next_turn(coach):
+    prefetcher = QuestionPrefetcher(coach)
+    prefetcher.prefetch("user-1", *SETTINGS)
+
+    fallback = prefetcher.take("user-1", *SETTINGS)
+    assert fallback != MODEL_QUESTION
+    assert fallback in coach.question_types["Technical"] + coach.question_types["System Design"]
+    stats = prefetcher.stats()
+    assert (stats["hits"], stats["misses"], stats["late"], stats["in_flight"]) == (0, 1, 1, 1)
+
+    coach.backends["question"].gate.set()
+    assert prefetcher.take("user-1", *SETTINGS) == MODEL_QUESTION
+    stats = prefetcher.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_nothing_prefetched_is_a_miss(coach):
+    prefetcher = QuestionPrefetcher(coach)
+    assert prefetcher.take("user-1", *SETTINGS) is None
+    assert prefetcher.stats()["misses"] == 1
@@ -0,0 +1,63 @@
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from database.models import session_scope
+
+EMPTY = {"resume_submissions": 0, "interview_sessions": 0, "total_questions": 0, "average_score": 0}
+
+
+def save_resume(db, session_id="user-1"):
+    return db.save_resume_submission(
+        session_id=session_id, filename="cv.pdf", pdf_content=b"%PDF cv", extracted_text="cv",
+        job_description="job", analysis_result={"alignment_score": 7}
+    )
+
+
+def save_interview(db, scores, session_id="user-1"):
+    interview_id = db.save_interview_session(session_id, "Engineer", ["Technical"], "Mixed")
+    for order, score in enumerate(scores, start=1):
+        db.save_interview_question(session_id, interview_id, f"Q{order}", "answer", {}, score, order)
+    return interview_id
+
+
+def test_aggregates_one_session(db):
+    save_resume(db)
+    save_resume(db)
+    save_interview(db, [6, 9])
+    save_resume(db, session_id="user-2")
+    assert db.get_session_statistics("user-1") == {
+        "resume_submissions": 2, "interview_sessions": 1, "total_questions": 2, "average_score": 7.5
+    }
+    assert db.get_session_statistics("nobody") == EMPTY
+
+
+def test_saves_invalidate_the_cache(db):
+    assert db.get_session_statistics("user-1") == EMPTY
+    # Written behind the service's back: the cached result is still served
+    with session_scope() as session:
+        session.execute(text("INSERT INTO resume_submissions (session_id, filename) VALUES ('user-1', 'x.pdf')"))
+    assert db.get_session_statistics("user-1") == EMPTY
+
+    version = db.get_data_version("user-1")
+    save_resume(db)
+    assert db.get_data_version("user-1") == version + 1
+    assert db.get_session_statistics("user-1")["resume_submissions"] == 2
+
+
+def test_result_computed_during_a_save_is_not_cached(db):
+    original = db._session
+
+    @contextmanager
+    def racing_session():
+        with original() as session:
+            yield session
+        # A save commits and invalidates after the aggregate query has read the old rows
+        db._invalidate_statistics("user-1")
+
+    db._session = racing_session
+    try:
+        db.get_session_statistics("user-1")
+    finally:
+        del db._session
+    assert "user-1" not in db._stats_cache
@@ -0,0 +1,65 @@
+import threading
+from contextlib import nullcontext
+
+import pytest
+
+from database.write_behind import WriteBehindQueue
+
+
+class RecordingService:
+    """
+    Stands in for DatabaseService: records writes, no database involved
+    """
+
+    def __init__(self):
+        self.written = []
+        self.lock = threading.Lock()
+
+    def unit_of_work(self):
+        return nullcontext()
+
+    def save(self, value):
+        with self.lock:
+            self.written.append(value)
+        return value
+
+
+def test_writes_resolve_in_order():
+    service = RecordingService()
+    writes = WriteBehindQueue(service, flush_interval=0.01)
+    futures = [writes.submit(service.save, value=n) for n in range(20)]
+    writes.close()
+    assert [future.result(timeout=1) for future in futures] == list(range(20))
+    assert service.written == list(range(20))
+
+
+def test_submit_after_close_raises():
+    service = RecordingService()
+    writes = WriteBehindQueue(service, flush_interval=0.01)
+    writes.close()
+    with pytest.raises(Exception, match="closed"):
+        writes.submit(service.save, value=1)
+
+
+def test_close_during_submit_does_not_strand_the_write():
+    service = RecordingService()
+    writes = WriteBehindQueue(service, flush_interval=0.01)
+    checked = threading.Event()
+    put = writes._queue.put
+
+    def slow_put(item, *args, **kwargs):
+        # Let close() run between submit's closed check and its put
+        if item is not None:
+            checked.set()
+            threading.Event().wait(0.2)
+        return put(item, *args, **kwargs)
+
+    writes._queue.put = slow_put
+    submitted = []
+    submitter = threading.Thread(target=lambda: submitted.append(writes.submit(service.save, value=1)))
+    submitter.start()
+    checked.wait(1)
+    writes.close()
+    submitter.join()
+    assert submitted[0].result(timeout=1) == 1
+    assert service.written == [1]
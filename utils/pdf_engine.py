@@ -0,0 +1,268 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, wait
+
+# Separates the text of consecutive pages in the extraction output, like pdftotext
+PAGE_BREAK = "\n\f\n"
+
+
+def _count_pages(pdf_bytes):
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_page_range(pdf_bytes, start, end):
+    """
+    Extract pages [start, end) and return one diagnostic entry per page
+    """
+    import pdfplumber
+
+    results = []
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page_num in range(start, min(end, len(pdf.pages))):
+            try:
+                page_text = pdf.pages[page_num].extract_text() or ""
+                results.append({
+                    "page": page_num + 1,
+                    "status": "ok" if page_text.strip() else "empty",
+                    "text": page_text,
+                    "chars": len(page_text),
+                    "error": None
+                })
+            except Exception as e:
+                results.append({
+                    "page": page_num + 1,
+                    "status": "error",
+                    "text": "",
+                    "chars": 0,
+                    "error": str(e)
+                })
+    return results
+
+
+def _worker_main(connection):
+    """
+    Worker process loop: run (function, args) requests until the pipe is closed
+    """
+    while True:
+        try:
+            function, args = connection.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = (True, function(*args))
+        except Exception as e:
+            reply = (False, f"{type(e).__name__}: {e}")
+        connection.send(reply)
+
+
+class _Worker:
+    """
+    One extraction process, driven over a pipe one task at a time
+    """
+
+    def __init__(self, context):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def run(self, function, args, timeout):
+        """
+        Return (ok, value); raises TimeoutError when no reply arrives in time,
+        EOFError or OSError when the process died
+        """
+        self.connection.send((function, args))
+        if not self.connection.poll(max(0, timeout)):
+            raise TimeoutError("PDF extraction timed out")
+        return self.connection.recv()
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def close(self):
+        self.connection.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+
+
+class PDFExtractionEngine:
+    """
+    Extracts PDF text with pdfplumber in a set of worker processes.
+
+    Documents longer than pages_per_chunk are split into page ranges that are
+    extracted in parallel. Each document is bounded by max_pages and a
+    wall-clock timeout; when either limit is hit the text extracted so far is
+    returned together with per-page diagnostics. A worker still busy at its
+    document's deadline is killed and replaced, so a pathological page never
+    costs other documents their work.
+    """
+
+    def __init__(self, max_workers=None, pages_per_chunk=None, max_pages=None, timeout_seconds=None):
+        self.max_workers = max_workers or int(os.getenv("PDF_WORKERS", min(4, os.cpu_count() or 1)))
+        self.pages_per_chunk = pages_per_chunk or int(os.getenv("PDF_PAGES_PER_CHUNK", 4))
+        self.max_pages = max_pages or int(os.getenv("PDF_MAX_PAGES", 30))
+        self.timeout_seconds = timeout_seconds or float(os.getenv("PDF_TIMEOUT_SECONDS", 20))
+        # spawn avoids forking a multi-threaded Streamlit server
+        self._context = multiprocessing.get_context("spawn")
+        self._dispatcher = None
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _get_dispatcher(self):
+        """
+        Threads that drive the workers; one per worker, so at most max_workers processes are busy
+        """
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-extract")
+            return self._dispatcher
+
+    def _checkout(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    return worker
+                worker.kill()
+        return _Worker(self._context)
+
+    def _checkin(self, worker):
+        with self._lock:
+            if len(self._idle) < self.max_workers:
+                self._idle.append(worker)
+                return
+        worker.close()
+
+    def _run(self, function, args, deadline):
+        """
+        Run function(*args) in a worker process before the deadline.
+
+        The worker is killed if it misses the deadline, and replaced once if it
+        dies. Raises TimeoutError, ChildProcessError when the replacement dies
+        too, or Exception with the error raised inside the worker.
+        """
+        for attempt in range(2):
+            if time.monotonic() >= deadline:
+                raise TimeoutError("PDF extraction timed out")
+            worker = self._checkout()
+            try:
+                ok, value = worker.run(function, args, deadline - time.monotonic())
+            except TimeoutError:
+                worker.kill()
+                raise
+            except (EOFError, OSError):
+                worker.kill()
+                continue
+            self._checkin(worker)
+            if not ok:
+                raise Exception(value)
+            return value
+        raise ChildProcessError("PDF worker process exited")
+
+    def shutdown(self):
+        with self._lock:
+            dispatcher, self._dispatcher = self._dispatcher, None
+            idle, self._idle = self._idle, []
+        if dispatcher is not None:
+            dispatcher.shutdown(wait=True, cancel_futures=True)
+        for worker in idle:
+            worker.close()
+
+    def extract(self, pdf_bytes):
+        """
+        Extract text from PDF bytes and return the text with per-page diagnostics
+        """
+        try:
+            return self._extract(pdf_bytes)
+        except RuntimeError:
+            # shutdown() closed the dispatcher under us; retry once on a new one
+            return self._extract(pdf_bytes)
+
+    def _extract(self, pdf_bytes):
+        started = time.monotonic()
+        deadline = started + self.timeout_seconds
+        dispatcher = self._get_dispatcher()
+
+        count = dispatcher.submit(self._run, _count_pages, (pdf_bytes,), deadline)
+        try:
+            # Tasks enforce the deadline themselves; the grace covers killing a stuck worker
+            page_count = count.result(timeout=self.timeout_seconds + 1)
+        except (TimeoutError, CancelledError):
+            count.cancel()
+            return self._build_result([], 0, started, timed_out=True)
+
+        pages_to_process = min(page_count, self.max_pages)
+        ranges = [
+            (start, min(start + self.pages_per_chunk, pages_to_process))
+            for start in range(0, pages_to_process, self.pages_per_chunk)
+        ]
+        futures = [dispatcher.submit(self._run, _extract_page_range, (pdf_bytes, start, end), deadline) for start, end in ranges]
+
+        done, not_done = wait(futures, timeout=max(0, deadline - time.monotonic()) + 1)
+        timed_out = bool(not_done)
+
+        pages = []
+        for future, (start, end) in zip(futures, ranges):
+            if future in not_done:
+                future.cancel()
+                continue
+            try:
+                # Page-level failures are reported per page; this only raises for unreadable documents
+                pages.extend(future.result())
+            except (TimeoutError, CancelledError):
+                timed_out = True
+            except Exception as e:
+                # A failed range (worker crash, dispatcher error) costs only its own pages
+                pages.extend(
+                    {"page": n, "status": "error", "text": "", "chars": 0, "error": str(e)}
+                    for n in range(start + 1, end + 1)
+                )
+
+        if timed_out:
+            extracted = {page["page"] for page in pages}
+            pages.extend(
+                {"page": n, "status": "timeout", "text": "", "chars": 0, "error": "Extraction timed out"}
+                for n in range(1, pages_to_process + 1) if n not in extracted
+            )
+            pages.sort(key=lambda page: page["page"])
+
+        return self._build_result(pages, page_count, started, timed_out=timed_out)
+
+    def _build_result(self, pages, page_count, started, timed_out=False):
+        text = PAGE_BREAK.join(page["text"] for page in pages if page["text"])
+        return {
+            "text": text.strip(),
+            "pages": pages,
+            "page_count": page_count,
+            "pages_processed": sum(1 for page in pages if page["status"] in ("ok", "empty")),
+            "truncated": page_count > self.max_pages,
+            "timed_out": timed_out,
+            "elapsed_seconds": round(time.monotonic() - started, 3)
+        }
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Return the process-wide extraction engine, creating it on first use
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = PDFExtractionEngine()
+        return _engine
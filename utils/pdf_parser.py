@@ -1,82 +1,155 @@
-import pdfplumber
-import io
-import streamlit as st
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from utils.pdf_engine import get_engine
+from utils.section_segmenter import segment_sections, section_lines
+from utils.telemetry import cache_lookups, registry, tracer
+
+parse_failures = registry.counter("pdf_parse_failures_total", "PDF uploads that yielded no usable text")
+page_results = registry.counter("pdf_pages_total", "Extracted PDF pages by status (ok, empty, error, timeout)", ("status",))
+
+class ParsedResume:
+    """
+    Everything derived from one uploaded PDF, produced by a single parse
+    """
+
+    def __init__(self, content_hash, pdf_bytes, extraction, segments, sections, contact_info, skills, experience, education, validation):
+        self.content_hash = content_hash
+        self.pdf_bytes = pdf_bytes
+        self.extraction = extraction
+        self.text = extraction["text"]
+        # Full segmentation with line spans; sections holds just the section titles
+        self.segments = segments
+        self.sections = sections
+        self.contact_info = contact_info
+        self.skills = skills
+        self.experience = experience
+        self.education = education
+        self.validation = validation
+
+    @property
+    def page_texts(self):
+        return [page["text"] for page in self.extraction["pages"]]
+
+    def to_structured_data(self):
+        return {
+            "full_text": self.text,
+            "sections": self.sections,
+            "contact_info": self.contact_info,
+            "skills": self.skills,
+            "experience": self.experience,
+            "education": self.education
+        }
 
 class PDFParser:
-    def __init__(self):
-        pass
+    def __init__(self, engine=None, cache_size=None):
+        self.engine = engine or get_engine()
+        self.cache_size = cache_size or int(os.getenv("PDF_PARSE_CACHE_SIZE", 32))
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _read_bytes(self, uploaded_file):
+        if isinstance(uploaded_file, bytes):
+            return uploaded_file
+        # getvalue() does not depend on the current read position of Streamlit uploads
+        if hasattr(uploaded_file, "getvalue"):
+            return uploaded_file.getvalue()
+        uploaded_file.seek(0)
+        return uploaded_file.read()
+    
+    def parse(self, uploaded_file):
+        """
+        Parse an uploaded PDF (file-like or bytes) once into a ParsedResume.
+        Complete results are memoized by the SHA-256 of the file content.
+        """
+        with tracer.start_span("pdf.parse") as span:
+            try:
+                pdf_bytes = self._read_bytes(uploaded_file)
+                content_hash = hashlib.sha256(pdf_bytes).hexdigest()
+                span.set_attribute("pdf.bytes", len(pdf_bytes))
+                
+                with self._lock:
+                    if content_hash in self._cache:
+                        self._cache.move_to_end(content_hash)
+                        cache_lookups.inc(cache="pdf_parse", result="hit")
+                        span.set_attribute("cache.hit", True)
+                        return self._cache[content_hash]
+                cache_lookups.inc(cache="pdf_parse", result="miss")
+                span.set_attribute("cache.hit", False)
+                
+                with tracer.start_span("pdf.extract"):
+                    extraction = self.engine.extract(pdf_bytes)
+                text = extraction["text"]
+                span.set_attribute("pdf.pages", len(extraction["pages"]))
+                for page in extraction["pages"]:
+                    page_results.inc(status=page["status"])
+                
+                if not text:
+                    raise Exception("No readable text found in the PDF file")
+                
+                # Segment the text once and derive every section from the same pass
+                sections = segment_sections(text)
+                parsed = ParsedResume(
+                    content_hash=content_hash,
+                    pdf_bytes=pdf_bytes,
+                    extraction=extraction,
+                    segments=sections,
+                    sections=self._identify_sections(sections),
+                    contact_info=self._extract_contact_info(text),
+                    skills=self._extract_skills_section(sections),
+                    experience=self._extract_experience_section(sections),
+                    education=self._extract_education_section(sections),
+                    validation=self._validate_text(text)
+                )
+                
+                # Pages that failed or timed out may succeed on the next upload; truncation at max_pages is deterministic
+                complete = not extraction["timed_out"] and all(page["status"] in ("ok", "empty") for page in extraction["pages"])
+                span.set_attribute("pdf.complete", complete)
+                if complete:
+                    with self._lock:
+                        self._cache[content_hash] = parsed
+                        while len(self._cache) > self.cache_size:
+                            self._cache.popitem(last=False)
+                
+                return parsed
+                
+            except Exception as e:
+                parse_failures.inc()
+                raise Exception(f"Failed to extract text from PDF: {str(e)}")
+    
+    def extract_text_with_diagnostics(self, uploaded_file):
+        """
+        Extract text from uploaded PDF file along with per-page diagnostics.
+        Pages that fail, come back empty or time out are reported instead of aborting the document.
+        """
+        return self.parse(uploaded_file).extraction
     
     def extract_text_from_pdf(self, uploaded_file):
         """
         Extract text content from uploaded PDF file
         """
-        try:
-            # Convert uploaded file to bytes
-            pdf_bytes = uploaded_file.read()
-            
-            # Create a BytesIO object from the uploaded file
-            pdf_file = io.BytesIO(pdf_bytes)
-            
-            # Extract text using pdfplumber
-            text_content = ""
-            
-            with pdfplumber.open(pdf_file) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_content += page_text + "\n\n"
-                    except Exception as e:
-                        st.warning(f"Could not extract text from page {page_num + 1}: {str(e)}")
-                        continue
-            
-            if not text_content.strip():
-                raise Exception("No readable text found in the PDF file")
-            
-            return text_content.strip()
-            
-        except Exception as e:
-            raise Exception(f"Failed to extract text from PDF: {str(e)}")
+        return self.parse(uploaded_file).text
     
     def extract_structured_data(self, uploaded_file):
         """
         Extract structured data from resume PDF (sections, contact info, etc.)
         """
         try:
-            text_content = self.extract_text_from_pdf(uploaded_file)
-            
-            # Basic structure identification
-            structured_data = {
-                "full_text": text_content,
-                "sections": self._identify_sections(text_content),
-                "contact_info": self._extract_contact_info(text_content),
-                "skills": self._extract_skills_section(text_content),
-                "experience": self._extract_experience_section(text_content),
-                "education": self._extract_education_section(text_content)
-            }
-            
-            return structured_data
+            return self.parse(uploaded_file).to_structured_data()
             
         except Exception as e:
             raise Exception(f"Failed to extract structured data: {str(e)}")
     
-    def _identify_sections(self, text):
+    def _identify_sections(self, sections):
         """
         Identify main sections in the resume
         """
-        common_sections = [
-            "summary", "objective", "experience", "work experience", "employment",
-            "education", "skills", "technical skills", "projects", "certifications",
-            "achievements", "awards", "publications", "languages", "interests"
-        ]
-        
         found_sections = []
-        text_lower = text.lower()
-        
-        for section in common_sections:
-            if section in text_lower:
-                found_sections.append(section.title())
-        
+        for section in sections:
+            title = section["name"].title()
+            if section["name"] != "header" and title not in found_sections:
+                found_sections.append(title)
         return found_sections
     
     def _extract_contact_info(self, text):
@@ -113,107 +186,46 @@ class PDFParser:
         
         return contact_info
     
-    def _extract_skills_section(self, text):
+    def _extract_skills_section(self, sections):
         """
         Extract skills section from resume
         """
-        lines = text.split('\n')
-        skills_section = []
-        
-        # Look for skills section
-        skills_started = False
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
-            # Identify skills section start
-            if any(keyword in line_lower for keyword in ['skills', 'technical skills', 'core competencies']):
-                skills_started = True
-                continue
-            
-            # Stop at next major section
-            if skills_started and any(keyword in line_lower for keyword in ['experience', 'education', 'projects', 'work']):
-                break
-            
-            # Collect skills lines
-            if skills_started and line.strip():
-                skills_section.append(line.strip())
-        
-        return skills_section
+        return section_lines(sections, "skills")
     
-    def _extract_experience_section(self, text):
+    def _extract_experience_section(self, sections):
         """
         Extract work experience section from resume
         """
-        lines = text.split('\n')
-        experience_section = []
-        
-        # Look for experience section
-        exp_started = False
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
-            # Identify experience section start
-            if any(keyword in line_lower for keyword in ['experience', 'work experience', 'employment', 'career']):
-                exp_started = True
-                continue
-            
-            # Stop at next major section
-            if exp_started and any(keyword in line_lower for keyword in ['education', 'skills', 'projects', 'certifications']):
-                break
-            
-            # Collect experience lines
-            if exp_started and line.strip():
-                experience_section.append(line.strip())
-        
-        return experience_section
+        return section_lines(sections, "experience")
     
-    def _extract_education_section(self, text):
+    def _extract_education_section(self, sections):
         """
         Extract education section from resume
         """
-        lines = text.split('\n')
-        education_section = []
-        
-        # Look for education section
-        edu_started = False
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
-            # Identify education section start
-            if any(keyword in line_lower for keyword in ['education', 'academic', 'degree']):
-                edu_started = True
-                continue
-            
-            # Stop at next major section
-            if edu_started and any(keyword in line_lower for keyword in ['experience', 'skills', 'projects', 'certifications']):
-                break
-            
-            # Collect education lines
-            if edu_started and line.strip():
-                education_section.append(line.strip())
+        return section_lines(sections, "education")
+    
+    def _validate_text(self, text):
+        """
+        Check that extracted text looks like a resume
+        """
+        # Check if text is meaningful
+        word_count = len(text.split())
+        has_common_resume_words = any(word in text.lower() for word in 
+                                   ['experience', 'education', 'skills', 'work', 'university', 'company'])
         
-        return education_section
+        return {
+            "is_valid": word_count > 50 and has_common_resume_words,
+            "word_count": word_count,
+            "has_resume_keywords": has_common_resume_words,
+            "text_preview": text[:200] + "..." if len(text) > 200 else text
+        }
     
     def validate_pdf_content(self, uploaded_file):
         """
         Validate that the PDF contains readable text content
         """
         try:
-            text = self.extract_text_from_pdf(uploaded_file)
-            
-            # Check if text is meaningful
-            word_count = len(text.split())
-            has_common_resume_words = any(word in text.lower() for word in 
-                                       ['experience', 'education', 'skills', 'work', 'university', 'company'])
-            
-            validation_result = {
-                "is_valid": word_count > 50 and has_common_resume_words,
-                "word_count": word_count,
-                "has_resume_keywords": has_common_resume_words,
-                "text_preview": text[:200] + "..." if len(text) > 200 else text
-            }
-            
-            return validation_result
+            return self.parse(uploaded_file).validation
             
         except Exception as e:
             return {
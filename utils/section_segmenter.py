@@ -0,0 +1,107 @@
+# Canonical section name -> heading phrases that open it (matched against whole lines)
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "objective", "career objective"],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history", "career"
+    ],
+    "education": ["education", "academic background", "academics", "academic qualifications", "education and training"],
+    "skills": ["skills", "technical skills", "core competencies", "key skills", "skills and abilities"],
+    "projects": ["projects", "personal projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications"],
+    "achievements": ["achievements", "accomplishments"],
+    "awards": ["awards", "honors", "honors and awards"],
+    "publications": ["publications"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies"],
+}
+
+
+# Bullets, dashes and separators allowed around a heading, e.g. "■ EDUCATION —"
+HEADING_DECORATION = " \t•■▪●◆·*-–—|_#"
+
+
+class SectionSegmenter:
+    """
+    Splits resume text into sections in a single pass over its lines.
+
+    A line opens a section only when the whole line is a known heading
+    (optionally followed by a colon and inline content, e.g. "Skills: Python"),
+    so words like "work" inside a bullet never end a section. Each line is
+    normalized once and looked up in a phrase table, so segmentation is O(n)
+    in the number of lines regardless of how many headings are known.
+    """
+
+    def __init__(self, headings=None):
+        headings = headings or SECTION_HEADINGS
+        self._canonical = {
+            phrase: name
+            for name, phrases in headings.items()
+            for phrase in phrases
+        }
+        # Generous bound so decorated headings still pass the cheap length check
+        self._max_heading_length = max(len(phrase) for phrase in self._canonical) * 2 + 8
+
+    def match_heading(self, line):
+        """
+        Return (canonical name, inline content) if the line is a heading, else None
+        """
+        head, _, inline = line.partition(":")
+        if len(head) > self._max_heading_length:
+            return None
+        phrase = " ".join(head.strip(HEADING_DECORATION).lower().split())
+        name = self._canonical.get(phrase)
+        if name is None:
+            return None
+        return name, inline.strip()
+
+    def segment(self, text):
+        """
+        Return the sections found in document order.
+
+        Each section is a dict with the canonical name, the heading line as it
+        appears, the [start, end) line span and the non-empty content lines.
+        Lines before the first heading are returned as a "header" section.
+        """
+        sections = []
+        current = {"name": "header", "heading": "", "start": 0, "end": 0, "lines": []}
+
+        lines = text.split("\n")
+        for index, line in enumerate(lines):
+            heading = self.match_heading(line)
+            if heading:
+                current["end"] = index
+                if current["lines"] or current["name"] != "header":
+                    sections.append(current)
+                name, inline = heading
+                current = {"name": name, "heading": line.strip(), "start": index, "end": index, "lines": []}
+                if inline:
+                    current["lines"].append(inline)
+                continue
+
+            stripped = line.strip()
+            if stripped:
+                current["lines"].append(stripped)
+
+        current["end"] = len(lines)
+        if current["lines"] or current["name"] != "header":
+            sections.append(current)
+        return sections
+
+
+def section_lines(sections, name):
+    """
+    Collect the content lines of every section with the given canonical name
+    """
+    lines = []
+    for section in sections:
+        if section["name"] == name:
+            lines.extend(section["lines"])
+    return lines
+
+
+_default_segmenter = SectionSegmenter()
+
+
+def segment_sections(text):
+    return _default_segmenter.segment(text)
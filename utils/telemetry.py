@@ -0,0 +1,490 @@
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+# Upper bounds of the latency histogram buckets, in seconds; LLM calls need the long tail
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span = ContextVar("current_span", default=None)
+
+
+def _enabled(name, default="true"):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class Span:
+    """
+    One timed operation in a trace, with the fields of an OpenTelemetry span
+    """
+
+    def __init__(self, name, trace_id, parent_span_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.attributes = dict(attributes or {})
+        self.events = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns = None
+        self._started = time.perf_counter()
+        self.duration_seconds = None
+
+    def set_attribute(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def add_event(self, name, attributes=None):
+        self.events.append((time.time_ns(), name, dict(attributes or {})))
+
+    def record_exception(self, error):
+        self.status_code = STATUS_ERROR
+        self.status_message = str(error)[:500]
+        self.add_event("exception", {
+            "exception.type": type(error).__name__,
+            "exception.message": self.status_message,
+        })
+
+    def end(self):
+        if self.end_time_ns is None:
+            self.end_time_ns = time.time_ns()
+            self.duration_seconds = time.perf_counter() - self._started
+
+    def to_otlp(self):
+        """
+        The span in OTLP/JSON field layout, so exported files can be replayed to a collector
+        """
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "events": [
+                {"timeUnixNano": str(at), "name": name, "attributes": _otlp_attributes(attributes)}
+                for at, name, attributes in self.events
+            ],
+            "status": {"code": self.status_code, "message": self.status_message},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class _NoopSpan:
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def add_event(self, name, attributes=None):
+        pass
+
+    def record_exception(self, error):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class InMemorySpanExporter:
+    """
+    Keeps the most recent finished spans for inspection (the /traces endpoint)
+    """
+
+    def __init__(self, max_spans=None):
+        self._spans = deque(maxlen=max_spans or int(os.getenv("TRACE_BUFFER_SPANS", 2000)))
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def traces(self, limit=20):
+        """
+        Most recent traces, newest first, each a list of OTLP spans in start order
+        """
+        grouped = {}
+        for span in self.spans():
+            grouped.setdefault(span.trace_id, []).append(span)
+        newest = sorted(grouped.values(), key=lambda spans: max(s.end_time_ns for s in spans), reverse=True)
+        return [
+            [span.to_otlp() for span in sorted(spans, key=lambda s: s.start_time_ns)]
+            for spans in newest[:limit]
+        ]
+
+
+class JSONLinesSpanExporter:
+    """
+    Appends one OTLP/JSON span per line to a local file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, span):
+        line = json.dumps(span.to_otlp())
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to the exporters.
+
+    The active span is tracked in a context variable, so spans opened while
+    another is active become its children and share its trace id. Work sent
+    to a thread pool keeps its parent only when submitted through
+    context_bound(). Every finished span is also observed in the
+    span_duration_seconds histogram.
+    """
+
+    def __init__(self, exporters=None, enabled=None):
+        self.enabled = enabled if enabled is not None else _enabled("TRACING_ENABLED")
+        self.memory = InMemorySpanExporter()
+        self.exporters = exporters if exporters is not None else [self.memory]
+        path = os.getenv("TRACE_EXPORT_PATH")
+        if exporters is None and path:
+            self.exporters.append(JSONLinesSpanExporter(path))
+        self._export_errors = 0
+
+    @contextmanager
+    def start_span(self, name, attributes=None):
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            name,
+            trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+            parent_span_id=parent.span_id if parent is not None else None,
+            attributes=attributes
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            # BaseExceptions such as Streamlit's rerun are control flow, not errors
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self._export(span)
+
+    def _export(self, span):
+        span_duration.observe(span.duration_seconds, span=span.name, status="error" if span.status_code == STATUS_ERROR else "ok")
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                # Tracing must never break the traced operation
+                self._export_errors += 1
+
+
+def current_span():
+    """
+    The active span, or a no-op span outside any trace
+    """
+    return _current_span.get() or _NOOP_SPAN
+
+
+def traced(name=None, attributes=None):
+    """
+    Decorator running a function inside a span named after it
+    """
+    def decorate(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.start_span(span_name, attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def context_bound(fn):
+    """
+    Wrap fn to run in a copy of the caller's context, for executor.submit(context_bound(fn), ...)
+    """
+    context = copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+    return wrapper
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (list(extra) if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonic counter with labels, rendered in the Prometheus text format
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}" for key, value in values]
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with labels, rendered in the Prometheus text format
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self):
+        with self._lock:
+            values = sorted((key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items())
+        lines = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = _format_number(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide set of counters and histograms.
+
+    counter() and histogram() return the existing metric when the name is
+    already registered, so modules can declare the metrics they use at
+    import time.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise Exception(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, help_text, labelnames, buckets)
+
+    def render(self):
+        """
+        Every metric in the Prometheus text exposition format
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+span_duration = registry.histogram(
+    "span_duration_seconds", "Duration of traced operations", ("span", "status")
+)
+cache_lookups = registry.counter(
+    "cache_lookups_total", "Cache lookups by cache and result (hit or miss)", ("cache", "result")
+)
+tracer = Tracer()
+
+
+def _metrics_handler():
+    # http.server is only imported when the endpoint is enabled, to keep app startup lean
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                body = registry.render().encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/traces":
+                body = json.dumps(tracer.memory.traces()).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def dump_metrics(path=None):
+    """
+    Write the current metrics to a file in the Prometheus text format (e.g. for node_exporter's textfile collector)
+    """
+    path = path or os.getenv("METRICS_DUMP_PATH")
+    if not path:
+        return None
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(temp_path, path)
+    return path
+
+
+_export_lock = threading.Lock()
+_export_started = {}
+
+
+def start_metrics_export(port=None, host=None, dump_path=None, dump_interval=None):
+    """
+    Serve /metrics and /traces over HTTP when METRICS_PORT is set, and dump
+    the metrics to METRICS_DUMP_PATH periodically and at exit when that is
+    set. Safe to call more than once; returns what was started.
+    """
+    port = port if port is not None else int(os.getenv("METRICS_PORT", 0))
+    host = host or os.getenv("METRICS_HOST", "127.0.0.1")
+    dump_path = dump_path or os.getenv("METRICS_DUMP_PATH")
+    dump_interval = dump_interval or float(os.getenv("METRICS_DUMP_INTERVAL_SECONDS", 15))
+
+    with _export_lock:
+        if port and "server" not in _export_started:
+            from http.server import ThreadingHTTPServer
+
+            server = ThreadingHTTPServer((host, port), _metrics_handler())
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+            _export_started["server"] = server
+
+        if dump_path and "dump" not in _export_started:
+            def dump_periodically():
+                while True:
+                    time.sleep(dump_interval)
+                    try:
+                        dump_metrics(dump_path)
+                    except Exception:
+                        pass
+
+            threading.Thread(target=dump_periodically, name="metrics-dump", daemon=True).start()
+            atexit.register(dump_metrics, dump_path)
+            _export_started["dump"] = dump_path
+
+        return dict(_export_started)